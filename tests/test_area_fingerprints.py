@@ -0,0 +1,33 @@
+import numpy as np
+from unified_bot.area_fingerprints import AreaFingerprints
+
+
+def frame(level):
+    return np.full((12, 16), float(level), dtype=np.float32)
+
+
+def learned(total=3):
+    prints = AreaFingerprints(total)
+    for area in range(1, total + 1):
+        prints.observe(area, frame(area * 60))
+    return prints
+
+
+def test_identifies_learned_areas():
+    prints = learned()
+    assert prints.complete()
+    assert prints.identify(frame(121)) == 2
+    assert prints.identify(frame(90)) is None
+
+
+def test_resyncs_when_the_frame_shows_another_area():
+    prints = learned()
+    assert prints.observe(2, frame(180)) == 3
+    assert prints.observe(2, frame(122)) == 2
+
+
+def test_dropped_when_region_or_area_count_changed():
+    data = learned().to_dict(region=(0, 0, 100, 100))
+    assert len(AreaFingerprints.from_dict(data, 3, region=(0, 0, 100, 100))) == 3
+    assert len(AreaFingerprints.from_dict(data, 3, region=(10, 0, 100, 100))) == 0
+    assert len(AreaFingerprints.from_dict(data, 4, region=(0, 0, 100, 100))) == 0
@@ -0,0 +1,36 @@
+import numpy as np
+from PIL import Image
+import unified_bot.ocr_engine as ocr_engine
+import unified_bot.ocr_executor as ocr_executor
+import unified_bot.ocr_profiles as ocr_profiles
+
+
+def record_crops(directory):
+    labels = {'qi': '12.5x', 'bloodline': 'Golden Crow'}
+    for region, text in labels.items():
+        image = np.full((20, 90, 3), 25, dtype=np.uint8)
+        image[6:14, 10:70] = 235
+        ocr_profiles.record_crop(Image.fromarray(image), region, text, directory)
+    return labels
+
+
+def test_profile_benchmark_reports_accuracy(tmp_path, monkeypatch):
+    labels = record_crops(tmp_path)
+    answers = iter(['12.5x', 'Golden Crown'] * 2)
+    monkeypatch.setattr(ocr_engine, 'read_images', lambda images, options=None, **kwargs: [next(answers)])
+
+    results = ocr_profiles.benchmark(tmp_path)
+
+    assert set(results) == {'raw', 'profiled'}
+    assert results['raw']['reads'] == len(labels)
+    assert results['raw']['correct'] == 1 and results['raw']['accuracy'] == 0.5
+
+
+def test_executor_benchmark_times_every_mode(tmp_path, monkeypatch):
+    record_crops(tmp_path)
+    monkeypatch.setattr(ocr_engine, 'read_images', lambda images, options=None, **kwargs: [''] * len(images))
+
+    results = ocr_executor.benchmark(tmp_path, rounds=2)
+
+    assert set(results) == {'sequential', 'batched', 'parallel'}
+    assert all(ms >= 0 for ms in results.values())
@@ -0,0 +1,21 @@
+from unified_bot.bloodline_resolver import BloodlineResolver, normalize
+
+RANKED = ['Heavenly Dragon', 'Azure Phoenix', 'Golden Crow', 'Primordial Chaos']
+
+
+def test_normalize_maps_confusables():
+    assert normalize('  G0lden  Cr0w. ') == 'golden crow'
+    assert normalize('B!ood') == 'blood'
+
+
+def test_exact_and_misread_names():
+    resolver = BloodlineResolver(RANKED)
+    assert resolver.resolve('Golden Crow') == (2, 1.0)
+    rank, score = resolver.resolve('Azure Ph0enlx')
+    assert rank == 1 and 0.8 < score < 1.0
+
+
+def test_unrelated_text_does_not_match():
+    resolver = BloodlineResolver(RANKED)
+    assert resolver.resolve('') == (-1, 0.0)
+    assert resolver.resolve('qqq') == (-1, 0.0)
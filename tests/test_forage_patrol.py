@@ -0,0 +1,80 @@
+import threading
+import numpy as np
+import pytest
+import unified_bot.forage_bot_logic as forage_bot_logic
+import unified_bot.region_watch as region_watch
+from unified_bot.area_fingerprints import AreaFingerprints
+from unified_bot.patrol_scheduler import PatrolScheduler
+
+LEFT, RIGHT = (10, 300), (790, 300)
+CONFIG = {'search_region': (0, 0, 800, 600), 'area_load_delay': 0.05, 'area_change_timeout': 0.05,
+          'area_poll_interval': 0.01}
+
+
+def frame(level):
+    return np.full((60, 80, 3), level, dtype=np.uint8)
+
+
+@pytest.fixture
+def clicks(monkeypatch):
+    clicked = []
+    monkeypatch.setattr(forage_bot_logic, 'safe_human_click', lambda pos, settings, stop_event: clicked.append(pos))
+    return clicked
+
+
+def show(monkeypatch, frames):
+    """Make the search region show 'frames' one per grab (the last one from then on)."""
+    frames = list(frames)
+    monkeypatch.setattr(forage_bot_logic, 'screenshot',
+                        lambda region: frames.pop(0) if len(frames) > 1 else frames[0])
+
+
+@pytest.mark.parametrize('visits, every, expected', [
+    (1, 10, True), (2, 10, False), (10, 10, False), (11, 10, True), (21, 10, True), (3, 1, True), (4, 0, True),
+])
+def test_full_sweep_on_first_visit_then_every_nth(visits, every, expected):
+    assert forage_bot_logic.is_full_sweep_visit(visits, every) is expected
+
+
+def test_next_arrow_follows_the_sweep():
+    assert forage_bot_logic.get_next_arrow_pos(6, 'right', 6, LEFT, RIGHT) == LEFT
+    assert forage_bot_logic.get_next_arrow_pos(1, 'left', 6, LEFT, RIGHT) == RIGHT
+    assert forage_bot_logic.get_next_arrow_pos(3, 'left', 6, LEFT, RIGHT) == LEFT
+
+
+def test_next_arrow_follows_the_scheduler():
+    scheduler = PatrolScheduler(3)
+    scheduler.record_visit(3, 0, 100.0, 100.1)
+    scheduler.record_visit(2, 0, 101.0, 101.1)
+    # Moving right in the sweep, but only Area 1 is still unexplored
+    assert forage_bot_logic.get_next_arrow_pos(2, 'right', 3, LEFT, RIGHT, scheduler) == LEFT
+
+
+def test_late_transition_is_not_clicked_twice(monkeypatch, clicks):
+    show(monkeypatch, [frame(40), frame(200)])
+    monkeypatch.setattr(region_watch, 'wait_for_change', lambda *args, **kwargs: ('unchanged', 0.05))
+
+    status = forage_bot_logic.click_arrow_and_wait(RIGHT, CONFIG['search_region'], CONFIG, threading.Event())
+
+    assert status == 'changing'
+    assert clicks == [RIGHT]
+
+
+def test_dropped_click_is_retried(monkeypatch, clicks):
+    show(monkeypatch, [frame(40)])
+
+    status = forage_bot_logic.click_arrow_and_wait(RIGHT, CONFIG['search_region'], CONFIG, threading.Event())
+
+    assert status == 'unchanged'
+    assert clicks == [RIGHT, RIGHT]
+
+
+def test_start_position_stops_at_a_recognised_area_one(monkeypatch, clicks):
+    prints = AreaFingerprints(3)
+    for area, level in ((1, 30), (2, 120), (3, 210)):
+        prints.learn(area, region_watch.region_fingerprint(frame(level)))
+    # Area 2, then Area 1 after one left click
+    show(monkeypatch, [frame(120), frame(120), frame(30)])
+
+    assert forage_bot_logic.go_to_start_position(LEFT, 3, 0.05, CONFIG, threading.Event(), prints)
+    assert clicks == [LEFT]
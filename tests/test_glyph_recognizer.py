@@ -0,0 +1,36 @@
+import numpy as np
+import cv2
+from PIL import Image
+from unified_bot.glyph_recognizer import GlyphRecognizer
+
+
+def render(text):
+    image = np.full((24, 16 * len(text) + 10, 3), 20, dtype=np.uint8)
+    cv2.putText(image, text, (4, 18), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (240, 240, 240), 1, cv2.LINE_AA)
+    return Image.fromarray(image)
+
+
+def test_reads_back_learned_glyphs_with_spaces():
+    recognizer = GlyphRecognizer()
+    assert recognizer.recognize(render('12')) == (None, [])
+    assert recognizer.learn(render('1234567890'), '1234567890')
+    text, confidences = recognizer.recognize(render('90 12'))
+    assert text == '90 12'
+    assert len(confidences) == 4
+
+
+def test_refuses_text_that_does_not_match_the_segmentation():
+    recognizer = GlyphRecognizer()
+    assert not recognizer.learn(render('123'), '12')
+    assert len(recognizer) == 0
+
+
+def test_templates_survive_a_restart(tmp_path):
+    path = tmp_path / 'glyphs.npz'
+    recognizer = GlyphRecognizer(path)
+    recognizer.learn(render('4567'), '4567')
+    recognizer.save()
+
+    reloaded = GlyphRecognizer(path)
+    reloaded.load()
+    assert reloaded.recognize(render('76'))[0] == '76'
@@ -0,0 +1,98 @@
+import threading
+import pytest
+import unified_bot.input_backend as input_backend
+import unified_bot.mouse_trajectory as mouse_trajectory
+import unified_bot.settings_manager as settings_manager
+import unified_bot.forage_bot_logic as forage_bot_logic
+import unified_bot.rein_actions as rein_actions
+
+START = (100, 100)
+TARGET = (700, 420)
+
+
+@pytest.fixture
+def backend():
+    recorder = input_backend.RecordingBackend(start_pos=START)
+    previous = input_backend.set_backend(recorder)
+    input_backend.seed(1234)
+    yield recorder
+    input_backend.set_backend(previous)
+
+
+def expected_path(settings, snap_distance):
+    input_backend.seed(1234)
+    path = mouse_trajectory.build_trajectory(START, TARGET, settings['mouse_speed_factor'], snap_distance,
+                                             settings.get('mouse_variability', 0))
+    input_backend.seed(1234)
+    return path
+
+
+def test_safe_human_click_replays_trajectory_then_clicks_once(backend):
+    settings = settings_manager.get_forage_default_settings()
+    path = expected_path(settings, settings['mouse_snap_distance'])
+
+    forage_bot_logic.safe_human_click(TARGET, settings, threading.Event())
+
+    counts = backend.counts()
+    assert counts['move_rel'] == len(path)
+    assert counts.get('move_to', 0) == 0
+    assert counts['click'] == 1
+    assert backend.clicks()[0][1:] == TARGET
+    steps = len(path)
+    minimum = settings['mouse_move_duration'] * (steps - 1) / steps + settings['click_settle_delay']
+    assert minimum <= backend.elapsed() < minimum + 0.25
+
+
+def test_rein_move_and_click_double_clicks_on_target(backend):
+    settings = settings_manager.get_rein_default_settings()
+    settings['preposition_mouse'] = False
+    path = expected_path(settings, settings['mouse_snap_threshold'])
+
+    rein_actions.move_and_click(*TARGET, settings, threading.Event())
+
+    counts = backend.counts()
+    assert counts['move_rel'] == len(path)
+    assert counts['click'] == 2
+    assert [c[1:] for c in backend.clicks()] == [TARGET, TARGET]
+    steps = len(path)
+    # settle delay plus the fixed parts of the two random pauses
+    minimum = settings['mouse_move_duration'] * (steps - 1) / steps + settings['click_settle_delay'] + 0.01 + 0.05
+    assert minimum <= backend.elapsed() < minimum + 0.25
+
+
+def test_same_seed_gives_same_rein_path(backend):
+    settings = settings_manager.get_rein_default_settings()
+    settings['preposition_mouse'] = False
+
+    rein_actions.move_and_click(*TARGET, settings, threading.Event())
+    first = [event[1:] for event in backend.events]
+
+    backend.clear()
+    backend.move_to(*START)
+    backend.clear()
+    input_backend.seed(1234)
+    rein_actions.move_and_click(*TARGET, settings, threading.Event())
+
+    assert [event[1:] for event in backend.events] == first
+
+
+def test_within_snap_distance_jumps_straight_to_target(backend):
+    settings = settings_manager.get_forage_default_settings()
+    backend.move_to(TARGET[0] - 3, TARGET[1] + 2)
+    backend.clear()
+
+    forage_bot_logic.safe_human_click(TARGET, settings, threading.Event())
+
+    assert backend.counts()['move_rel'] == 1
+    assert backend.clicks()[0][1:] == TARGET
+
+
+def test_stop_event_cancels_click(backend):
+    settings = settings_manager.get_forage_default_settings()
+    stop_event = threading.Event()
+    stop_event.set()
+
+    forage_bot_logic.safe_human_click(TARGET, settings, stop_event)
+    rein_actions.move_and_click(*TARGET, settings_manager.get_rein_default_settings(), stop_event)
+
+    assert backend.clicks() == []
@@ -0,0 +1,41 @@
+import numpy as np
+from unified_bot.ocr_cache import OcrCache, crop_key
+
+
+def crop(background, text_color, offset=0, width=60):
+    image = np.full((20, width, 3), background, dtype=np.uint8)
+    image[6:14, 10 + offset:30 + offset] = text_color
+    image[8:12, 34 + offset:40 + offset] = text_color
+    return image
+
+
+def test_key_ignores_colours_and_offset():
+    key = crop_key(crop(10, 240))
+    assert key is not None
+    assert crop_key(crop(235, 15, offset=7)) == key
+    assert crop_key(crop(10, 240, width=80)) == key
+
+
+def test_key_changes_with_the_text():
+    other = crop(10, 240)
+    other[6:14, 20:22] = 10
+    assert crop_key(other) != crop_key(crop(10, 240))
+
+
+def test_blank_crop_has_no_key():
+    assert crop_key(np.full((20, 60, 3), 128, dtype=np.uint8)) is None
+
+
+def test_cache_is_lru_and_survives_a_restart(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = OcrCache(path, max_entries=2)
+    cache.put('a', '1')
+    cache.put('b', '2')
+    assert cache.get('a') == '1'
+    cache.put('c', '3')
+    assert cache.get('b') is None
+    cache.save()
+
+    reloaded = OcrCache(path, max_entries=2)
+    reloaded.load()
+    assert list(reloaded.entries) == ['a', 'c']
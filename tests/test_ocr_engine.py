@@ -0,0 +1,33 @@
+import types
+import numpy as np
+from PIL import Image
+import unified_bot.ocr_engine as ocr_engine
+
+
+def fake_pytesseract(calls):
+    """Reads every crop stitched into an image as the one word 'x'."""
+    def image_to_data(image, config, output_type):
+        calls.append((image.size[1], config))
+        tops = [top for top in range(0, image.size[1], 30)]
+        return {'text': ['x'] * len(tops), 'top': tops, 'height': [10] * len(tops), 'conf': [90] * len(tops),
+                'block_num': [1] * len(tops), 'par_num': [1] * len(tops), 'line_num': list(range(len(tops)))}
+    return types.SimpleNamespace(image_to_data=image_to_data, Output=types.SimpleNamespace(DICT='dict'))
+
+
+def test_crops_are_stitched_only_with_identical_options(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ocr_engine, 'load_pytesseract', lambda: fake_pytesseract(calls))
+    images = [Image.fromarray(np.full((10, 40, 3), 200, dtype=np.uint8)) for _ in range(4)]
+    options = [(6, '0123456789'), (7, None), (6, '0123456789'), (6, None)]
+
+    results = ocr_engine.PytesseractEngine().read(images, options)
+
+    assert [text for text, _ in results] == ['x'] * 4
+    configs = sorted(config for _, config in calls)
+    assert configs == ['--oem 3 --psm 6', '--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789', '--oem 3 --psm 7']
+    stitched_height = [height for height, config in calls if 'whitelist' in config][0]
+    assert stitched_height == 2 * (10 + ocr_engine.STITCH_GAP)
+
+
+def test_tesseract_missing_only_matches_pytesseract_errors():
+    assert not ocr_engine.tesseract_missing(RuntimeError('boom'))
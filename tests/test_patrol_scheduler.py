@@ -0,0 +1,44 @@
+import pytest
+import unified_bot.patrol_scheduler as patrol_scheduler
+from unified_bot.patrol_scheduler import PatrolScheduler, sweep_direction
+
+
+@pytest.mark.parametrize('area, direction, expected', [
+    (6, 'right', 'left'),
+    (1, 'left', 'right'),
+    (3, 'right', 'right'),
+    (3, 'left', 'left'),
+])
+def test_sweep_turns_around_at_the_ends(area, direction, expected):
+    assert sweep_direction(area, direction, 6) == expected
+
+
+def test_heads_for_the_area_that_refills_fastest():
+    scheduler = PatrolScheduler(4, travel_time=1.0, scan_time=0.2, click_time=0.5)
+    now = 1000.0
+    for visit in range(5):
+        start = now + visit * 100.0
+        scheduler.record_visit(1, 0, start, start + 0.2)
+        scheduler.record_visit(2, 0, start + 2.0, start + 2.2)
+        scheduler.record_visit(3, 0, start + 4.0, start + 4.2)
+        scheduler.record_visit(4, 3, start + 6.0, start + 7.7)
+    assert scheduler.respawn_interval(1) is None
+    assert scheduler.choose_target(2, now=now + 500.0)[0] == 4
+    assert scheduler.next_direction(2, now=now + 500.0) == 'right'
+
+
+def test_unvisited_areas_are_worth_exploring():
+    scheduler = PatrolScheduler(3)
+    scheduler.record_visit(1, 1, 100.0, 101.0)
+    assert scheduler.next_direction(1, now=102.0) == 'right'
+
+
+def test_benchmark_prefers_the_scheduler_on_uneven_areas():
+    results = patrol_scheduler.benchmark(duration=1800.0, seeds=3)
+    assert set(results) == {'sweep', 'scheduled'}
+    assert results['scheduled'] > results['sweep']
+
+
+def test_simulation_is_reproducible():
+    areas = [(20.0, 2), (200.0, 1), (200.0, 1)]
+    assert patrol_scheduler.simulate('sweep', areas, 600.0, seed=4) == patrol_scheduler.simulate('sweep', areas, 600.0, seed=4)
@@ -0,0 +1,126 @@
+import threading
+import pytest
+import unified_bot.input_backend as input_backend
+import unified_bot.rein_actions as rein_actions
+import unified_bot.rein_bot_logic as rein_bot_logic
+import unified_bot.rein_readiness as rein_readiness
+import unified_bot.rein_state_machine as state_machine
+import unified_bot.settings_manager as settings_manager
+
+CONFIG = {'readiness_poll_interval': 0.005, 'readiness_recheck_time': 0.05}
+
+
+class LateChange(rein_readiness.RoiChange):
+    """RoiChange stand-in that reports ready from its 'ready_after'-th check on."""
+    def __init__(self, ready_after):
+        self.checks = 0
+        self.armed = 0
+        self.ready_after = ready_after
+
+    def arm(self):
+        self.armed += 1
+
+    def __call__(self):
+        self.checks += 1
+        return self.checks >= self.ready_after
+
+
+@pytest.fixture
+def step(monkeypatch):
+    clicks = []
+    built = []
+
+    def click_button(button_key, config, stop_event, before_click=None, **kwargs):
+        if before_click is not None:
+            before_click()
+        clicks.append(button_key)
+
+    def make_predicate(step_key, config, screens=None):
+        built.append(step_key)
+        return predicate
+    monkeypatch.setattr(rein_actions, 'click_button', click_button)
+    monkeypatch.setattr(rein_actions, 'start_preposition', lambda *args: None)
+    monkeypatch.setattr(rein_readiness, 'make_predicate', make_predicate)
+    monkeypatch.setattr(rein_bot_logic, '_unconfirmed', {})
+    predicate = LateChange(ready_after=10 ** 6)
+    return predicate, clicks, built
+
+
+def test_retry_rechecks_the_first_baseline_instead_of_clicking_again(step):
+    predicate, clicks, built = step
+    with pytest.raises(state_machine.StepFailed):
+        rein_bot_logic.click_and_wait('options_button', 0.02, CONFIG, threading.Event())
+    # The click lands late: the next check of the same predicate sees it
+    predicate.ready_after = predicate.checks + 1
+
+    assert rein_bot_logic.click_and_wait('options_button', 0.02, CONFIG, threading.Event()) is False
+    assert clicks == ['options_button']
+    assert built == ['options_button']
+
+
+def test_retry_clicks_again_with_the_same_baseline(step):
+    predicate, clicks, built = step
+    with pytest.raises(state_machine.StepFailed):
+        rein_bot_logic.click_and_wait('reincarnate_final_button', 0.02, CONFIG, threading.Event())
+    with pytest.raises(state_machine.StepFailed):
+        rein_bot_logic.click_and_wait('reincarnate_final_button', 0.02, CONFIG, threading.Event())
+
+    assert clicks == ['reincarnate_final_button'] * 2
+    assert built == ['reincarnate_final_button']
+    # Armed with the cursor on the button for the first click only
+    assert predicate.armed == 1
+
+
+def test_final_reincarnate_watches_its_own_button():
+    assert rein_readiness.watches_own_point('reincarnate_final_button')
+    assert not rein_readiness.watches_own_point('options_button')
+
+
+@pytest.mark.parametrize('start, end, hit', [
+    ((0, 0), (100, 100), True),     # passes through the box
+    ((0, 0), (10, 10), False),      # stops short of it
+    ((0, 70), (100, 70), False),    # runs beside it
+    ((50, 50), (50, 50), True),     # starts inside it
+])
+def test_segment_against_box(start, end, hit):
+    assert rein_actions._segment_hits_box(start, end, (40, 40, 60, 60)) is hit
+
+
+def test_preposition_path_over_an_ocr_region_is_refused():
+    config = {'regions': {'qi': [300, 100, 100, 30]}, 'mouse_variability': 3}
+    # Ends well clear of the region but crosses it on the way
+    assert rein_actions._crosses_ocr_region((350, 0), (350, 400), config)
+    assert not rein_actions._crosses_ocr_region((0, 400), (600, 400), config)
+
+
+@pytest.fixture
+def backend():
+    recorder = input_backend.RecordingBackend(start_pos=(0, 300))
+    previous = input_backend.set_backend(recorder)
+    input_backend.seed(7)
+    yield recorder
+    input_backend.set_backend(previous)
+    rein_actions._parked = None
+
+
+def test_parked_cursor_jumps_straight_onto_its_button(backend):
+    config = settings_manager.get_rein_default_settings()
+    config['calibrated_points'] = {'options_button': (600, 400), 'stats_button': (100, 500)}
+    rein_actions.preposition_mouse('options_button', config, threading.Event())
+    assert rein_actions._parked == ('options_button', backend.position())
+
+    backend.clear()
+    rein_actions.click_button('options_button', config, threading.Event())
+    assert backend.counts()['move_rel'] == 1
+    assert rein_actions._parked is None
+
+
+def test_parked_spot_is_not_used_for_another_button(backend):
+    config = settings_manager.get_rein_default_settings()
+    config['calibrated_points'] = {'options_button': (600, 400), 'stats_button': (600, 330)}
+    rein_actions.preposition_mouse('options_button', config, threading.Event())
+
+    backend.clear()
+    rein_actions.click_button('stats_button', config, threading.Event())
+    # A normal trajectory with the configured snap, not one jump
+    assert backend.counts()['move_rel'] > 1
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from PIL import Image
+import unified_bot.rein_vision as rein_vision
+import unified_bot.ocr_engine as ocr_engine
+import unified_bot.glyph_recognizer as glyph_recognizer
+
+CROP = Image.fromarray(np.full((20, 80, 3), 30, dtype=np.uint8))
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.learned = []
+
+    def learn(self, image, text):
+        self.learned.append(text)
+        return True
+
+    def save(self):
+        pass
+
+
+@pytest.fixture
+def recognizer(monkeypatch):
+    fake = FakeRecognizer()
+    monkeypatch.setattr(glyph_recognizer, 'get_recognizer', lambda: fake)
+    return fake
+
+
+def second_read(monkeypatch, text):
+    reads = []
+
+    def read_images(images, options=None, **kwargs):
+        reads.append(options)
+        return [text]
+    monkeypatch.setattr(ocr_engine, 'read_images', read_images)
+    return reads
+
+
+def test_learns_when_a_second_read_agrees(monkeypatch, recognizer):
+    reads = second_read(monkeypatch, 'Golden Crow')
+    assert rein_vision.confirm_read('bloodline', 'Golden Crow', (CROP, 'engine', False))
+    assert recognizer.learned == ['Golden Crow']
+    assert len(reads) == 1
+
+
+def test_does_not_learn_when_the_second_read_disagrees(monkeypatch, recognizer):
+    second_read(monkeypatch, 'Golden Cr0w')
+    assert not rein_vision.confirm_read('bloodline', 'Golden Crow', (CROP, 'engine', False))
+    assert recognizer.learned == []
+
+
+@pytest.mark.parametrize('source', ['glyph', 'cache'])
+def test_reads_not_from_the_engine_are_not_relearned(monkeypatch, recognizer, source):
+    reads = second_read(monkeypatch, 'Golden Crow')
+    assert not rein_vision.confirm_read('bloodline', 'Golden Crow', (CROP, source, False))
+    assert not rein_vision.confirm_read('bloodline', 'Golden Crow', None)
+    assert reads == [] and recognizer.learned == []
@@ -0,0 +1,42 @@
+import itertools
+import pytest
+import unified_bot.route_planner as route_planner
+
+
+def brute_force(start, points, end=None):
+    best = min(itertools.permutations(range(len(points))),
+               key=lambda order: route_planner.route_travel(start, points, list(order), end))
+    return route_planner.route_travel(start, points, list(best), end)
+
+
+def nearest_neighbour(start, points, end=None):
+    left = list(range(len(points)))
+    order, current = [], start
+    while left:
+        nearest = min(left, key=lambda i: (points[i][0] - current[0]) ** 2 + (points[i][1] - current[1]) ** 2)
+        order.append(nearest)
+        left.remove(nearest)
+        current = points[nearest]
+    return route_planner.route_travel(start, points, order, end)
+
+
+def test_small_inputs():
+    assert route_planner.plan_click_route((0, 0), []) == []
+    assert route_planner.plan_click_route((0, 0), [(5, 5)]) == [0]
+
+
+@pytest.mark.parametrize('end', [None, (0, 400)])
+def test_route_beats_nearest_neighbour_and_is_close_to_optimal(end):
+    start = (0, 0)
+    points = [(300, 20), (40, 310), (220, 200), (10, 90), (330, 330), (150, 40), (90, 180)]
+    order = route_planner.plan_click_route(start, points, end, time_budget=0.05)
+    assert sorted(order) == list(range(len(points)))
+    travel = route_planner.route_travel(start, points, order, end)
+    assert travel <= nearest_neighbour(start, points, end) + 1e-6
+    assert travel <= brute_force(start, points, end) * 1.1
+
+
+def test_route_ends_near_the_exit():
+    points = [(100, 0), (200, 0), (300, 0)]
+    order = route_planner.plan_click_route((200, 50), points, end_pos=(400, 0), time_budget=0.05)
+    assert order[-1] == 2
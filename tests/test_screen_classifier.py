@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+import unified_bot.screen_classifier as screen_classifier
+
+POINTS = [(40, 30), (600, 30), (320, 400)]
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    state = {'frame': np.zeros((480, 640, 3), dtype=np.uint8), 'captures': []}
+
+    def capture(region):
+        state['captures'].append(region)
+        left, top, width, height = region
+        return state['frame'][top:top + height, left:left + width]
+    monkeypatch.setattr(screen_classifier, '_capture', capture)
+    return state
+
+
+def paint(screen, color):
+    screen['frame'][:] = color
+    screen['frame'][::7, ::5] = 255 - np.asarray(color)
+
+
+def test_one_capture_per_classification(screen):
+    classifier = screen_classifier.for_points(POINTS)
+    paint(screen, (20, 30, 90))
+    classifier.record('in_game')
+    paint(screen, (200, 190, 180))
+    classifier.record('stats_page')
+    screen['captures'].clear()
+
+    assert classifier.classify()[0] == 'stats_page'
+    paint(screen, (20, 30, 90))
+    assert classifier.classify()[0] == 'in_game'
+    assert screen['captures'] == [classifier.bounds] * 2
+
+
+def test_unknown_screen_is_not_matched(screen):
+    classifier = screen_classifier.for_points(POINTS)
+    paint(screen, (20, 30, 90))
+    classifier.record('in_game')
+    paint(screen, (250, 250, 20))
+    assert classifier.classify()[0] is None
+
+
+def test_patches_match_separate_grabs(screen):
+    paint(screen, (60, 120, 30))
+    screen['frame'][25:35, 595:605] = (255, 0, 0)
+    classifier = screen_classifier.for_points(POINTS)
+    for patch, (left, top, width, height) in zip(classifier.grab(), classifier.patches):
+        assert np.array_equal(patch, screen['frame'][top:top + height, left:left + width])
+
+
+def test_saved_signatures_need_the_same_points(screen):
+    classifier = screen_classifier.for_points(POINTS)
+    paint(screen, (20, 30, 90))
+    classifier.record('loading')
+    data = classifier.to_dict()
+
+    assert screen_classifier.load(data, POINTS).knows('loading')
+    assert screen_classifier.load(data, POINTS[:2]) is None
+    assert screen_classifier.load({'signatures': data['signatures']}) is None
@@ -0,0 +1,43 @@
+from unified_bot.spawn_map import SpawnMap
+
+REGION = (100, 50, 800, 600)
+
+
+def test_nearby_hits_merge_into_one_cluster():
+    spawn_map = SpawnMap(merge_radius=15)
+    spawn_map.record(1, (200, 200), now=1.0)
+    spawn_map.record(1, (210, 204), now=2.0)
+    spawn_map.record(1, (500, 400), now=3.0)
+    assert spawn_map.points(1) == [(205, 202, 2), (500, 400, 1)]
+
+
+def test_roi_needs_enough_hits_and_ignores_stray_cells():
+    spawn_map = SpawnMap(heat_cell=24)
+    for _ in range(9):
+        spawn_map.record(1, (300, 300))
+    assert spawn_map.search_roi(1, REGION, padding=0, min_hits=10) is None
+
+    spawn_map.record(1, (300, 300))
+    spawn_map.record(1, (10, 10))  # one stray hit in the far corner
+    roi = spawn_map.search_roi(1, REGION, padding=0, min_hits=10)
+    assert roi == (100 + 288, 50 + 288, 24, 24)
+    assert spawn_map.search_roi(1, REGION, padding=0, min_hits=10, min_cell_hits=1)[:2] == (100, 50)
+
+
+def test_roi_covering_most_of_the_region_is_not_used():
+    spawn_map = SpawnMap(heat_cell=24)
+    for pos in [(5, 5), (790, 590)] * 10:
+        spawn_map.record(1, pos)
+    assert spawn_map.search_roi(1, REGION, min_hits=10) is None
+
+
+def test_saved_map_is_dropped_when_the_region_changes(tmp_path):
+    path = tmp_path / 'spawn_map.json'
+    spawn_map = SpawnMap(path, REGION)
+    for _ in range(3):
+        spawn_map.record(2, (40, 40))
+    spawn_map.save(force=True)
+
+    assert SpawnMap(path, REGION).load().points(2) == [(40, 40, 3)]
+    moved = SpawnMap(path, (0, 0, 800, 600)).load()
+    assert moved.points(2) == [] and moved.heat == {}
@@ -0,0 +1,51 @@
+from unified_bot.strike_store import StrikeStore
+
+NOW = 1_700_000_000.0
+
+
+def test_jittered_spots_share_a_cell():
+    store = StrikeStore(grid_size=5)
+    assert store.add_strike('1', (100, 100), now=NOW) == 1
+    assert store.add_strike('1', (103, 101), now=NOW) == 2
+    # Across the cell boundary, found through the neighbour check
+    assert store.add_strike('1', (99, 104), now=NOW) == 3
+    assert len(store) == 1
+
+
+def test_counts_halve_every_half_life():
+    store = StrikeStore(half_life_hours=1.0)
+    store.add_strike('1', (10, 10), now=NOW)
+    store.add_strike('1', (10, 10), now=NOW)
+    assert store.get_strikes('1', (10, 10), now=NOW + 3600) == 1.0
+    assert store.get_strikes('1', (10, 10), now=NOW + 7200) == 0.5
+
+
+def test_least_recently_struck_cell_is_evicted():
+    store = StrikeStore(grid_size=5, max_cells=2)
+    store.add_strike('1', (0, 0), now=NOW)
+    store.add_strike('1', (50, 50), now=NOW + 1)
+    store.add_strike('1', (0, 0), now=NOW + 2)
+    store.add_strike('1', (100, 100), now=NOW + 3)
+    assert store.get_strikes('1', (0, 0), now=NOW + 3) > 0
+    assert store.get_strikes('1', (50, 50), now=NOW + 3) == 0.0
+    assert len(store) == 2
+
+
+def test_round_trip_keeps_counts():
+    store = StrikeStore(half_life_hours=24.0)
+    for _ in range(3):
+        store.add_strike('2', (40, 60), now=NOW)
+    loaded = StrikeStore.from_dict(store.to_dict(), half_life_hours=24.0, now=NOW)
+    assert round(loaded.get_strikes('2', (40, 60), now=NOW), 3) == 3.0
+
+
+def test_legacy_format_is_requantized():
+    legacy = {'1': {'100,100': 2, '102,103': 1}, '3': {'7,8': 4}}
+    store = StrikeStore.from_dict(legacy, grid_size=5, now=NOW)
+    assert store.get_strikes('1', (101, 101), now=NOW) == 3.0
+    assert store.get_strikes('3', (7, 8), now=NOW) == 4.0
+
+
+def test_unreadable_data_starts_fresh():
+    assert len(StrikeStore.from_dict({'areas': {'1': [['bad']]}}, now=NOW)) == 0
+    assert len(StrikeStore.from_dict(None, now=NOW)) == 0
@@ -0,0 +1,130 @@
+import logging
+import numpy as np
+import unified_bot.region_watch as region_watch
+
+logger = logging.getLogger(__name__)
+
+
+class AreaFingerprints:
+    """
+    Learns what each forage area looks like and tells which area a frame
+    of the search region shows.
+
+    A fingerprint is the low-resolution thumbnail from
+    region_watch.region_fingerprint. Areas are learned on the first visit
+    and blended with later confirmed visits, so buttons coming and going
+    do not dominate the comparison.
+
+    :param total_areas: Number of areas in the patrol.
+    :param match_threshold: Largest fingerprint difference (0-255) that
+                            still counts as the same area.
+    :param margin: How much closer another area must match than the
+                   expected one before the bot resyncs to it.
+    :param learn_rate: Weight of a new confirmed visit in the blend.
+    """
+    def __init__(self, total_areas, match_threshold=12.0, margin=4.0, learn_rate=0.2):
+        self.total_areas = int(total_areas)
+        self.match_threshold = match_threshold
+        self.margin = margin
+        self.learn_rate = learn_rate
+        self.prints = {}
+
+    def __len__(self):
+        return len(self.prints)
+
+    def complete(self):
+        """True once every area has a fingerprint."""
+        return all(area in self.prints for area in range(1, self.total_areas + 1))
+
+    def learn(self, area, fingerprint):
+        """Store (or blend in) the fingerprint of 'area'."""
+        current = self.prints.get(area)
+        if current is None or current.shape != fingerprint.shape:
+            self.prints[area] = fingerprint.astype(np.float32)
+        else:
+            self.prints[area] = (1.0 - self.learn_rate) * current + self.learn_rate * fingerprint
+
+    def classify(self, fingerprint):
+        """
+        :return: (area, difference) of the closest learned area, or
+                 (None, 255.0) if none are learned.
+        """
+        best_area, best_diff = None, 255.0
+        for area, known in self.prints.items():
+            diff = region_watch.signature_diff(fingerprint, known)
+            if diff < best_diff:
+                best_area, best_diff = area, diff
+        return best_area, best_diff
+
+    def identify(self, fingerprint):
+        """
+        :return: The learned area 'fingerprint' clearly matches (within
+                 match_threshold and 'margin' closer than any other
+                 area), or None.
+        """
+        diffs = sorted((region_watch.signature_diff(fingerprint, known), area)
+                       for area, known in self.prints.items())
+        if not diffs or diffs[0][0] > self.match_threshold:
+            return None
+        if len(diffs) > 1 and diffs[1][0] - diffs[0][0] < self.margin:
+            return None
+        return diffs[0][1]
+
+    def observe(self, expected_area, fingerprint):
+        """
+        Check a frame taken after arriving in 'expected_area' (the area the
+        click count says we are in).
+
+        :return: The area the bot is actually in: 'expected_area' unless
+                 the frame clearly matches a different learned area.
+        """
+        best_area, best_diff = self.classify(fingerprint)
+        if expected_area not in self.prints:
+            if best_area is not None and best_diff <= self.match_threshold / 2:
+                # Still learning, but this is clearly an area already seen
+                logger.warning(f"Area desync: Area {expected_area} looks like Area {best_area} "
+                               f"(diff {best_diff:.1f}). Resyncing.")
+                return best_area
+            self.learn(expected_area, fingerprint)
+            logger.debug(f"Learned fingerprint for Area {expected_area} ({len(self.prints)}/{self.total_areas})")
+            return expected_area
+
+        expected_diff = region_watch.signature_diff(fingerprint, self.prints[expected_area])
+        if (best_area == expected_area or best_diff > self.match_threshold
+                or expected_diff - best_diff < self.margin):
+            if expected_diff <= self.match_threshold:
+                self.learn(expected_area, fingerprint)
+            return expected_area
+
+        logger.warning(f"Area desync: expected Area {expected_area} (diff {expected_diff:.1f}), "
+                       f"frame matches Area {best_area} (diff {best_diff:.1f}). Resyncing.")
+        self.learn(best_area, fingerprint)
+        return best_area
+
+    def to_dict(self, region=None):
+        """
+        Serializable form for the forage settings file. 'region' is the
+        search region the fingerprints were taken of.
+        """
+        return {
+            'region': list(region) if region else None,
+            'total_areas': self.total_areas,
+            'prints': {str(area): np.rint(fp).astype(int).tolist() for area, fp in self.prints.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data, total_areas, region=None, **kwargs):
+        """
+        Rebuild saved fingerprints. They are dropped (an empty instance is
+        returned) if they were taken of a different search region or
+        patrol length.
+        """
+        fingerprints = cls(total_areas, **kwargs)
+        if not data:
+            return fingerprints
+        if data.get('total_areas') != int(total_areas) or (region and data.get('region') != list(region)):
+            logger.info("Search region or area count changed. Relearning area fingerprints.")
+            return fingerprints
+        for area, fp in data.get('prints', {}).items():
+            fingerprints.prints[int(area)] = np.array(fp, dtype=np.float32)
+        return fingerprints
@@ -0,0 +1,81 @@
+import re
+import logging
+import difflib
+
+logger = logging.getLogger(__name__)
+
+# Characters OCR commonly reads in place of letters in bloodline names
+CONFUSABLES = str.maketrans({
+    '0': 'o',
+    '1': 'l',
+    '|': 'l',
+    '!': 'l',
+    '5': 's',
+    '8': 'b',
+    '$': 's',
+})
+
+# How many trigram candidates are re-scored with the slower edit similarity
+CANDIDATES = 5
+
+
+def normalize(text):
+    """Lowercase, map OCR confusables and collapse whitespace/punctuation."""
+    text = text.lower().translate(CONFUSABLES)
+    text = re.sub(r'[^\w\s-]', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class BloodlineResolver:
+    """
+    Matches (possibly misread) bloodline text to the ranked list.
+
+    The trigram index is built once; a lookup only scores names sharing a
+    trigram with the text, then re-ranks the best few by edit similarity.
+    """
+    def __init__(self, ranked_names):
+        self.names = list(ranked_names)
+        self.normalized = [normalize(name) for name in self.names]
+        self.exact = {}
+        self.index = {}
+        for rank, name in enumerate(self.normalized):
+            self.exact.setdefault(name, rank)
+            for gram in trigrams(name):
+                self.index.setdefault(gram, []).append(rank)
+        self.gram_counts = [len(trigrams(name)) for name in self.normalized]
+
+    def resolve(self, text):
+        """
+        :param text: Raw or cleaned bloodline text.
+        :return: (rank, score) of the closest ranked bloodline, score 0-1
+                 (1.0 for an exact match), or (-1, 0.0) if nothing is close.
+        """
+        key = normalize(text)
+        if not key:
+            return -1, 0.0
+        if key in self.exact:
+            return self.exact[key], 1.0
+
+        grams = trigrams(key)
+        shared = {}
+        for gram in grams:
+            for rank in self.index.get(gram, ()):
+                shared[rank] = shared.get(rank, 0) + 1
+        if not shared:
+            return -1, 0.0
+
+        # Dice coefficient on trigrams picks the candidates...
+        dice = sorted(((2.0 * count / (len(grams) + self.gram_counts[rank]), rank)
+                       for rank, count in shared.items()), reverse=True)[:CANDIDATES]
+        # ...and edit similarity decides between them (ties go to the better rank)
+        best_rank, best_score = -1, 0.0
+        for _, rank in dice:
+            score = difflib.SequenceMatcher(None, key, self.normalized[rank]).ratio()
+            if score > best_score or (score == best_score and rank < best_rank):
+                best_rank, best_score = rank, score
+        return best_rank, best_score
@@ -0,0 +1,125 @@
+import time
+import queue
+import logging
+import threading
+import unified_bot.mouse_trajectory as mouse_trajectory
+import unified_bot.input_backend as input_backend
+
+logger = logging.getLogger(__name__)
+
+
+class ClickExecutor(threading.Thread):
+    """
+    Worker thread that moves the mouse and clicks planned targets in order,
+    so the bot thread can keep detecting/verifying during mouse travel.
+
+    Frames are invalidated around every click: take a token with
+    frame_token() before grabbing the screen and only use the frame if
+    frame_valid(token) is still True afterwards. A frame is invalid if it
+    overlaps a click or its 'click_settle_time' window. Each click waits
+    'click_settle_delay' after the move first (see
+    mouse_trajectory.settle_before_click).
+    
+    If 'grab_func' is given, clicks submitted with a 'watch_region' get a
+    screenshot of that region taken right before the click in
+    ticket['baseline'], for event-driven post-click waits.
+    """
+    def __init__(self, config, stop_event, backend=None, grab_func=None):
+        super().__init__(name="ClickExecutorThread", daemon=True)
+        self.config = config
+        self.stop_event = stop_event
+        self.backend = backend or input_backend.get_backend()
+        self.grab_func = grab_func
+        self.settle_time = config.get('click_settle_time', 0.05)
+
+        self.click_queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._clicking = False
+        self._shutdown = threading.Event()
+
+    def submit(self, button, watch_region=None):
+        """
+        Queue a click on a detected button (a dict with at least 'pos').
+        'watch_region' is an optional (left, top, width, height) to capture
+        as ticket['baseline'] just before clicking.
+
+        :return: A ticket dict; ticket['done'] is set once the click has
+                 happened (ticket['clicked_at'] holds its time) or was
+                 cancelled (ticket['clicked_at'] stays None).
+        """
+        ticket = {'button': button, 'done': threading.Event(), 'clicked_at': None,
+                  'watch_region': watch_region, 'baseline': None}
+        self.click_queue.put(ticket)
+        return ticket
+
+    def frame_token(self):
+        """Return a token for a frame about to be grabbed (None if a click is in progress)."""
+        with self._lock:
+            return None if self._clicking else self._epoch
+
+    def frame_valid(self, token):
+        """True if no click started or finished since 'token' was taken."""
+        with self._lock:
+            return token is not None and not self._clicking and self._epoch == token
+
+    def is_idle(self):
+        """True if no clicks are queued or in progress."""
+        return self.click_queue.unfinished_tasks == 0
+
+    def shutdown(self):
+        """Stop the worker and cancel any queued clicks."""
+        self._shutdown.set()
+        self.join(timeout=1.0)
+        self._cancel_pending()
+
+    def run(self):
+        while not self._shutdown.is_set():
+            try:
+                ticket = self.click_queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            try:
+                if self.stop_event.is_set() or self._shutdown.is_set():
+                    continue
+                self._execute(ticket)
+            except Exception as e:
+                logger.error(f"Click executor failed on {ticket['button'].get('pos')}: {e}")
+            finally:
+                ticket['done'].set()
+                self.click_queue.task_done()
+        self._cancel_pending()
+
+    def _execute(self, ticket):
+        pos = ticket['button']['pos']
+        if not mouse_trajectory.move_to(pos, self.config, self.stop_event, backend=self.backend):
+            return
+        if mouse_trajectory.settle_before_click(self.config, self.stop_event):
+            return
+
+        if ticket['watch_region'] is not None and self.grab_func is not None:
+            try:
+                ticket['baseline'] = self.grab_func(ticket['watch_region'])
+            except Exception as e:
+                logger.debug(f"Could not capture baseline for {pos}: {e}")
+
+        with self._lock:
+            self._clicking = True
+            self._epoch += 1
+        try:
+            self.backend.click()
+            ticket['clicked_at'] = time.time()
+            mouse_trajectory.precise_sleep_until(time.perf_counter() + self.settle_time, self.stop_event)
+        finally:
+            with self._lock:
+                self._clicking = False
+                self._epoch += 1
+
+    def _cancel_pending(self):
+        while True:
+            try:
+                ticket = self.click_queue.get_nowait()
+            except queue.Empty:
+                return
+            ticket['done'].set()
+            self.click_queue.task_done()
@@ -2,16 +2,22 @@ import time
 import logging
 import threading
 import numpy as np
-import pyautogui
-import pydirectinput
 import cv2
-from pynput import mouse
 import unified_bot.settings_manager as settings_manager
+from unified_bot.strike_store import StrikeStore
+import unified_bot.route_planner as route_planner
+import unified_bot.mouse_trajectory as mouse_trajectory
+import unified_bot.input_backend as input_backend
+from unified_bot.click_executor import ClickExecutor
+import unified_bot.region_watch as region_watch
+from unified_bot.area_fingerprints import AreaFingerprints
+from unified_bot.patrol_scheduler import PatrolScheduler, sweep_direction
+from unified_bot.spawn_map import SpawnMap
 
 logger = logging.getLogger(__name__)
 
 # Global state
-STRIKE_COUNTS = {}
+STRIKE_COUNTS = StrikeStore()
 BLACKLIST = {}
 
 
@@ -154,10 +160,34 @@ def find_rgb_targets(screenshot, region, target_rgb=(255, 255, 255), tolerance=5
         return []
 
 
-def find_buttons_advanced(canny_templates, region, settings):
+def screenshot(region):
+    """Screenshot of 'region' (left, top, width, height) as a PIL image."""
+    import pyautogui
+    return pyautogui.screenshot(region=region)
+
+
+def grab_region(region, executor=None, max_attempts=20):
+    """
+    Screenshot 'region', retrying until the frame does not overlap a click
+    by 'executor' (see ClickExecutor.frame_token). Returns the last frame if
+    no clean one was captured within 'max_attempts'.
+    """
+    screenshot_pil = None
+    for _ in range(max_attempts):
+        token = executor.frame_token() if executor else None
+        screenshot_pil = screenshot(region)
+        if executor is None or executor.frame_valid(token):
+            return screenshot_pil
+        time.sleep(0.005)
+    logger.debug(f"No click-free frame of {region} after {max_attempts} attempts")
+    return screenshot_pil
+
+
+def find_buttons_advanced(canny_templates, region, settings, screenshot_pil=None):
     """Find buttons in a region using template matching."""
     try:
-        screenshot_pil = pyautogui.screenshot(region=region)
+        if screenshot_pil is None:
+            screenshot_pil = screenshot(region)
         screenshot_bgr = cv2.cvtColor(np.array(screenshot_pil), cv2.COLOR_RGB2BGR)
         screenshot_gray = cv2.cvtColor(screenshot_bgr, cv2.COLOR_BGR2GRAY)
         
@@ -213,71 +243,227 @@ def find_buttons_advanced(canny_templates, region, settings):
         return []
 
 
+def find_targets(screenshot, region, game_region, detection_method, templates, settings):
+    """
+    Run the configured detection on 'screenshot' of 'region' (any box
+    inside 'game_region'). 'center_rel' and 'box_rel' of the results are
+    relative to 'game_region', like a full-region scan.
+    """
+    if detection_method == 'RGB Color Detection':
+        buttons = find_rgb_targets(screenshot, region,
+                                   (settings.get('rgb_target_r', 255),
+                                    settings.get('rgb_target_g', 255),
+                                    settings.get('rgb_target_b', 255)),
+                                   settings.get('rgb_tolerance', 5),
+                                   settings.get('rgb_min_cluster', 10),
+                                   settings.get('rgb_max_cluster', 1000))
+    else:  # Template Matching
+        buttons = find_buttons_advanced(templates, region, settings, screenshot)
+    
+    dx, dy = int(region[0]) - int(game_region[0]), int(region[1]) - int(game_region[1])
+    if dx or dy:
+        for button in buttons:
+            button['center_rel'] = (button['center_rel'][0] + dx, button['center_rel'][1] + dy)
+            box = button['box_rel']
+            button['box_rel'] = (box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy)
+    return buttons
+
+
+def scan_spawn_points(boxes, game_region, detection_method, templates, settings, executor=None, frame=None):
+    """
+    Detection limited to small boxes around known spawn points.
+
+    :param frame: Optional screenshot of the whole 'game_region' to crop
+                  the boxes from; otherwise each box is grabbed on its own.
+    :return: Detected buttons (duplicates from overlapping boxes removed).
+    """
+    found = []
+    for box in boxes:
+        if frame is not None:
+            left, top = box[0] - game_region[0], box[1] - game_region[1]
+            shot = frame.crop((left, top, left + box[2], top + box[3]))
+        else:
+            shot = grab_region(box, executor)
+        for button in find_targets(shot, box, game_region, detection_method, templates, settings):
+            x, y = button['center_rel']
+            if all((x - b['center_rel'][0]) ** 2 + (y - b['center_rel'][1]) ** 2 > 100 for b in found):
+                found.append(button)
+    return found
+
+
 def safe_human_click(pos, settings, stop_event):
-    """Move mouse and click with human-like movement."""
-    try:
-        factor = settings['mouse_speed_factor']
-        snap_distance = settings['mouse_snap_distance']
-    except KeyError:
-        factor = 0.3
-        snap_distance = 5
-        
-    target_x, target_y = int(pos[0]), int(pos[1])
+    """Move mouse along a precomputed ease-out trajectory and click."""
+    backend = input_backend.get_backend()
+    if not mouse_trajectory.move_to(pos, settings, stop_event, backend=backend):
+        return
+    if mouse_trajectory.settle_before_click(settings, stop_event):
+        return
+    backend.click()
+
+
+def is_full_sweep_visit(visits, every):
+    """
+    True if the 'visits'-th visit to an area (counting from 1) sweeps the
+    whole search region instead of the learned ROI: the first visit, then
+    every 'every' visits after it.
+    """
+    return (visits - 1) % max(1, int(every)) == 0
+
+
+def get_rescan_box(button, game_region, padding=10):
+    """Return the absolute (left, top, width, height) box used to re-check a clicked button."""
+    box = button['box_rel']
     
-    while True:
+    box_left_rel = int(box[0]) - padding
+    box_top_rel = int(box[1]) - padding
+    box_width = (int(box[2]) - int(box[0])) + padding * 2
+    box_height = (int(box[3]) - int(box[1])) + padding * 2
+
+    r_left = int(max(game_region[0], game_region[0] + box_left_rel))
+    r_top = int(max(game_region[1], game_region[1] + box_top_rel))
+    return (r_left, r_top, int(box_width), int(box_height))
+
+
+def get_next_arrow_pos(current_area, movement_direction, total_areas, left_arrow_pos, right_arrow_pos,
+                       scheduler=None):
+    """
+    Return the arrow the patrol will click once the current area is clear:
+    the one 'scheduler' (a PatrolScheduler, in scheduled mode) heads for,
+    otherwise the sweep's (see patrol_scheduler.sweep_direction).
+    """
+    if scheduler is not None:
+        direction = scheduler.next_direction(current_area)
+    else:
+        direction = sweep_direction(current_area, movement_direction, total_areas)
+    return right_arrow_pos if direction == 'right' else left_arrow_pos
+
+
+def click_arrow_and_wait(arrow_pos, game_region, config, stop_event, retries=1, timeout=None):
+    """
+    Click a navigation arrow and wait until the search region shows a new,
+    stable area (compared by a low-resolution fingerprint).
+
+    'area_load_delay' is the fastest the old blind wait allowed; the
+    visual wait gives up after 'timeout' (default 'area_change_timeout',
+    twice that) and re-clicks the arrow if nothing changed at all. The
+    region is checked once more right before a re-click, so a transition
+    that only started after the deadline is not clicked a second time.
+
+    :return: 'stable' or 'changing' if the area changed, 'unchanged' if it
+             never did (click dropped every time, or already at the edge).
+    """
+    if timeout is None:
+        timeout = config.get('area_change_timeout', config['area_load_delay'] * 2)
+    poll_interval = config.get('area_poll_interval', 0.05)
+    grab_fingerprint = lambda: region_watch.region_fingerprint(screenshot(game_region))
+    
+    before = grab_fingerprint()
+    status = 'unchanged'
+    for attempt in range(retries + 1):
         if stop_event.is_set():
-            return
-        
-        current_x, current_y = pydirectinput.position()
-        
-        remaining_x = target_x - current_x
-        remaining_y = target_y - current_y
-        
-        distance = max(abs(remaining_x), abs(remaining_y))
-        
-        if distance < snap_distance:
             break
-            
-        move_x = np.round(remaining_x * factor)
-        move_y = np.round(remaining_y * factor)
-        
-        if move_x == 0 and remaining_x != 0:
-            move_x = 1 if remaining_x > 0 else -1
-        if move_y == 0 and remaining_y != 0:
-            move_y = 1 if remaining_y > 0 else -1
-            
-        pydirectinput.moveRel(int(move_x), int(move_y), relative=True)
-        time.sleep(0.001)
-
-    final_x, final_y = pydirectinput.position()
-    final_move_x = target_x - final_x
-    final_move_y = target_y - final_y
-    if final_move_x != 0 or final_move_y != 0:
-        pydirectinput.moveRel(final_move_x, final_move_y, relative=True)
-        
-    pydirectinput.click()
+        safe_human_click(arrow_pos, config, stop_event)
+        status, waited = region_watch.wait_for_change(grab_fingerprint, before, time.time() + timeout,
+                                                      stop_event, poll_interval)
+        if status != 'unchanged':
+            logger.debug(f"Area transition {status} after {waited:.2f}s")
+            break
+        if attempt < retries:
+            if region_watch.signature_diff(grab_fingerprint(), before) >= region_watch.CHANGE_THRESHOLD:
+                logger.debug("Area changed after the wait gave up. Not clicking again")
+                return 'changing'
+            logger.warning(f"Area did not change after arrow click. Retrying ({attempt + 1}/{retries})...")
+    return status
 
 
-def go_to_start_position(left_arrow_pos, total_areas, load_delay, settings, stop_event):
-    """Navigate to the starting position (Area 1)."""
+def go_to_start_position(left_arrow_pos, total_areas, load_delay, settings, stop_event, area_prints=None):
+    """
+    Navigate to the starting position (Area 1).
+    Stops as soon as 'area_prints' (optional AreaFingerprints) recognise
+    Area 1, without clicking into the edge. Otherwise stops once a left
+    click no longer changes the area; those clicks wait only 'load_delay'
+    for the change to start, since the last one is expected to do nothing.
+    """
     logger.info("Moving to starting position (Area 1)...")
+    game_region = tuple(settings['search_region'])
     for i in range(total_areas):
         if stop_event.is_set():
             return False
+        if area_prints is not None and len(area_prints):
+            try:
+                seen_area = area_prints.identify(region_watch.region_fingerprint(screenshot(game_region)))
+            except Exception as e:
+                logger.debug(f"Could not check the current area: {e}")
+                seen_area = None
+            if seen_area == 1:
+                logger.debug("Area 1 recognised. Already at leftmost area")
+                break
         logger.debug(f"Going left... ({i+1}/{total_areas})")
-        safe_human_click(left_arrow_pos, settings, stop_event)
-        time.sleep(load_delay)
+        if click_arrow_and_wait(left_arrow_pos, game_region, settings, stop_event, timeout=load_delay) == 'unchanged':
+            logger.debug("Area no longer changes. Already at leftmost area")
+            break
+    if stop_event.is_set():
+        return False
     logger.info("Reached starting position")
     return True
 
 
+def resume_patrol(patrol_state, area_prints, game_region, config):
+    """
+    Work out where the last run left off from its saved patrol state,
+    confirmed by what the search region shows now.
+
+    :return: (area, movement_direction), or None if the bot has to go back
+             to the start position.
+    """
+    if not patrol_state or area_prints is None or not len(area_prints):
+        return None
+    age = time.time() - patrol_state.get('saved_at', 0)
+    if age > config.get('patrol_resume_max_age', 6 * 3600.0):
+        logger.info(f"Saved patrol position is {age / 3600:.1f}h old. Starting from Area 1")
+        return None
+    
+    saved_area = patrol_state.get('area')
+    direction = patrol_state.get('direction', 'right')
+    try:
+        seen_area = area_prints.identify(region_watch.region_fingerprint(screenshot(game_region)))
+    except Exception as e:
+        logger.warning(f"Could not check the saved patrol position: {e}")
+        return None
+    if seen_area is None:
+        logger.info(f"Could not confirm the saved position (Area {saved_area}) on screen. Starting from Area 1")
+        return None
+    if seen_area != saved_area:
+        logger.info(f"Saved position was Area {saved_area}, but the screen shows Area {seen_area}")
+    logger.info(f"Resuming patrol at Area {seen_area} (moving {direction})")
+    return seen_area, direction
+
+
+def save_patrol_state(settings_file, current_area, movement_direction, area_prints=None, game_region=None):
+    """Save where the patrol is (and the learned area fingerprints) so the next start can resume."""
+    try:
+        settings = settings_manager.load_settings(settings_file,
+                                                  settings_manager.get_forage_default_settings())
+        settings['patrol_state'] = {
+            'area': current_area,
+            'direction': movement_direction,
+            'saved_at': time.time(),
+        }
+        if area_prints is not None:
+            settings['area_fingerprints'] = area_prints.to_dict(game_region)
+        settings_manager.save_settings(settings_file, settings)
+    except Exception as e:
+        logger.error(f"Could not save patrol state: {e}")
+
+
 def save_learning_data(settings_file):
     """Save strike counts and blacklist to settings file."""
     global STRIKE_COUNTS, BLACKLIST
     try:
         settings = settings_manager.load_settings(settings_file, 
                                                   settings_manager.get_forage_default_settings())
-        settings['strike_counts'] = STRIKE_COUNTS
+        STRIKE_COUNTS.prune()
+        settings['strike_counts'] = STRIKE_COUNTS.to_dict()
         settings['blacklist'] = BLACKLIST
         settings_manager.save_settings(settings_file, settings)
     except Exception as e:
@@ -297,8 +483,12 @@ def forage_bot_loop(config, stop_event, template_path):
     logger.info("Forage bot loop starting...")
     
     # Load learning data from settings
-    STRIKE_COUNTS = config.get('strike_counts', {})
+    STRIKE_COUNTS = StrikeStore.from_dict(config.get('strike_counts', {}),
+                                          grid_size=config.get('strike_grid_size', 5),
+                                          half_life_hours=config.get('strike_decay_hours', 24.0),
+                                          max_cells=config.get('strike_max_cells', 200))
     BLACKLIST = config.get('blacklist', {})
+    logger.debug(f"Loaded {len(STRIKE_COUNTS)} strike cells")
     
     # Determine detection method
     detection_method = config.get('detection_method', 'Template Matching')
@@ -321,6 +511,40 @@ def forage_bot_loop(config, stop_event, template_path):
     movement_direction = 'right'
     recent_clicks = []
     first_run = True
+    
+    # Confirms current_area from the frame after every transition (learned on the first patrol)
+    area_prints = None
+    if config.get('area_fingerprints_enabled', True):
+        area_prints = AreaFingerprints.from_dict(config.get('area_fingerprints'), config['total_areas'], game_region,
+                                                 match_threshold=config.get('area_match_threshold', 12.0))
+    arrived = True
+    failed_moves = 0
+    
+    # 'scheduled' picks the next area from learned respawn rates instead of the fixed sweep
+    scheduler = None
+    if config.get('patrol_mode', 'sweep') == 'scheduled':
+        scheduler = PatrolScheduler(config['total_areas'], travel_time=config['area_load_delay'])
+        logger.info("Patrol mode: scheduled")
+    arrived_at = time.time()
+    visit_found = 0
+    visit_recorded = False
+    
+    # Known spawn points are checked before scanning the whole region
+    spawn_map = None
+    if config.get('spawn_map_enabled', True):
+        spawn_map = SpawnMap(settings_manager.SPAWN_MAP_FILE, game_region).load()
+    area_visits = {}
+    spawn_hits = False
+    full_scan_pending = True
+    full_sweep_pending = True
+    
+    # Clicks run on their own thread so verification overlaps mouse travel
+    pipeline_clicks = config.get('pipeline_clicks', True)
+    executor = ClickExecutor(config, stop_event, grab_func=screenshot)
+    executor.start()
+    
+    # post_click_delay is only an upper bound; the wait ends once the button's box reacts
+    reaction_stats = region_watch.ReactionStats("Post-click", config['post_click_delay'])
 
     while not stop_event.is_set():
         try:
@@ -328,13 +552,22 @@ def forage_bot_loop(config, stop_event, template_path):
             recent_clicks = [c for c in recent_clicks if now - c[2] < config['click_cooldown_seconds']]
             
             if first_run:
-                if not go_to_start_position(left_arrow_pos, config['total_areas'], 
-                                          config['area_load_delay'], config, stop_event):
-                    time.sleep(0.1)
-                    continue
-                current_area = 1
-                movement_direction = 'right'
+                # Pick up where the last run stopped if the screen confirms it
+                resumed = resume_patrol(config.get('patrol_state'), area_prints, game_region, config)
+                if resumed is not None:
+                    current_area, movement_direction = resumed
+                else:
+                    if not go_to_start_position(left_arrow_pos, config['total_areas'], 
+                                              config['area_load_delay'], config, stop_event, area_prints):
+                        time.sleep(0.1)
+                        continue
+                    current_area = 1
+                    movement_direction = 'right'
                 first_run = False
+                arrived = True
+                arrived_at = time.time()
+                visit_found = 0
+                visit_recorded = False
             
             try:
                 area_key = str(current_area)
@@ -349,14 +582,61 @@ def forage_bot_loop(config, stop_event, template_path):
                 min_cluster = config.get('rgb_min_cluster', 10)
                 max_cluster = config.get('rgb_max_cluster', 1000)
                 
-                # Use appropriate detection method
-                if detection_method == 'RGB Color Detection':
-                    screenshot_pil = pyautogui.screenshot(region=game_region)
-                    all_found_buttons = find_rgb_targets(screenshot_pil, game_region,
-                                                        target_rgb, tolerance,
-                                                        min_cluster, max_cluster)
-                else:  # Template Matching
-                    all_found_buttons = find_buttons_advanced(all_templates, game_region, config)
+                screenshot_pil = None
+                if arrived:
+                    arrived = False
+                    # First frame in a new area: make sure it is the area we think it is
+                    if area_prints is not None:
+                        screenshot_pil = grab_region(game_region, executor)
+                        seen_area = area_prints.observe(current_area, region_watch.region_fingerprint(screenshot_pil))
+                        if seen_area != current_area:
+                            current_area = seen_area
+                            area_key = str(current_area)
+                            area_blacklist = BLACKLIST.get(area_key, [])
+                    area_visits[area_key] = area_visits.get(area_key, 0) + 1
+                    spawn_hits = False
+                    full_sweep_pending = is_full_sweep_visit(area_visits[area_key], config.get('roi_full_sweep_every', 10))
+                    full_scan_pending = (full_sweep_pending or
+                                         area_visits[area_key] % max(1, config.get('spawn_full_scan_every', 5)) == 0)
+                
+                # Check the known spawn points first. The area's search region is
+                # scanned periodically, and whenever they have turned up nothing this visit.
+                full_scan = True
+                spawn_boxes = []
+                if spawn_map is not None and not full_scan_pending:
+                    spawn_boxes = spawn_map.boxes(area_key, game_region, config.get('spawn_roi_size', 80),
+                                                  config.get('spawn_max_points', 8))
+                if spawn_boxes:
+                    all_found_buttons = scan_spawn_points(spawn_boxes, game_region, detection_method, all_templates,
+                                                          config, executor, screenshot_pil)
+                    spawn_hits = spawn_hits or bool(all_found_buttons)
+                    full_scan = not spawn_hits
+                if full_scan:
+                    # Only the part of the region where buttons have appeared,
+                    # except for a periodic sweep of all of it to find new spots
+                    scan_region = None
+                    if spawn_map is not None and not full_sweep_pending:
+                        scan_region = spawn_map.search_roi(area_key, game_region, config.get('roi_padding', 40),
+                                                           config.get('roi_min_hits', 10),
+                                                           min_cell_hits=config.get('roi_min_cell_hits', 2))
+                    if scan_region is None:
+                        scan_region = game_region
+                        full_sweep_pending = False
+                    else:
+                        logger.debug(f"Scanning learned ROI {scan_region} "
+                                     f"({100.0 * scan_region[2] * scan_region[3] / (game_region[2] * game_region[3]):.0f}% of the region)")
+                    if scan_region == game_region:
+                        if screenshot_pil is None:
+                            screenshot_pil = grab_region(game_region, executor)
+                        scan_shot = screenshot_pil
+                    elif screenshot_pil is not None:
+                        left, top = scan_region[0] - game_region[0], scan_region[1] - game_region[1]
+                        scan_shot = screenshot_pil.crop((left, top, left + scan_region[2], top + scan_region[3]))
+                    else:
+                        scan_shot = grab_region(scan_region, executor)
+                    all_found_buttons = find_targets(scan_shot, scan_region, game_region, detection_method,
+                                                     all_templates, config)
+                    full_scan_pending = False
                 
                 found_buttons = []
                 for btn in all_found_buttons:
@@ -382,68 +662,76 @@ def forage_bot_loop(config, stop_event, template_path):
                     action_taken = True
                     logger.info(f"Found {len(buttons_to_click)} new targets. Optimizing click path...")
                     
-                    current_mouse_pos = pydirectinput.position()
-                    remaining_buttons = list(buttons_to_click)
+                    current_mouse_pos = input_backend.get_backend().position()
+                    next_arrow_pos = get_next_arrow_pos(current_area, movement_direction, config['total_areas'],
+                                                        left_arrow_pos, right_arrow_pos, scheduler)
+                    button_positions = [b['pos'] for b in buttons_to_click]
+                    route = route_planner.plan_click_route(current_mouse_pos, button_positions, next_arrow_pos,
+                                                           config.get('route_time_budget', 0.005))
+                    remaining_buttons = [buttons_to_click[i] for i in route]
+                    logger.debug(f"Planned route: {route_planner.route_travel(current_mouse_pos, button_positions, route, next_arrow_pos):.0f}px of travel")
                     
                     learning_data_changed = False
                     
-                    while remaining_buttons and not stop_event.is_set():
-                        def get_sq_distance(p1, p2):
-                            return (int(p1[0]) - int(p2[0]))**2 + (int(p1[1]) - int(p2[1]))**2
-                        
-                        remaining_buttons.sort(key=lambda b: get_sq_distance(current_mouse_pos, b['pos']))
+                    # Queue the whole route up front when pipelining; otherwise
+                    # queue one click at a time and verify it before the next.
+                    pending = []
+                    while (remaining_buttons or pending) and not stop_event.is_set():
+                        while remaining_buttons and (pipeline_clicks or not pending):
+                            button = remaining_buttons.pop(0)
+                            clean_pos = (int(button['pos'][0]), int(button['pos'][1]))
+                            logger.info(f"Clicking button at {clean_pos} (Confidence: {button['score']:.2f})")
+                            pending.append(executor.submit(button, get_rescan_box(button, game_region)))
                         
-                        button = remaining_buttons.pop(0)
+                        ticket = pending.pop(0)
+                        while not ticket['done'].wait(0.05):
+                            if stop_event.is_set():
+                                break
+                        if stop_event.is_set():
+                            break
+                        if ticket['clicked_at'] is None:
+                            continue
                         
+                        button = ticket['button']
                         clean_pos = (int(button['pos'][0]), int(button['pos'][1]))
-                        logger.info(f"Clicking button at {clean_pos} (Confidence: {button['score']:.2f})")
-                        
-                        safe_human_click(button['pos'], config, stop_event)
+                        recent_clicks.append((button['center_rel'][0], button['center_rel'][1], ticket['clicked_at']))
                         
-                        current_mouse_pos = button['pos']
-                        
-                        recent_clicks.append((button['center_rel'][0], button['center_rel'][1], time.time()))
-                        time.sleep(config['post_click_delay'])
+                        rescan_box_abs = ticket['watch_region']
+                        deadline = ticket['clicked_at'] + config['post_click_delay']
+                        if ticket['baseline'] is not None:
+                            cursor_rel = (int(button['pos'][0]) - rescan_box_abs[0], int(button['pos'][1]) - rescan_box_abs[1])
+                            reacted, _ = region_watch.wait_for_region_change(
+                                lambda: grab_region(rescan_box_abs, executor), ticket['baseline'], deadline,
+                                stop_event, cursor_rel, config.get('post_click_poll_interval', 0.03))
+                            reaction_stats.record(time.time() - ticket['clicked_at'], reacted)
+                        else:
+                            remaining_delay = deadline - time.time()
+                            if remaining_delay > 0:
+                                time.sleep(remaining_delay)
                         
                         if stop_event.is_set():
                             break
                         
-                        box = button['box_rel']
-                        padding = 10
-                        
-                        box_left_rel = int(box[0]) - padding
-                        box_top_rel = int(box[1]) - padding
-                        box_width = (int(box[2]) - int(box[0])) + padding * 2
-                        box_height = (int(box[3]) - int(box[1])) + padding * 2
-
-                        r_left = int(max(game_region[0], game_region[0] + box_left_rel))
-                        r_top = int(max(game_region[1], game_region[1] + box_top_rel))
-                        r_width = int(box_width)
-                        r_height = int(box_height)
-                        
-                        rescan_box_abs = (r_left, r_top, r_width, r_height)
+                        rescan_screenshot = grab_region(rescan_box_abs, executor)
                         
                         # Rescan using the same detection method
                         if detection_method == 'RGB Color Detection':
-                            rescan_screenshot = pyautogui.screenshot(region=rescan_box_abs)
                             rescan_matches = find_rgb_targets(rescan_screenshot, rescan_box_abs,
                                                              target_rgb, tolerance,
                                                              min_cluster, max_cluster)
                         else:
-                            rescan_matches = find_buttons_advanced(all_templates, rescan_box_abs, config)
+                            rescan_matches = find_buttons_advanced(all_templates, rescan_box_abs, config, rescan_screenshot)
                         
-                        if len(rescan_matches) > 0:
+                        if len(rescan_matches) == 0:
+                            visit_found += 1
+                            if spawn_map is not None:
+                                spawn_map.record(area_key, button['center_rel'], ticket['clicked_at'])
+                        else:
                             learning_data_changed = True
 
                             clean_rel_pos = (int(button['center_rel'][0]), int(button['center_rel'][1]))
                             
-                            coord_key = f"{clean_rel_pos[0]},{clean_rel_pos[1]}"
-                            
-                            area_strikes = STRIKE_COUNTS.get(area_key, {})
-                            
-                            current_strikes = area_strikes.get(coord_key, 0) + 1
-                            area_strikes[coord_key] = current_strikes
-                            STRIKE_COUNTS[area_key] = area_strikes
+                            current_strikes = STRIKE_COUNTS.add_strike(area_key, clean_rel_pos)
                             
                             logger.warning(f"False positive at {clean_pos}. Strike {current_strikes}/{config['strike_limit']}")
                             
@@ -451,9 +739,12 @@ def forage_bot_loop(config, stop_event, template_path):
                                 logger.info(f"Blacklisting spot {clean_rel_pos} for Area {area_key}")
                                 area_blacklist.append(clean_rel_pos)
                                 BLACKLIST[area_key] = area_blacklist
+                                STRIKE_COUNTS.remove(area_key, clean_rel_pos)
 
                     if learning_data_changed:
                         save_learning_data(settings_manager.FORAGE_SETTINGS_FILE)
+                    if spawn_map is not None:
+                        spawn_map.save()
                 
                 if action_taken:
                     logger.debug("Action taken. Re-scanning area")
@@ -462,24 +753,56 @@ def forage_bot_loop(config, stop_event, template_path):
                 logger.info(f"Area {current_area} clear. Moving...")
                 recent_clicks = []
                 
-                if current_area >= config['total_areas'] and movement_direction == 'right':
-                    movement_direction = 'left'
-                    logger.debug("Reached rightmost area. Swapping to LEFT")
-                elif current_area <= 1 and movement_direction == 'left':
-                    movement_direction = 'right'
-                    logger.debug("Reached leftmost area. Swapping to RIGHT")
+                if scheduler is not None:
+                    # Once per arrival: a failed move brings the bot back here without arriving
+                    if not visit_recorded:
+                        scheduler.record_visit(current_area, visit_found, arrived_at)
+                        visit_recorded = True
+                    movement_direction = scheduler.next_direction(current_area)
+                else:
+                    turned = sweep_direction(current_area, movement_direction, config['total_areas'])
+                    if turned != movement_direction:
+                        logger.debug(f"Reached {'rightmost' if turned == 'left' else 'leftmost'} area. "
+                                     f"Swapping to {turned.upper()}")
+                    movement_direction = turned
 
+                travel_start = time.time()
                 if movement_direction == 'right':
                     logger.debug(f"Moving RIGHT to Area {current_area + 1}")
-                    safe_human_click(right_arrow_pos, config, stop_event)
-                    current_area += 1
+                    transition = click_arrow_and_wait(right_arrow_pos, game_region, config, stop_event)
+                    next_area = current_area + 1
                 else:
                     logger.debug(f"Moving LEFT to Area {current_area - 1}")
-                    safe_human_click(left_arrow_pos, config, stop_event)
-                    current_area -= 1
+                    transition = click_arrow_and_wait(left_arrow_pos, game_region, config, stop_event)
+                    next_area = current_area - 1
                 
-                logger.debug("Waiting for new area to load...")
-                time.sleep(config['area_load_delay'])
+                if transition != 'unchanged':
+                    current_area = next_area
+                    arrived = True
+                    arrived_at = time.time()
+                    visit_found = 0
+                    visit_recorded = False
+                    failed_moves = 0
+                    if scheduler is not None:
+                        scheduler.record_travel(arrived_at - travel_start)
+                elif not stop_event.is_set():
+                    # A dropped click says nothing about where we are: stay put and
+                    # retry the move next pass. Only if moves keep failing, walk back to Area 1.
+                    failed_moves += 1
+                    if failed_moves < config.get('area_max_failed_moves', 3):
+                        logger.warning(f"Area did not change. Staying in Area {current_area} and retrying the move "
+                                       f"({failed_moves}/{config.get('area_max_failed_moves', 3)})")
+                    else:
+                        logger.warning(f"Area did not change after {failed_moves} moves. Returning to Area 1")
+                        failed_moves = 0
+                        if go_to_start_position(left_arrow_pos, config['total_areas'],
+                                                config['area_load_delay'], config, stop_event, area_prints):
+                            current_area = 1
+                            movement_direction = 'right'
+                            arrived = True
+                            arrived_at = time.time()
+                            visit_found = 0
+                            visit_recorded = False
             
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
@@ -490,5 +813,13 @@ def forage_bot_loop(config, stop_event, template_path):
         except Exception as e:
             logger.error(f"Critical thread error: {e}")
             time.sleep(5)
-            
+    
+    executor.shutdown()
+    if scheduler is not None:
+        scheduler.log_summary()
+    if spawn_map is not None:
+        spawn_map.save(force=True)
+    if not first_run:
+        save_patrol_state(settings_manager.FORAGE_SETTINGS_FILE, current_area, movement_direction,
+                          area_prints, game_region)
     logger.info("Forage bot loop stopped")
\ No newline at end of file
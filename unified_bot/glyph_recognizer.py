@@ -0,0 +1,227 @@
+import logging
+import threading
+import numpy as np
+import cv2
+import unified_bot.ocr_cache as ocr_cache
+import unified_bot.settings_manager as settings_manager
+
+logger = logging.getLogger(__name__)
+
+# Every glyph is scaled to this (width, height) bitmap before matching
+GLYPH_SIZE = (10, 14)
+# Components smaller than this many pixels are treated as noise
+MIN_COMPONENT_AREA = 2
+# A horizontal gap wider than this fraction of the line height is a space
+SPACE_GAP_RATIO = 0.35
+# Distance at which a match's confidence drops to zero
+REJECT_DISTANCE = 0.35
+# Stored examples per character
+MAX_TEMPLATES_PER_CHAR = 8
+
+
+def segment_glyphs(binary):
+    """
+    Splits a binarized line of text into character boxes using connected
+    components. Components that overlap horizontally (the dot of an 'i',
+    the two halves of ':') are merged into one glyph.
+
+    Components much wider than the typical glyph are assumed to be
+    touching characters and are cut at the columns with the least ink.
+
+    :param binary: 0/1 uint8 array with text as 1 (see ocr_cache.binarize_crop).
+    :return: ([(x0, y0, x1, y1), ...] sorted left to right, [bool, ...] where
+             True means a space precedes that glyph)
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    boxes = []
+    for i in range(1, count):
+        x, y, w, h, area = stats[i]
+        if area >= MIN_COMPONENT_AREA:
+            boxes.append([int(x), int(y), int(x + w), int(y + h)])
+    if not boxes:
+        return [], []
+    boxes.sort()
+
+    merged = [boxes[0]]
+    for box in boxes[1:]:
+        last = merged[-1]
+        overlap = min(last[2], box[2]) - max(last[0], box[0])
+        if overlap > 0.5 * min(last[2] - last[0], box[2] - box[0]):
+            merged[-1] = [min(last[0], box[0]), min(last[1], box[1]),
+                          max(last[2], box[2]), max(last[3], box[3])]
+        else:
+            merged.append(box)
+
+    merged = _split_touching(binary, merged)
+    line_top = min(b[1] for b in merged)
+    line_height = max(b[3] for b in merged) - line_top
+    spaces = [False] + [merged[i][0] - merged[i - 1][2] > SPACE_GAP_RATIO * line_height
+                        for i in range(1, len(merged))]
+    return [tuple(b) for b in merged], spaces
+
+
+def _split_touching(binary, boxes, wide_ratio=1.6):
+    widths = np.array([b[2] - b[0] for b in boxes])
+    typical = float(np.median(widths))
+    if len(boxes) < 2 or typical <= 0:
+        return boxes
+    result = []
+    for box in boxes:
+        x0, y0, x1, y1 = box
+        parts = int(round((x1 - x0) / typical))
+        if (x1 - x0) < wide_ratio * typical or parts < 2:
+            result.append(box)
+            continue
+        ink = binary[y0:y1, x0:x1].sum(axis=0)
+        cuts = [x0]
+        for k in range(1, parts):
+            guess = int((x1 - x0) * k / parts)
+            window = max(1, int(typical * 0.3))
+            lo, hi = max(1, guess - window), min(x1 - x0 - 1, guess + window)
+            cuts.append(x0 + lo + int(np.argmin(ink[lo:hi + 1])))
+        cuts.append(x1)
+        for left, right in zip(cuts, cuts[1:]):
+            if right <= left:
+                continue
+            ys = np.nonzero(binary[y0:y1, left:right].any(axis=1))[0]
+            if len(ys):
+                result.append([left, y0 + int(ys[0]), right, y0 + int(ys[-1]) + 1])
+    return result
+
+
+def glyph_features(binary, box, line_top, line_height):
+    """
+    Feature vector for one glyph: its bitmap scaled to GLYPH_SIZE plus its
+    aspect ratio and vertical placement in the line (which separates
+    e.g. '.' from 'l').
+    """
+    x0, y0, x1, y1 = box
+    glyph = binary[y0:y1, x0:x1].astype(np.float32)
+    bitmap = cv2.resize(glyph, GLYPH_SIZE, interpolation=cv2.INTER_AREA).ravel()
+    shape = np.array([(x1 - x0) / line_height, (y1 - y0) / line_height,
+                      (y0 - line_top) / line_height], dtype=np.float32)
+    return np.concatenate([bitmap, shape])
+
+
+def _line_features(image):
+    binary = ocr_cache.binarize_crop(image)
+    boxes, spaces = segment_glyphs(binary)
+    if not boxes:
+        return None, []
+    line_top = min(b[1] for b in boxes)
+    line_height = max(1, max(b[3] for b in boxes) - line_top)
+    features = np.array([glyph_features(binary, b, line_top, line_height) for b in boxes])
+    return features, spaces
+
+
+class GlyphRecognizer:
+    """
+    Nearest-neighbour recognizer for the game's fixed stat font. Templates
+    are learned from crops whose text was already confirmed (e.g. a
+    tesseract read that matched a known bloodline) and saved as .npz.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.features = np.empty((0, GLYPH_SIZE[0] * GLYPH_SIZE[1] + 3), dtype=np.float32)
+        self.labels = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.labels)
+
+    def learn(self, image, text):
+        """
+        Adds the glyphs of 'image' as templates labelled with 'text'.
+        Skipped if the segmentation does not match the text's character count.
+
+        :return: True if templates were added.
+        """
+        chars = [c for c in text if not c.isspace()]
+        features, _ = _line_features(image)
+        if features is None or len(features) != len(chars):
+            logger.debug(f"Glyph segmentation of '{text}' found "
+                         f"{0 if features is None else len(features)} glyphs, expected {len(chars)}.")
+            return False
+        with self._lock:
+            for feature, char in zip(features, chars):
+                same = [i for i, label in enumerate(self.labels) if label == char]
+                if same:
+                    distances = np.abs(self.features[same] - feature).mean(axis=1)
+                    if distances.min() < 0.02:
+                        continue  # Already have an identical example
+                    if len(same) >= MAX_TEMPLATES_PER_CHAR:
+                        self._drop(same[0])
+                self.features = np.vstack([self.features, feature[None, :]])
+                self.labels.append(char)
+        return True
+
+    def _drop(self, index):
+        self.features = np.delete(self.features, index, axis=0)
+        del self.labels[index]
+
+    def recognize(self, image):
+        """
+        Reads a crop with the learned templates.
+
+        :return: (text, [confidence per character]) or (None, []) if there
+                 are no templates or no glyphs. Confidence is 0-1.
+        """
+        with self._lock:
+            if not self.labels:
+                return None, []
+            templates = self.features
+            labels = list(self.labels)
+        features, spaces = _line_features(image)
+        if features is None:
+            return None, []
+
+        distances = np.abs(features[:, None, :] - templates[None, :, :]).mean(axis=2)
+        best = distances.argmin(axis=1)
+        best_distance = distances[np.arange(len(best)), best]
+        confidences = np.clip(1.0 - best_distance / REJECT_DISTANCE, 0.0, 1.0)
+
+        text = ''.join((' ' if space else '') + labels[i] for i, space in zip(best, spaces))
+        return text, confidences.tolist()
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with np.load(str(self.path)) as data:
+                features = data['features'].astype(np.float32)
+                labels = [str(label) for label in data['labels']]
+            if features.shape[1] != self.features.shape[1]:
+                logger.warning("Glyph templates were saved with a different glyph size. Ignoring them.")
+                return
+            with self._lock:
+                self.features, self.labels = features, labels
+            logger.debug(f"Loaded {len(labels)} glyph templates.")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load glyph templates from {self.path}: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            features, labels = self.features.copy(), np.array(self.labels)
+        try:
+            with open(str(self.path), 'wb') as f:
+                np.savez_compressed(f, features=features, labels=labels)
+        except Exception as e:
+            logger.warning(f"Could not save glyph templates to {self.path}: {e}")
+
+
+_recognizer = None
+_recognizer_lock = threading.Lock()
+
+
+def get_recognizer():
+    """Returns the shared recognizer, loading its templates from LOG_DIR on first use."""
+    global _recognizer
+    with _recognizer_lock:
+        if _recognizer is None:
+            _recognizer = GlyphRecognizer(settings_manager.GLYPH_TEMPLATES_FILE)
+            _recognizer.load()
+        return _recognizer
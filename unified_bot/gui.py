@@ -9,6 +9,7 @@ import webbrowser
 import re
 import pyautogui
 from unified_bot.calibration import CalibrationWindow, CalibrationClickWindow
+import unified_bot.screen_classifier as screen_classifier
 import unified_bot.gui_logger as gui_logger
 import unified_bot.rein_bot_logic as rein_bot_logic
 import unified_bot.forage_bot_logic as forage_bot_logic
@@ -115,16 +116,21 @@ class UnifiedBotGUI:
         # Reincarnation bot settings
         self.qi_region = None
         self.bloodline_region = None
+        self.post_qi_region = None
+        self.post_bloodline_region = None
         self.calibrated_points = {}
+        self.screen_signatures = {}
         self.stop_on_bloodline_var = tk.BooleanVar(value=True)
         self.stop_on_qi_var = tk.BooleanVar(value=False)
         self.qi_stop_var = tk.DoubleVar(value=200.0)
         self.stop_on_new_var = tk.BooleanVar(value=True)
         self.show_success_popup_var = tk.BooleanVar(value=True)
+        self.read_after_reincarnate_var = tk.BooleanVar(value=False)
         self.speed_factor_var = tk.DoubleVar(value=0.15)
         self.snap_threshold_var = tk.IntVar(value=25)
         self.variability_var = tk.IntVar(value=3)
         self.after_click_delay_var = tk.DoubleVar(value=1.5)
+        self.move_duration_var = tk.DoubleVar(value=0.08)
         
         # Forage bot settings
         self.forage_search_region = None
@@ -134,6 +140,7 @@ class UnifiedBotGUI:
         self.forage_detection_threshold = tk.DoubleVar(value=0.25)
         self.forage_mouse_speed = tk.DoubleVar(value=0.3)
         self.forage_total_areas = tk.IntVar(value=6)
+        self.forage_patrol_mode = tk.StringVar(value="sweep")
         self.forage_post_click_delay = tk.DoubleVar(value=1.8)
         
         # RGB Detection Settings
@@ -165,6 +172,7 @@ class UnifiedBotGUI:
         # Mouse Settings (additional)
         self.forage_snap_distance = tk.IntVar(value=15)
         self.forage_variability = tk.IntVar(value=3)
+        self.forage_move_duration = tk.DoubleVar(value=0.05)
 
         self.scale_x = 1.0
         self.scale_y = 1.0
@@ -432,6 +440,12 @@ class UnifiedBotGUI:
         )
         self.show_success_popup_check.grid(row=3, column=1, columnspan=2, padx=5, pady=5, sticky="w")
         
+        self.read_after_reincarnate_check = ttk.Checkbutton(
+            stop_frame, text="Read stats right after reincarnating (skips the Stats page)",
+            variable=self.read_after_reincarnate_var, onvalue=True, offvalue=False
+        )
+        self.read_after_reincarnate_check.grid(row=4, column=1, columnspan=2, padx=5, pady=5, sticky="w")
+        
         mouse_frame = ttk.Labelframe(scrollable_frame, text="Mouse Settings", padding=10)
         mouse_frame.pack(fill=tk.X, pady=5)
         mouse_frame.columnconfigure(1, weight=1)
@@ -455,6 +469,12 @@ class UnifiedBotGUI:
         self.after_click_delay_entry = ttk.Spinbox(mouse_frame, from_=0.1, to=5.0, increment=0.1, textvariable=self.after_click_delay_var, format="%.1f")
         self.after_click_delay_entry.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
         self.after_click_delay_entry.bind("<MouseWheel>", lambda e: "break")
+        
+        ttk.Label(mouse_frame, text="Move Duration (s):").grid(row=4, column=0, padx=5, pady=5, sticky="w")
+        self.move_duration_entry = ttk.Spinbox(mouse_frame, from_=0.0, to=1.0, increment=0.01, textvariable=self.move_duration_var, format="%.2f")
+        self.move_duration_entry.grid(row=4, column=1, padx=5, pady=5, sticky="ew")
+        self.move_duration_entry.bind("<MouseWheel>", lambda e: "break")
+        ToolTip(self.move_duration_entry, "Time each mouse movement takes, regardless of distance")
 
     def create_forage_settings_widgets(self, parent):
         """Create forage bot settings widgets."""
@@ -543,6 +563,12 @@ class UnifiedBotGUI:
         ToolTip(snap_dist_spin, "Pixels within which mouse snaps directly to target")
         ToolTip(variability_spin, "Random offset added to clicks for human-like behavior")
         
+        ttk.Label(mouse_frame, text="Move Duration (s):").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        move_duration_spin = ttk.Spinbox(mouse_frame, from_=0.0, to=1.0, increment=0.01, textvariable=self.forage_move_duration, format="%.2f")
+        move_duration_spin.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+        move_duration_spin.bind("<MouseWheel>", lambda e: "break")
+        ToolTip(move_duration_spin, "Time each mouse movement takes, regardless of distance")
+        
         # Template Matching Settings Frame
         self.template_settings_frame = ttk.Labelframe(scrollable_frame, text="Template Matching Settings", padding=10)
         self.template_settings_frame.columnconfigure(1, weight=1)
@@ -642,6 +668,12 @@ class UnifiedBotGUI:
         patrol_spin.bind("<MouseWheel>", lambda e: "break")
         ToolTip(patrol_spin, "Number of game areas to patrol for resources")
         
+        ttk.Label(patrol_frame, text="Patrol Mode:").grid(row=1, column=0, padx=5, pady=5, sticky="w")
+        patrol_mode_combo = ttk.Combobox(patrol_frame, values=("sweep", "scheduled"), state="readonly",
+                                         textvariable=self.forage_patrol_mode)
+        patrol_mode_combo.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
+        ToolTip(patrol_mode_combo, "sweep: go back and forth through every area\nscheduled: favor areas that respawn buttons faster")
+        
         # Timing Settings
         timing_frame = ttk.Labelframe(scrollable_frame, text="Timing Settings", padding=10)
         timing_frame.pack(fill=tk.X, pady=5)
@@ -730,6 +762,19 @@ class UnifiedBotGUI:
         self.bloodline_region_label.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
         self.calib_bloodline_button = ttk.Button(ocr_frame, text="Calibrate Bloodline", command=self.calibrate_bloodline)
         self.calib_bloodline_button.grid(row=1, column=2, padx=5, pady=5, sticky="e")
+        
+        # Optional: the same stats on the screen shown right after the final Reincarnate click
+        ttk.Label(ocr_frame, text="Qi (After Reincarnate):").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.post_qi_region_label = ttk.Label(ocr_frame, text="Not Set", width=20)
+        self.post_qi_region_label.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+        self.calib_post_qi_button = ttk.Button(ocr_frame, text="Calibrate", command=self.calibrate_post_qi)
+        self.calib_post_qi_button.grid(row=2, column=2, padx=5, pady=5, sticky="e")
+        
+        ttk.Label(ocr_frame, text="Bloodline (After Reincarnate):").grid(row=3, column=0, padx=5, pady=5, sticky="w")
+        self.post_bloodline_region_label = ttk.Label(ocr_frame, text="Not Set", width=20)
+        self.post_bloodline_region_label.grid(row=3, column=1, padx=5, pady=5, sticky="ew")
+        self.calib_post_bloodline_button = ttk.Button(ocr_frame, text="Calibrate", command=self.calibrate_post_bloodline)
+        self.calib_post_bloodline_button.grid(row=3, column=2, padx=5, pady=5, sticky="e")
 
         click_frame = ttk.Labelframe(parent, text="Click Positions", padding=10)
         click_frame.pack(fill=tk.X, pady=5)
@@ -763,6 +808,19 @@ class UnifiedBotGUI:
                 "label": status_label,
                 "button": calib_button
             }
+        
+        # Screen signatures: let the bot confirm which screen is showing
+        screens_frame = ttk.Labelframe(parent, text="Screen Signatures (Optional)", padding=10)
+        screens_frame.pack(fill=tk.X, pady=5)
+        screens_frame.columnconfigure(1, weight=1)
+        
+        self.screen_signature_combo = ttk.Combobox(screens_frame, values=screen_classifier.REIN_SCREENS, state="readonly", width=16)
+        self.screen_signature_combo.current(0)
+        self.screen_signature_combo.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.screen_signature_label = ttk.Label(screens_frame, text="None recorded")
+        self.screen_signature_label.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        ttk.Button(screens_frame, text="Record (3s delay)", command=self.record_screen_signature).grid(row=0, column=2, padx=5, pady=5, sticky="e")
+        ttk.Label(screens_frame, text="Open that screen in the game before the delay ends. Calibrate click positions first.").grid(row=1, column=0, columnspan=3, padx=5, pady=2, sticky="w")
             
         # Hotkey capture UI
         hotkey_frame = ttk.Labelframe(parent, text="Hotkey Setting", padding=10)
@@ -840,16 +898,19 @@ class UnifiedBotGUI:
             self.snap_threshold_var.set(25)
             self.variability_var.set(3)
             self.after_click_delay_var.set(1.5)
+            self.move_duration_var.set(0.08)
             self.stop_on_bloodline_var.set(True)
             self.stop_on_qi_var.set(False)
             self.qi_stop_var.set(200.0)
             self.stop_on_new_var.set(True)
             self.show_success_popup_var.set(True)
+            self.read_after_reincarnate_var.set(False)
         else:  # forage
             # Reset forage bot settings to defaults
             self.forage_detection_threshold.set(0.25)
             self.forage_mouse_speed.set(0.3)
             self.forage_total_areas.set(6)
+            self.forage_patrol_mode.set("sweep")
             self.forage_post_click_delay.set(1.8)
             self.forage_strike_limit.set(5)
             self.forage_blacklist_radius.set(5)
@@ -865,6 +926,7 @@ class UnifiedBotGUI:
             self.forage_startup_delay.set(3)
             self.forage_snap_distance.set(15)
             self.forage_variability.set(3)
+            self.forage_move_duration.set(0.05)
         
         self.save_settings()
         messagebox.showinfo("Reset Complete", f"{selected.capitalize()} bot settings have been reset to defaults.")
@@ -887,17 +949,20 @@ class UnifiedBotGUI:
                     'snap_threshold': self.snap_threshold_var.get(),
                     'variability': self.variability_var.get(),
                     'after_click_delay': self.after_click_delay_var.get(),
+                    'move_duration': self.move_duration_var.get(),
                     'stop_on_bloodline': self.stop_on_bloodline_var.get(),
                     'stop_on_qi': self.stop_on_qi_var.get(),
                     'qi_stop': self.qi_stop_var.get(),
                     'stop_on_new': self.stop_on_new_var.get(),
-                    'show_success_popup': self.show_success_popup_var.get()
+                    'show_success_popup': self.show_success_popup_var.get(),
+                    'read_after_reincarnate': self.read_after_reincarnate_var.get()
                 }
             else:  # forage
                 default_settings = {
                     'detection_threshold': self.forage_detection_threshold.get(),
                     'mouse_speed': self.forage_mouse_speed.get(),
                     'total_areas': self.forage_total_areas.get(),
+                    'patrol_mode': self.forage_patrol_mode.get(),
                     'post_click_delay': self.forage_post_click_delay.get(),
                     'strike_limit': self.forage_strike_limit.get(),
                     'blacklist_radius': self.forage_blacklist_radius.get(),
@@ -912,7 +977,8 @@ class UnifiedBotGUI:
                     'click_cooldown': self.forage_click_cooldown.get(),
                     'startup_delay': self.forage_startup_delay.get(),
                     'snap_distance': self.forage_snap_distance.get(),
-                    'variability': self.forage_variability.get()
+                    'variability': self.forage_variability.get(),
+                    'move_duration': self.forage_move_duration.get()
                 }
             
             with open(str(default_file), 'w') as f:
@@ -927,9 +993,39 @@ class UnifiedBotGUI:
     def clear_forage_blacklist(self):
         """Clear the forage bot's blacklist."""
         if messagebox.askyesno("Clear Blacklist", "Are you sure you want to clear the forage bot's blacklist?"):
+            learning_data = self.load_forage_learning_data()
+            learning_data['blacklist'] = {}
+            learning_data['strike_counts'] = {}
+            self.save_forage_learning_data(learning_data)
             self.logger.info("Forage bot blacklist cleared by user.")
             messagebox.showinfo("Success", "Blacklist cleared. This will take effect on the next bot start.")
     
+    def load_forage_learning_data(self):
+        """Load the forage bot's learned strike counts and blacklist from its settings file."""
+        learning_data = {'strike_counts': {}, 'blacklist': {}, 'area_fingerprints': {}, 'patrol_state': {}}
+        try:
+            if os.path.exists(str(settings_manager.FORAGE_SETTINGS_FILE)):
+                with open(str(settings_manager.FORAGE_SETTINGS_FILE), 'r') as f:
+                    forage_settings = json.load(f)
+                for key in learning_data:
+                    learning_data[key] = forage_settings.get(key, {})
+        except Exception as e:
+            self.logger.error(f"Could not load forage learning data: {e}")
+        return learning_data
+
+    def save_forage_learning_data(self, learning_data):
+        """Write the forage bot's learning data back into its settings file."""
+        try:
+            forage_settings = {}
+            if os.path.exists(str(settings_manager.FORAGE_SETTINGS_FILE)):
+                with open(str(settings_manager.FORAGE_SETTINGS_FILE), 'r') as f:
+                    forage_settings = json.load(f)
+            forage_settings.update(learning_data)
+            with open(str(settings_manager.FORAGE_SETTINGS_FILE), 'w') as f:
+                json.dump(forage_settings, f, indent=4)
+        except Exception as e:
+            self.logger.error(f"Could not save forage learning data: {e}")
+
     def calibrate_forage_region(self):
         """Calibrate the forage search region."""
         self.logger.info("Starting Forage search region calibration...")
@@ -1483,6 +1579,62 @@ class UnifiedBotGUI:
         else:
             self.logger.info("Bloodline calibration cancelled.")
 
+    def calibrate_post_qi(self):
+        """Start calibration of the Qi region shown after reincarnating."""
+        self.logger.info("Starting post-reincarnation Qi region calibration...")
+        CalibrationWindow(self.root, "Qi Multi Region (After Reincarnate)", self.on_post_qi_calibrated, self.scale_x, self.scale_y)
+
+    def on_post_qi_calibrated(self, region_rect):
+        """Handle post-reincarnation Qi calibration completion."""
+        if region_rect:
+            self.post_qi_region = region_rect
+            self.post_qi_region_label.config(text=str(region_rect))
+            self.save_settings()
+            self.logger.info(f"New post-reincarnation Qi region saved: {region_rect}")
+        else:
+            self.logger.info("Post-reincarnation Qi calibration cancelled.")
+
+    def calibrate_post_bloodline(self):
+        """Start calibration of the bloodline region shown after reincarnating."""
+        self.logger.info("Starting post-reincarnation Bloodline region calibration...")
+        CalibrationWindow(self.root, "Bloodline Region (After Reincarnate)", self.on_post_bloodline_calibrated, self.scale_x, self.scale_y)
+
+    def on_post_bloodline_calibrated(self, region_rect):
+        """Handle post-reincarnation bloodline calibration completion."""
+        if region_rect:
+            self.post_bloodline_region = region_rect
+            self.post_bloodline_region_label.config(text=str(region_rect))
+            self.save_settings()
+            self.logger.info(f"New post-reincarnation Bloodline region saved: {region_rect}")
+        else:
+            self.logger.info("Post-reincarnation Bloodline calibration cancelled.")
+
+    def record_screen_signature(self):
+        """Record the selected game screen's signature after a short delay."""
+        screen = self.screen_signature_combo.get()
+        if not self.calibrated_points:
+            messagebox.showerror("Error", "Calibrate the click positions before recording screens.")
+            return
+        self.logger.info(f"Recording the '{screen}' screen in 3 seconds. Switch to the game and open that screen.")
+        self.root.iconify()
+        self.root.after(3000, lambda: self.on_screen_signature_ready(screen))
+
+    def on_screen_signature_ready(self, screen):
+        """Grab the screen and store its signature."""
+        try:
+            points = screen_classifier.rein_probe_points(self.calibrated_points)
+            classifier = screen_classifier.load(self.screen_signatures, points)
+            if classifier is None:
+                classifier = screen_classifier.for_points(points)
+            classifier.record(screen)
+            self.screen_signatures = classifier.to_dict()
+            self.save_settings()
+        except Exception as e:
+            self.logger.error(f"Could not record screen signature: {e}")
+        finally:
+            self.root.deiconify()
+        self.update_calibration_labels()
+
     def calibrate_click(self, button_key, title):
         """Start click position calibration."""
         self.logger.info(f"Starting calibration for: {button_key}")
@@ -1550,6 +1702,13 @@ class UnifiedBotGUI:
             self.qi_region_label.config(text=str(self.qi_region))
         if hasattr(self, 'bloodline_region_label') and self.bloodline_region:
             self.bloodline_region_label.config(text=str(self.bloodline_region))
+        if hasattr(self, 'post_qi_region_label') and self.post_qi_region:
+            self.post_qi_region_label.config(text=str(self.post_qi_region))
+        if hasattr(self, 'post_bloodline_region_label') and self.post_bloodline_region:
+            self.post_bloodline_region_label.config(text=str(self.post_bloodline_region))
+        if hasattr(self, 'screen_signature_label'):
+            recorded = sorted(self.screen_signatures.get('signatures', {})) if self.screen_signatures else []
+            self.screen_signature_label.config(text=f"Recorded: {', '.join(recorded)}" if recorded else "None recorded")
         
         # Update calibration widgets if they exist
         if hasattr(self, 'calibration_widgets'):
@@ -1576,7 +1735,10 @@ class UnifiedBotGUI:
                     # Reincarnation bot settings
                     self.qi_region = rein_settings.get('qi_region')
                     self.bloodline_region = rein_settings.get('bloodline_region')
+                    self.post_qi_region = rein_settings.get('post_qi_region')
+                    self.post_bloodline_region = rein_settings.get('post_bloodline_region')
                     self.calibrated_points = rein_settings.get('calibrated_points', {})
+                    self.screen_signatures = rein_settings.get('screen_signatures', {})
                     
                     self.ui_mode_var.set(rein_settings.get('ui_mode', 'dark'))
                     
@@ -1584,12 +1746,14 @@ class UnifiedBotGUI:
                     self.snap_threshold_var.set(rein_settings.get('mouse_snap_threshold', 25))
                     self.variability_var.set(rein_settings.get('mouse_variability', 3))
                     self.after_click_delay_var.set(rein_settings.get('after_click_delay', 1.5))
+                    self.move_duration_var.set(rein_settings.get('mouse_move_duration', 0.08))
                     
                     self.stop_on_bloodline_var.set(rein_settings.get('stop_on_bloodline', True))
                     self.stop_on_qi_var.set(rein_settings.get('stop_on_qi', False))
                     self.qi_stop_var.set(rein_settings.get('target_qi_multi', 200.0))
                     self.stop_on_new_var.set(rein_settings.get('stop_on_new', True))
                     self.show_success_popup_var.set(rein_settings.get('show_success_popup', True))
+                    self.read_after_reincarnate_var.set(rein_settings.get('read_after_reincarnate', False))
                     
                     target_index = rein_settings.get('target_bloodline_index', 0)
                     self._loaded_target_index = target_index
@@ -1620,6 +1784,7 @@ class UnifiedBotGUI:
                     self.forage_detection_threshold.set(forage_settings.get('forage_detection_threshold', 0.25))
                     self.forage_mouse_speed.set(forage_settings.get('forage_mouse_speed', 0.3))
                     self.forage_total_areas.set(forage_settings.get('forage_total_areas', 6))
+                    self.forage_patrol_mode.set(forage_settings.get('forage_patrol_mode', 'sweep'))
                     self.forage_post_click_delay.set(forage_settings.get('forage_post_click_delay', 1.8))
                     
                     # RGB Detection Settings
@@ -1651,6 +1816,7 @@ class UnifiedBotGUI:
                     # Mouse Settings
                     self.forage_snap_distance.set(forage_settings.get('forage_snap_distance', 15))
                     self.forage_variability.set(forage_settings.get('forage_variability', 3))
+                    self.forage_move_duration.set(forage_settings.get('forage_move_duration', 0.05))
                     
                     self.logger.info(f"Forage settings loaded from {settings_manager.FORAGE_SETTINGS_FILE}")
             else:
@@ -1705,18 +1871,23 @@ class UnifiedBotGUI:
         rein_settings = {
             'qi_region': self.qi_region,
             'bloodline_region': self.bloodline_region,
+            'post_qi_region': self.post_qi_region,
+            'post_bloodline_region': self.post_bloodline_region,
             'calibrated_points': self.calibrated_points,
+            'screen_signatures': self.screen_signatures,
             'ui_mode': self.ui_mode_var.get(),
             'mouse_speed_factor': self.speed_factor_var.get(),
             'mouse_snap_threshold': self.snap_threshold_var.get(),
             'mouse_variability': self.variability_var.get(),
             'after_click_delay': self.after_click_delay_var.get(),
+            'mouse_move_duration': self.move_duration_var.get(),
             'stop_on_bloodline': self.stop_on_bloodline_var.get(),
             'stop_on_qi': self.stop_on_qi_var.get(),
             'target_bloodline_index': target_index,
             'target_qi_multi': self.qi_stop_var.get(),
             'stop_on_new': self.stop_on_new_var.get(),
             'show_success_popup': self.show_success_popup_var.get(),
+            'read_after_reincarnate': self.read_after_reincarnate_var.get(),
         }
         rein_settings.update(shared_settings)
         
@@ -1729,6 +1900,7 @@ class UnifiedBotGUI:
             'forage_detection_threshold': self.forage_detection_threshold.get(),
             'forage_mouse_speed': self.forage_mouse_speed.get(),
             'forage_total_areas': self.forage_total_areas.get(),
+            'forage_patrol_mode': self.forage_patrol_mode.get(),
             'forage_post_click_delay': self.forage_post_click_delay.get(),
             
             # RGB Detection Settings
@@ -1760,9 +1932,13 @@ class UnifiedBotGUI:
             # Mouse Settings
             'forage_snap_distance': self.forage_snap_distance.get(),
             'forage_variability': self.forage_variability.get(),
+            'forage_move_duration': self.forage_move_duration.get(),
         }
         forage_settings.update(shared_settings)
         
+        # Learning data is written by the bot thread; carry it over instead of wiping it
+        forage_settings.update(self.load_forage_learning_data())
+        
         # Save reincarnation settings
         try:
             with open(str(settings_manager.REIN_SETTINGS_FILE), 'w') as f:
@@ -1817,9 +1993,12 @@ class UnifiedBotGUI:
                 "ui_mode": self.ui_mode_var.get(),
                 "regions": {
                     "qi": self.qi_region,
-                    "bloodline": self.bloodline_region
+                    "bloodline": self.bloodline_region,
+                    "post_qi": self.post_qi_region,
+                    "post_bloodline": self.post_bloodline_region
                 },
                 "calibrated_points": self.calibrated_points,
+                "screen_signatures": self.screen_signatures,
                 "stop_conditions": {
                     "stop_on_bloodline": self.stop_on_bloodline_var.get(),
                     "stop_on_qi": self.stop_on_qi_var.get(),
@@ -1840,7 +2019,9 @@ class UnifiedBotGUI:
                 "mouse_speed_factor": self.speed_factor_var.get(),
                 "mouse_snap_threshold": self.snap_threshold_var.get(),
                 "mouse_variability": self.variability_var.get(),
-                "mouse_pause": 0.001
+                "mouse_move_duration": self.move_duration_var.get(),
+                "mouse_pause": 0.001,
+                "read_after_reincarnate": self.read_after_reincarnate_var.get()
             }
             
             self.logger.info("Starting Reincarnation bot thread...")
@@ -1900,19 +2081,20 @@ class UnifiedBotGUI:
                 
                 # Area settings
                 "total_areas": self.forage_total_areas.get(),
+                "patrol_mode": self.forage_patrol_mode.get(),
                 "startup_delay": self.forage_startup_delay.get(),
                 
                 # Mouse settings
                 "mouse_speed_factor": self.forage_mouse_speed.get(),
                 "mouse_snap_distance": self.forage_snap_distance.get(),
                 "mouse_variability": self.forage_variability.get(),
+                "mouse_move_duration": self.forage_move_duration.get(),
                 
                 # Learning settings
                 "strike_limit": self.forage_strike_limit.get(),
                 "blacklist_radius": self.forage_blacklist_radius.get(),
-                "strike_counts": {},
-                "blacklist": {}
             }
+            config.update(self.load_forage_learning_data())
             
             # Template path
             import os
@@ -0,0 +1,141 @@
+import abc
+import time
+import random
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Shared, seedable randomness for all input timing/jitter (see seed()).
+rng = random.Random()
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class InputBackend(abc.ABC):
+    """
+    Mouse input interface used by both bots.
+    Coordinates are absolute screen pixels.
+    """
+    @abc.abstractmethod
+    def position(self):
+        """Return the current cursor position as an (x, y) tuple."""
+
+    @abc.abstractmethod
+    def move_rel(self, dx, dy):
+        """Move the cursor by (dx, dy) pixels."""
+
+    @abc.abstractmethod
+    def move_to(self, x, y):
+        """Move the cursor to (x, y)."""
+
+    @abc.abstractmethod
+    def click(self):
+        """Left click at the current position."""
+
+
+class PyDirectInputBackend(InputBackend):
+    """
+    Real input via pydirectinput (Windows only).
+    pydirectinput's per-call PAUSE is skipped; callers own all timing.
+    """
+    def __init__(self):
+        import pydirectinput
+        self._pdi = pydirectinput
+
+    def position(self):
+        x, y = self._pdi.position()
+        return (int(x), int(y))
+
+    def move_rel(self, dx, dy):
+        self._pdi.moveRel(int(dx), int(dy), relative=True, _pause=False)
+
+    def move_to(self, x, y):
+        self._pdi.moveTo(int(x), int(y), _pause=False)
+
+    def click(self):
+        self._pdi.click(_pause=False)
+
+
+class RecordingBackend(InputBackend):
+    """
+    In-memory backend for headless runs and benchmarks.
+
+    Tracks a virtual cursor and records every event in 'events' as
+    (timestamp, name, x, y), where (x, y) is the cursor position after
+    the event.
+    """
+    def __init__(self, start_pos=(0, 0), clock=time.perf_counter):
+        self.clock = clock
+        self.x, self.y = int(start_pos[0]), int(start_pos[1])
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _record(self, name):
+        self.events.append((self.clock(), name, self.x, self.y))
+
+    def position(self):
+        with self._lock:
+            self._record('position')
+            return (self.x, self.y)
+
+    def move_rel(self, dx, dy):
+        with self._lock:
+            self.x += int(dx)
+            self.y += int(dy)
+            self._record('move_rel')
+
+    def move_to(self, x, y):
+        with self._lock:
+            self.x, self.y = int(x), int(y)
+            self._record('move_to')
+
+    def click(self):
+        with self._lock:
+            self._record('click')
+
+    def counts(self):
+        """Return a dict of event name -> number of times it was recorded."""
+        counts = {}
+        for _, name, _, _ in self.events:
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def clicks(self):
+        """Return the (timestamp, x, y) of every recorded click."""
+        return [(t, x, y) for t, name, x, y in self.events if name == 'click']
+
+    def elapsed(self):
+        """Seconds between the first and last recorded event."""
+        if len(self.events) < 2:
+            return 0.0
+        return self.events[-1][0] - self.events[0][0]
+
+    def clear(self):
+        with self._lock:
+            self.events = []
+
+
+def get_backend():
+    """Return the active backend, creating the pydirectinput one on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = PyDirectInputBackend()
+        return _backend
+
+
+def set_backend(backend):
+    """Replace the active backend (e.g. with a RecordingBackend). Returns the previous one."""
+    global _backend
+    with _backend_lock:
+        previous = _backend
+        _backend = backend
+        return previous
+
+
+def seed(value):
+    """Seed the shared input randomness so runs are reproducible."""
+    rng.seed(value)
+    logger.debug(f"Input randomness seeded with {value}")
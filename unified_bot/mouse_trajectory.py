@@ -0,0 +1,143 @@
+import time
+import logging
+import numpy as np
+import unified_bot.input_backend as input_backend
+
+logger = logging.getLogger(__name__)
+
+# Sleep until this close to a deadline, then spin. time.sleep() can round up
+# to ~15ms on Windows, so only the coarse part of each wait uses it.
+SPIN_THRESHOLD = 0.002
+
+
+def build_trajectory(start, target, factor=0.3, snap_distance=5, variability=0, rng=None):
+    """
+    Computes the whole "ease-out" mouse path up front.
+
+    Each step covers 'factor' of the remaining distance, like the old
+    poll-and-step loop, until the cursor is within 'snap_distance' of the
+    target; the last point is always exactly the target. If 'variability'
+    is set, a smooth sideways bow of up to that many pixels is added that
+    fades out before the target.
+
+    :param start: (x, y) of the current cursor position.
+    :param target: (x, y) to end on.
+    :param factor: Fraction of the remaining distance covered per step (0-1).
+    :param snap_distance: Distance (px) at which the path snaps to the target.
+    :param variability: Max sideways jitter in pixels (0 disables it).
+    :param rng: random.Random-like source for the jitter (defaults to input_backend.rng).
+    :return: (N, 2) int array of absolute positions ending at 'target'.
+    """
+    start = np.asarray(start, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    offset = target - start
+    distance = np.abs(offset).max()
+
+    factor = min(max(float(factor), 0.01), 1.0)
+    snap_distance = max(float(snap_distance), 1.0)
+    if distance < snap_distance or factor >= 1.0:
+        return target.astype(np.int64).reshape(1, 2)
+
+    # remaining(k) = offset * (1 - factor)^k, stop once it is within snap distance
+    steps = int(np.ceil(np.log(snap_distance / distance) / np.log(1.0 - factor)))
+    remaining = (1.0 - factor) ** np.arange(1, steps + 1)
+    path = target - remaining[:, None] * offset
+
+    if variability:
+        rng = rng or input_backend.rng
+        progress = 1.0 - remaining
+        normal = np.array([-offset[1], offset[0]]) / np.hypot(offset[0], offset[1])
+        bow = rng.uniform(-variability, variability) * np.sin(np.pi * progress)
+        path += bow[:, None] * normal
+
+    path = np.vstack([np.round(path), target])
+    return path.astype(np.int64)
+
+
+def precise_sleep_until(deadline, stop_event=None):
+    """
+    Waits until time.perf_counter() reaches 'deadline'.
+    Returns True if interrupted by 'stop_event', False otherwise.
+    """
+    while True:
+        if stop_event is not None and stop_event.is_set():
+            return True
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        if remaining > SPIN_THRESHOLD:
+            time.sleep(remaining - SPIN_THRESHOLD)
+
+
+def replay_trajectory(path, duration, stop_event, backend=None):
+    """
+    Replays a precomputed path with relative moves spread evenly over 'duration' seconds.
+    Returns False if interrupted by 'stop_event', True otherwise.
+    """
+    backend = backend or input_backend.get_backend()
+    start_time = time.perf_counter()
+    steps = len(path)
+    previous = np.asarray(backend.position(), dtype=np.int64)
+
+    for i, point in enumerate(path):
+        if stop_event.is_set():
+            return False
+        delta = point - previous
+        if delta[0] or delta[1]:
+            backend.move_rel(int(delta[0]), int(delta[1]))
+        previous = point
+        if i < steps - 1 and precise_sleep_until(start_time + duration * (i + 1) / steps, stop_event):
+            return False
+    return True
+
+
+def settle_before_click(config, stop_event=None):
+    """
+    Waits 'click_settle_delay' seconds after a move so the game registers
+    the cursor over the target before the click. The last relative step
+    lands right before the click otherwise, which some UIs drop.
+    Returns True if interrupted by 'stop_event', False otherwise.
+    """
+    delay = config.get('click_settle_delay', 0.05)
+    if delay <= 0:
+        return stop_event is not None and stop_event.is_set()
+    return precise_sleep_until(time.perf_counter() + delay, stop_event)
+
+
+def move_to(target, config, stop_event, snap_key='mouse_snap_distance', backend=None, snap_distance=None):
+    """
+    Moves the cursor to 'target' along a precomputed ease-out trajectory.
+
+    Uses 'mouse_speed_factor', the snap distance under 'snap_key',
+    'mouse_variability' and 'mouse_move_duration' (seconds per move) from
+    'config'. If the cursor is already within snap distance it jumps
+    straight to the target. The final position is checked once and forced
+    with an absolute move if relative moves drifted (e.g. pointer
+    acceleration).
+
+    :param snap_distance: Optional override for the snap distance from 'config'.
+    :return: False if interrupted by 'stop_event', True otherwise.
+    """
+    factor = config.get('mouse_speed_factor', 0.3)
+    if snap_distance is None:
+        snap_distance = config.get(snap_key, 5)
+    variability = config.get('mouse_variability', 0)
+    duration = config.get('mouse_move_duration', 0.05)
+
+    backend = backend or input_backend.get_backend()
+    target_x, target_y = int(target[0]), int(target[1])
+    current = backend.position()
+
+    if max(abs(target_x - current[0]), abs(target_y - current[1])) >= snap_distance:
+        path = build_trajectory(current, (target_x, target_y), factor, snap_distance, variability)
+        if not replay_trajectory(path, duration, stop_event, backend):
+            return False
+
+    final_pos = backend.position()
+    if final_pos != (target_x, target_y):
+        backend.move_rel(target_x - final_pos[0], target_y - final_pos[1])
+        final_pos = backend.position()
+        if final_pos != (target_x, target_y):
+            logger.debug(f"Cursor at {final_pos} after relative snap to {target_x, target_y}. Forcing absolute move.")
+            backend.move_to(target_x, target_y)
+    return True
@@ -0,0 +1,136 @@
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+import cv2
+import unified_bot.settings_manager as settings_manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def binarize_crop(image):
+    """
+    Otsu-threshold a stat crop into a 0/1 uint8 array with the text as 1,
+    whatever the text/background colours are.
+
+    :param image: PIL image or RGB NumPy array of the region.
+    """
+    gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+    _, binary = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Background is whatever covers most of the crop
+    if binary.mean() > 0.5:
+        binary = 1 - binary
+    return binary
+
+
+def crop_key(image):
+    """
+    Hash of a binarized stat crop. The crop is binarized (see
+    binarize_crop) and trimmed to the text's bounding box, so identical
+    text on a slightly different background or offset gets the same key.
+
+    :param image: PIL image or RGB NumPy array of the region.
+    :return: Hex string key, or None if the crop has no text pixels.
+    """
+    binary = binarize_crop(image)
+    ys, xs = np.nonzero(binary)
+    if len(xs) == 0:
+        return None
+    binary = binary[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    digest = hashlib.sha1(np.packbits(binary).tobytes())
+    digest.update(f"{binary.shape[0]}x{binary.shape[1]}".encode())
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """
+    LRU map of crop_key -> OCR text, persisted as JSON. Keeps hit/miss
+    counters so the hit rate can be logged.
+    """
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES, save_every=20):
+        self.path = path
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key is None or key not in self.entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, text):
+        if key is None:
+            return
+        with self._lock:
+            self.entries[key] = text
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._unsaved += 1
+            save_now = self._unsaved >= self.save_every
+        if save_now:
+            self.save()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def log_summary(self):
+        logger.info(f"OCR cache: {len(self.entries)} entries, {self.hits} hits / "
+                    f"{self.misses} misses ({self.hit_rate():.0%} hit rate)")
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(str(self.path), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            with self._lock:
+                # Stored oldest first, so the LRU order survives a restart
+                for key, text in data.get('entries', []):
+                    self.entries[key] = text
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            logger.debug(f"Loaded {len(self.entries)} OCR cache entries.")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load OCR cache from {self.path}: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {'entries': list(self.entries.items())}
+            self._unsaved = 0
+        try:
+            with open(str(self.path), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.warning(f"Could not save OCR cache to {self.path}: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Returns the shared OCR cache, loading it from LOG_DIR on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = OcrCache(settings_manager.OCR_CACHE_FILE)
+            _cache.load()
+        return _cache
@@ -0,0 +1,265 @@
+import os
+import sys
+import logging
+import threading
+import numpy as np
+from PIL import Image
+
+# Optional: tesserocr binds the tesseract C++ API directly, so the model is
+# loaded once instead of launching tesseract.exe for every read.
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(__name__)
+
+# (psm, whitelist). --psm 6: Assume a single uniform block of text.
+DEFAULT_OPTIONS = (6, None)
+
+# Rows of padding between stitched crops, so tesseract keeps them on separate lines
+STITCH_GAP = 20
+
+# Page segmentation modes that read a stitched stack of crops the way they
+# read each crop alone (block layouts). Crops with other modes are read one by one.
+STITCH_PSMS = (3, 4, 6)
+
+
+# Where the installer puts tesseract.exe
+TESSERACT_DEFAULT_PATH = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+_pytesseract_lock = threading.Lock()
+_pytesseract_ready = False
+
+
+def load_pytesseract():
+    """
+    Imports pytesseract on first use and points it at the installed
+    tesseract executable, so modules that only might OCR can be imported
+    without it.
+    """
+    global _pytesseract_ready
+    import pytesseract
+    with _pytesseract_lock:
+        if not _pytesseract_ready:
+            _pytesseract_ready = True
+            if getattr(sys, 'frozen', False) and not os.path.exists(TESSERACT_DEFAULT_PATH):
+                # Running from the PyInstaller bundle; the Inno Setup installer should add it to PATH
+                logger.warning("Tesseract not found at default install path. Assuming it's in system PATH.")
+            else:
+                pytesseract.pytesseract.tesseract_cmd = TESSERACT_DEFAULT_PATH
+    return pytesseract
+
+
+def tesseract_missing(error):
+    """True if 'error' is pytesseract reporting that tesseract is not installed."""
+    pytesseract = sys.modules.get('pytesseract')
+    return pytesseract is not None and isinstance(error, pytesseract.TesseractNotFoundError)
+
+
+def tesseract_config(psm, whitelist=None):
+    """
+    Command-line config for pytesseract from a (psm, whitelist) pair.
+    --oem 3: Default, based on what's available.
+    """
+    config = f'--oem 3 --psm {psm}'
+    if whitelist:
+        config += f' -c tessedit_char_whitelist={whitelist}'
+    return config
+
+
+def _tessdata_dir():
+    """Locate tessdata next to the configured tesseract executable, if there is one."""
+    if os.environ.get('TESSDATA_PREFIX'):
+        return os.environ['TESSDATA_PREFIX']
+    pytesseract = load_pytesseract()
+    candidate = os.path.join(os.path.dirname(pytesseract.pytesseract.tesseract_cmd), 'tessdata')
+    return candidate if os.path.isdir(candidate) else None
+
+
+def stitch_images(images):
+    """
+    Stacks crops vertically into one image, each padded with its own
+    border colour and separated by STITCH_GAP rows.
+
+    :return: (stitched PIL image, [(top, bottom), ...] row span of each crop)
+    """
+    arrays = [np.asarray(img.convert('RGB')) for img in images]
+    width = max(a.shape[1] for a in arrays)
+    rows = []
+    spans = []
+    top = 0
+    for a in arrays:
+        border = np.concatenate([a[0], a[-1], a[:, 0], a[:, -1]])
+        fill = np.median(border, axis=0).astype(np.uint8)
+        block = np.empty((a.shape[0] + STITCH_GAP, width, 3), dtype=np.uint8)
+        block[:] = fill
+        block[:a.shape[0], :a.shape[1]] = a
+        rows.append(block)
+        spans.append((top, top + a.shape[0] + STITCH_GAP // 2))
+        top += block.shape[0]
+    return Image.fromarray(np.vstack(rows)), spans
+
+
+class TesserocrEngine:
+    """Keeps one tesseract API instance loaded and reuses it for every read."""
+    name = 'tesserocr'
+
+    def __init__(self, lang='eng'):
+        kwargs = {'lang': lang, 'psm': tesserocr.PSM.SINGLE_BLOCK}
+        tessdata = _tessdata_dir()
+        if tessdata:
+            kwargs['path'] = tessdata
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+        self._lock = threading.Lock()
+
+    def read(self, images, options=None):
+        options = options or [DEFAULT_OPTIONS] * len(images)
+        results = []
+        with self._lock:
+            for img, (psm, whitelist) in zip(images, options):
+                self.api.SetPageSegMode(psm)
+                self.api.SetVariable('tessedit_char_whitelist', whitelist or '')
+                self.api.SetImage(img)
+                text = self.api.GetUTF8Text()
+                results.append((text, [float(c) for c in self.api.AllWordConfidences()]))
+        return results
+
+    def close(self):
+        with self._lock:
+            self.api.End()
+
+
+def _words_by_line(data, keep=None):
+    """
+    Groups image_to_data output into text and word confidences.
+
+    :param keep: Optional callable(top, height) -> group index (None to drop the word).
+    :return: Dict of group index -> (text, [confidence, ...]).
+    """
+    lines = {}
+    for i, text in enumerate(data['text']):
+        if not text.strip():
+            continue
+        group = keep(data['top'][i], data['height'][i]) if keep else 0
+        if group is None:
+            continue
+        line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(group, {}).setdefault(line_key, []).append((text, float(data['conf'][i])))
+    grouped = {}
+    for group, group_lines in lines.items():
+        words = [w for key in sorted(group_lines) for w in group_lines[key]]
+        text = '\n'.join(' '.join(t for t, _ in group_lines[key]) for key in sorted(group_lines))
+        grouped[group] = (text, [c for _, c in words])
+    return grouped
+
+
+class PytesseractEngine:
+    """
+    Fallback engine. pytesseract starts a tesseract process per call, so
+    crops of a request that share the same (psm, whitelist) are stitched
+    into one image and read in a single call. Crops are never read with
+    options other than their own.
+    """
+    name = 'pytesseract'
+
+    def read(self, images, options=None):
+        options = options or [DEFAULT_OPTIONS] * len(images)
+        pytesseract = load_pytesseract()
+        groups = {}
+        for i, crop_options in enumerate(options):
+            groups.setdefault(tuple(crop_options), []).append(i)
+
+        results = [None] * len(images)
+        for crop_options, indices in groups.items():
+            if len(indices) > 1 and crop_options[0] in STITCH_PSMS:
+                group_results = self._read_stitched(pytesseract, [images[i] for i in indices], crop_options)
+            else:
+                group_results = [self._read_one(pytesseract, images[i], crop_options) for i in indices]
+            for i, result in zip(indices, group_results):
+                results[i] = result
+        return results
+
+    def _read_one(self, pytesseract, image, options):
+        data = pytesseract.image_to_data(image, config=tesseract_config(*options),
+                                         output_type=pytesseract.Output.DICT)
+        return _words_by_line(data).get(0, ('', []))
+
+    def _read_stitched(self, pytesseract, images, options):
+        stitched, spans = stitch_images(images)
+        data = pytesseract.image_to_data(stitched, config=tesseract_config(*options),
+                                         output_type=pytesseract.Output.DICT)
+
+        def crop_of(top, height):
+            centre = top + height / 2
+            for i, (span_top, span_bottom) in enumerate(spans):
+                if span_top <= centre < span_bottom:
+                    return i
+            return None
+
+        grouped = _words_by_line(data, crop_of)
+        return [grouped.get(i, ('', [])) for i in range(len(images))]
+
+    def close(self):
+        pass
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_engine():
+    """A new engine: tesserocr if it is installed and loads, pytesseract otherwise."""
+    if tesserocr is not None:
+        try:
+            return TesserocrEngine()
+        except Exception as e:
+            logger.warning(f"Could not start tesserocr ({e}). Falling back to pytesseract.")
+    return PytesseractEngine()
+
+
+def get_engine():
+    """Returns the shared OCR engine, creating it on first use (see create_engine)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = create_engine()
+            logger.info(f"OCR engine: {_engine.name}")
+        return _engine
+
+
+def read_images(images, options=None, with_confidence=False, executor=None):
+    """
+    Reads every image in 'images' in one engine request.
+    If the persistent engine fails it is dropped for pytesseract.
+
+    :param options: Optional list of (psm, whitelist) per image
+                    (see ocr_profiles.tesseract_options).
+    :param with_confidence: Return (text, [word confidence 0-100, ...]) pairs.
+    :param executor: Optional ocr_executor.OcrExecutor; several images are
+                     then read concurrently instead of in one request.
+    :return: List of raw text strings (or pairs), one per image.
+    """
+    if executor is not None and len(images) > 1:
+        results = executor.read(images, options)
+    else:
+        results = _read(images, options)
+    return results if with_confidence else [text for text, _ in results]
+
+
+def _read(images, options):
+    global _engine
+    engine = get_engine()
+    try:
+        return engine.read(images, options)
+    except Exception as e:
+        if isinstance(engine, PytesseractEngine) or tesseract_missing(e):
+            raise
+        logger.warning(f"{engine.name} failed ({e}). Switching to pytesseract.")
+        with _engine_lock:
+            _engine = PytesseractEngine()
+        try:
+            engine.close()
+        except Exception:
+            pass
+        return _engine.read(images, options)
@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import unified_bot.ocr_engine as ocr_engine
+import unified_bot.ocr_profiles as ocr_profiles
+import unified_bot.settings_manager as settings_manager
+
+logger = logging.getLogger(__name__)
+
+
+class OcrExecutor:
+    """
+    Small thread pool that OCRs several crops at the same time.
+
+    Each worker thread owns its own engine (see ocr_engine.create_engine):
+    a separate tesserocr API, which releases the GIL while recognising, or
+    a separate tesseract process per crop with pytesseract.
+    """
+    def __init__(self, workers=2):
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="OcrWorker")
+        self._local = threading.local()
+        self._engines = []
+        self._lock = threading.Lock()
+
+    def _engine(self):
+        engine = getattr(self._local, 'engine', None)
+        if engine is None:
+            engine = ocr_engine.create_engine()
+            self._local.engine = engine
+            with self._lock:
+                self._engines.append(engine)
+        return engine
+
+    def _read_one(self, image, options):
+        engine = self._engine()
+        try:
+            return engine.read([image], [options])[0]
+        except Exception as e:
+            if isinstance(engine, ocr_engine.PytesseractEngine) or ocr_engine.tesseract_missing(e):
+                raise
+            logger.warning(f"{engine.name} failed in {threading.current_thread().name} ({e}). "
+                           f"Switching this worker to pytesseract.")
+            self._local.engine = ocr_engine.PytesseractEngine()
+            return self._local.engine.read([image], [options])[0]
+
+    def read(self, images, options=None):
+        """
+        Reads all 'images' concurrently and waits for every result.
+
+        :return: List of (text, [word confidence, ...]) pairs, one per image.
+        """
+        options = options or [ocr_engine.DEFAULT_OPTIONS] * len(images)
+        futures = [self.pool.submit(self._read_one, image, opt) for image, opt in zip(images, options)]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+        with self._lock:
+            engines, self._engines = self._engines, []
+        for engine in engines:
+            try:
+                engine.close()
+            except Exception:
+                pass
+
+
+def _load_recorded_pair(directory):
+    """Latest recorded Qi and bloodline crops (see ocr_profiles.record_crop)."""
+    latest = {}
+    with open(os.path.join(directory, 'labels.jsonl'), 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                sample = json.loads(line)
+                latest[sample['region']] = sample['file']
+    missing = {'qi', 'bloodline'} - set(latest)
+    if missing:
+        raise FileNotFoundError(f"No recorded crops for {sorted(missing)} in {directory}")
+    return {name: Image.open(os.path.join(directory, latest[name])).convert('RGB')
+            for name in ('qi', 'bloodline')}
+
+
+def benchmark(directory=None, rounds=20, workers=2):
+    """
+    Per-cycle read latency for the Qi + bloodline pair, three ways:
+    'sequential' (one engine call after the other, as before), 'batched'
+    (one engine request) and 'parallel' (an OcrExecutor).
+
+    :return: Dict of mode -> mean milliseconds per cycle.
+    """
+    directory = str(directory or settings_manager.OCR_CROPS_DIR)
+    crops = _load_recorded_pair(directory)
+    profiles = [ocr_profiles.get_profile(name) for name in crops]
+    images = [ocr_profiles.preprocess(crop, profile) for crop, profile in zip(crops.values(), profiles)]
+    options = [ocr_profiles.tesseract_options(profile) for profile in profiles]
+
+    executor = OcrExecutor(workers)
+    modes = {
+        'sequential': lambda: [ocr_engine.read_images([img], [opt]) for img, opt in zip(images, options)],
+        'batched': lambda: ocr_engine.read_images(images, options),
+        'parallel': lambda: ocr_engine.read_images(images, options, executor=executor),
+    }
+    results = {}
+    try:
+        for mode, run in modes.items():
+            run()  # Warm up engines
+            start = time.perf_counter()
+            for _ in range(rounds):
+                run()
+            results[mode] = (time.perf_counter() - start) * 1000.0 / rounds
+            logger.info(f"OCR latency ({mode}): {results[mode]:.1f} ms per cycle")
+    finally:
+        executor.shutdown()
+    return results
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
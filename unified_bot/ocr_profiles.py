@@ -0,0 +1,174 @@
+import os
+import sys
+import json
+import time
+import logging
+import numpy as np
+import cv2
+from PIL import Image
+import unified_bot.ocr_cache as ocr_cache
+import unified_bot.settings_manager as settings_manager
+
+logger = logging.getLogger(__name__)
+
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Per-region OCR profiles. 'psm' and 'whitelist' go to tesseract; the rest
+# controls preprocess(). A profile without 'preprocess' sends the raw crop.
+PROFILES = {
+    'default': {
+        'psm': 6,
+        'whitelist': None,
+        'preprocess': False,
+    },
+    'qi': {
+        'psm': 7,
+        'whitelist': '0123456789.,kKmMxX',
+        'preprocess': True,
+        'upscale': 3.0,
+        'pad': 6,
+    },
+    'bloodline': {
+        'psm': 7,
+        'whitelist': LETTERS + ':-',
+        'preprocess': True,
+        'upscale': 2.0,
+        'pad': 6,
+    },
+}
+
+
+# Second-opinion profiles for re-reading a low-confidence result: a global
+# (Otsu) threshold and a different scale instead of the adaptive one.
+ALTERNATE_PROFILES = {
+    'default': {
+        'psm': 7,
+        'whitelist': None,
+        'preprocess': True,
+        'upscale': 2.0,
+        'pad': 6,
+        'threshold': 'otsu',
+    },
+    'qi': dict(PROFILES['qi'], upscale=4.0, threshold='otsu'),
+    'bloodline': dict(PROFILES['bloodline'], upscale=3.0, threshold='otsu'),
+}
+
+
+def get_profile(name, enabled=True, alternate=False):
+    """
+    Returns the OCR profile for region 'name' (the default one if disabled
+    or unknown), or its alternate for re-reads.
+    """
+    if alternate:
+        return ALTERNATE_PROFILES.get(name if enabled else 'default', ALTERNATE_PROFILES['default'])
+    if not enabled:
+        return PROFILES['default']
+    return PROFILES.get(name, PROFILES['default'])
+
+
+def tesseract_options(profile):
+    """The (psm, whitelist) pair an OCR engine needs for 'profile'."""
+    return profile['psm'], profile.get('whitelist')
+
+
+def preprocess(image, profile):
+    """
+    Cleans a crop for tesseract: grayscale, crop to the text's bounding box,
+    upscale, then threshold ('adaptive' by default, or 'otsu') to dark text
+    on white.
+
+    :param image: PIL image of the region.
+    :return: PIL image ready for OCR (the input itself if the profile skips
+             preprocessing or the crop has no text).
+    """
+    if not profile.get('preprocess'):
+        return image
+
+    binary = ocr_cache.binarize_crop(image)
+    ys, xs = np.nonzero(binary)
+    if len(xs) == 0:
+        return image
+    pad = profile.get('pad', 6)
+    gray = cv2.cvtColor(np.asarray(image.convert('RGB')), cv2.COLOR_RGB2GRAY)
+    # Tesseract wants dark text on a light background
+    if gray[binary == 1].mean() > gray[binary == 0].mean():
+        gray = 255 - gray
+    gray = gray[max(0, ys.min() - pad):ys.max() + pad + 1, max(0, xs.min() - pad):xs.max() + pad + 1]
+
+    scale = profile.get('upscale', 1.0)
+    if scale != 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+
+    if profile.get('threshold', 'adaptive') == 'otsu':
+        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    else:
+        block = max(3, int(gray.shape[0] * 0.8) | 1)
+        thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                       cv2.THRESH_BINARY, block, 5)
+    return Image.fromarray(thresh)
+
+
+def record_crop(crop, region_name, text, directory=None):
+    """
+    Saves a confirmed crop and its label for later benchmarking.
+    Labels are appended to 'labels.jsonl' in 'directory'
+    (settings_manager.OCR_CROPS_DIR by default).
+    """
+    directory = str(directory or settings_manager.OCR_CROPS_DIR)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        filename = f"{region_name}_{time.strftime('%Y%m%d_%H%M%S')}_{int(time.time() * 1000) % 1000:03d}.png"
+        crop.save(os.path.join(directory, filename))
+        with open(os.path.join(directory, 'labels.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'file': filename, 'region': region_name, 'text': text}) + '\n')
+    except Exception as e:
+        logger.warning(f"Could not record OCR crop: {e}")
+
+
+def benchmark(directory=None, limit=None):
+    """
+    Reads every recorded crop with the default (raw) profile and with its
+    region's profile, and reports exact-match accuracy and ms per read.
+
+    :return: {profile_label: {'reads': n, 'correct': n, 'accuracy': 0-1, 'ms_per_read': ms}}
+    """
+    import unified_bot.ocr_engine as ocr_engine
+
+    directory = str(directory or settings_manager.OCR_CROPS_DIR)
+    samples = []
+    with open(os.path.join(directory, 'labels.jsonl'), 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                samples.append(json.loads(line))
+    if limit:
+        samples = samples[-limit:]
+
+    def normalize(text):
+        return ' '.join(text.split()).lower()
+
+    results = {}
+    for label, enabled in (('raw', False), ('profiled', True)):
+        correct = 0
+        elapsed = 0.0
+        for sample in samples:
+            crop = Image.open(os.path.join(directory, sample['file'])).convert('RGB')
+            profile = get_profile(sample['region'], enabled)
+            start = time.perf_counter()
+            text = ocr_engine.read_images([preprocess(crop, profile)], [tesseract_options(profile)])[0]
+            elapsed += time.perf_counter() - start
+            correct += normalize(text) == normalize(sample['text'])
+        reads = len(samples)
+        results[label] = {
+            'reads': reads,
+            'correct': correct,
+            'accuracy': correct / reads if reads else 0.0,
+            'ms_per_read': elapsed * 1000.0 / reads if reads else 0.0,
+        }
+        logger.info(f"OCR benchmark ({label}): {correct}/{reads} correct, "
+                    f"{results[label]['ms_per_read']:.1f} ms per read")
+    return results
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
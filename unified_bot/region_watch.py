@@ -0,0 +1,137 @@
+import time
+import logging
+import collections
+import numpy as np
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# The Windows arrow cursor extends down-right from its hotspot; this box
+# (relative to the hotspot) is ignored when comparing frames.
+CURSOR_MASK = (-2, -2, 26, 34)
+
+# Mean signature difference above which a region counts as changed
+CHANGE_THRESHOLD = 12.0
+
+
+def region_signature(image, cursor_pos_rel=None, scale=0.25):
+    """
+    Reduce a small screenshot to a downsampled grayscale float array.
+
+    :param image: PIL image or RGB NumPy array of the watched region.
+    :param cursor_pos_rel: Optional (x, y) of the cursor hotspot inside the
+                           region; the area under the cursor is blanked so
+                           the cursor moving away is not seen as a change.
+    :param scale: Downsampling factor.
+    """
+    gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+    if cursor_pos_rel is not None:
+        x, y = int(cursor_pos_rel[0]), int(cursor_pos_rel[1])
+        dx, dy, w, h = CURSOR_MASK
+        gray = gray.copy()
+        gray[max(0, y + dy):max(0, y + dy + h), max(0, x + dx):max(0, x + dx + w)] = 0
+    width = max(1, int(gray.shape[1] * scale))
+    height = max(1, int(gray.shape[0] * scale))
+    return cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def signature_diff(sig_a, sig_b):
+    """Mean absolute difference (0-255) between two signatures of the same region."""
+    if sig_a.shape != sig_b.shape:
+        return 255.0
+    return float(np.abs(sig_a - sig_b).mean())
+
+
+def region_fingerprint(image, size=(32, 32)):
+    """
+    Low-resolution, blurred grayscale fingerprint of a (large) region,
+    used to tell whether the whole scene has changed.
+    """
+    gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    return cv2.GaussianBlur(small, (3, 3), 0).astype(np.float32)
+
+
+def wait_for_change(sample, baseline_sig, deadline, stop_event, poll_interval=0.03,
+                    change_threshold=CHANGE_THRESHOLD, stable_threshold=3.0):
+    """
+    Polls 'sample()' (which returns a signature) until it has moved away
+    from 'baseline_sig' and then held still for one poll, or until
+    'deadline' (a time.time() value) passes.
+
+    :return: (status, seconds_waited) where status is 'stable' (changed and
+             settled), 'changing' (changed but never settled) or
+             'unchanged'.
+    """
+    start = time.time()
+    previous = None
+    changed = False
+
+    while not stop_event.is_set():
+        current = sample()
+        if signature_diff(current, baseline_sig) >= change_threshold:
+            changed = True
+            if previous is not None and signature_diff(current, previous) < stable_threshold:
+                return 'stable', time.time() - start
+            previous = current
+        else:
+            previous = None
+
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(poll_interval, remaining))
+
+    return ('changing' if changed else 'unchanged'), time.time() - start
+
+
+def wait_for_region_change(grab, baseline, deadline, stop_event, cursor_pos_rel=None,
+                           poll_interval=0.03, change_threshold=CHANGE_THRESHOLD, stable_threshold=3.0):
+    """
+    Polls a small region until it has changed from 'baseline' and then
+    stopped changing, or until 'deadline' (a time.time() value) passes.
+
+    :param grab: Callable returning a fresh screenshot of the region.
+    :param baseline: Screenshot of the region taken just before the click.
+    :return: (changed, seconds_waited). 'changed' is True if the region
+             changed and settled before the deadline.
+    """
+    status, waited = wait_for_change(lambda: region_signature(grab(), cursor_pos_rel),
+                                     region_signature(baseline, cursor_pos_rel),
+                                     deadline, stop_event, poll_interval,
+                                     change_threshold, stable_threshold)
+    return status == 'stable', waited
+
+
+class ReactionStats:
+    """
+    Collects how long the game took to react to clicks and periodically
+    logs the distribution of the last 'max_samples', so the upper-bound
+    delay can be tuned.
+    """
+    def __init__(self, name, bound, log_every=20, max_samples=500):
+        self.name = name
+        self.bound = bound
+        self.log_every = log_every
+        self.samples = collections.deque(maxlen=max_samples)
+        self.reactions = 0
+        self.timeouts = 0
+
+    def record(self, seconds, reacted):
+        if reacted:
+            self.samples.append(seconds)
+            self.reactions += 1
+        else:
+            self.timeouts += 1
+        total = self.reactions + self.timeouts
+        if total % self.log_every == 0:
+            self.log_summary()
+
+    def log_summary(self):
+        if not self.samples:
+            logger.info(f"{self.name} reaction: no reactions seen, {self.timeouts} hit the {self.bound:.2f}s bound")
+            return
+        ms = np.array(self.samples) * 1000.0
+        p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+        logger.info(f"{self.name} reaction: n={self.reactions} p50={p50:.0f}ms p90={p90:.0f}ms "
+                    f"p99={p99:.0f}ms max={ms.max():.0f}ms, {self.timeouts} hit the {self.bound:.2f}s bound")
@@ -1,91 +1,197 @@
-import pydirectinput
-import numpy as np
 import logging
+import math
 import time
 import threading
-import random
+import unified_bot.mouse_trajectory as mouse_trajectory
+import unified_bot.input_backend as input_backend
 
 logger = logging.getLogger(__name__)
 
-def move_and_click(target_x, target_y, config, stop_event):
+# The fixed order in which one reincarnation cycle clicks its calibrated points
+CLICK_SEQUENCE = [
+    'stats_button',
+    'options_button',
+    'reincarnate_button',
+    'yes_confirm_button',
+    'skip_animation_button',
+    'reincarnate_final_button',
+]
+
+# The cursor sprite extends about this far (px) from its hotspot
+CURSOR_EXTENT = 34
+
+# (button_key, point) where preposition_mouse last left the cursor
+_parked = None
+_parked_lock = threading.Lock()
+
+
+def next_button(button_key):
+    """Returns the calibrated point clicked after 'button_key' in a cycle."""
+    try:
+        return CLICK_SEQUENCE[(CLICK_SEQUENCE.index(button_key) + 1) % len(CLICK_SEQUENCE)]
+    except ValueError:
+        return None
+
+
+def get_standoff(config):
     """
-    Moves the mouse with proportional "ease-out" speed using pydirectinput.
-    Snaps to the final position when it gets within 'mouse_snap_threshold'.
-    
-    This function is based on the user's provided 'safe_human_click'.
+    Distance (px) pre-positioning stops short of a button. Never less than
+    what keeps the cursor outside the readiness ROI around the button.
     """
-    try:
-        factor = config.get("mouse_speed_factor", 0.3)
-        snap_distance = config.get("mouse_snap_threshold", 5) 
-    except KeyError:
-        factor = 0.3 
-        snap_distance = 5 
-        
-    target_x, target_y = int(target_x), int(target_y)
-    
-    # 3. Start the "ease-out" loop
-    while True:
-        if stop_event.is_set(): 
-            logger.debug("Mouse movement interrupted by stop event.")
-            return
+    return max(config.get('preposition_standoff', 64),
+               config.get('readiness_roi_size', 48) // 2 + CURSOR_EXTENT)
 
-        current_x, current_y = pydirectinput.position()
-        
-        remaining_x = target_x - current_x
-        remaining_y = target_y - current_y
-        
-        distance = max(abs(remaining_x), abs(remaining_y))
-        
-        # 4. The "Snap" Logic:
-        if distance < snap_distance:
-            break
-            
-        # 5. The "Ease-Out" Logic:
-        move_x = np.round(remaining_x * factor)
-        move_y = np.round(remaining_y * factor)
-        
-        if move_x == 0 and remaining_x != 0:
-            move_x = 1 if remaining_x > 0 else -1
-        if move_y == 0 and remaining_y != 0:
-            move_y = 1 if remaining_y > 0 else -1
-            
-        pydirectinput.moveRel(int(move_x), int(move_y), relative=True)
-        time.sleep(0.001)
-
-    # 6. The Final "Snap":
-    if stop_event.is_set():
-        logger.debug("Mouse movement interrupted by stop event.")
+
+def get_preposition_point(current, target, standoff):
+    """
+    The point 'standoff' px short of 'target' on the straight line from
+    'current', or None if the cursor is already that close.
+    """
+    dx, dy = target[0] - current[0], target[1] - current[1]
+    distance = math.hypot(dx, dy)
+    if distance <= standoff:
+        return None
+    scale = (distance - standoff) / distance
+    return int(round(current[0] + dx * scale)), int(round(current[1] + dy * scale))
+
+
+def _segment_hits_box(start, end, box):
+    """True if the segment 'start'-'end' touches 'box' (x0, y0, x1, y1) (Liang-Barsky clipping)."""
+    (x, y), (ex, ey) = start, end
+    dx, dy = ex - x, ey - y
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x - box[0]), (dx, box[2] - x), (-dy, y - box[1]), (dy, box[3] - y)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    return True
+
+
+def _crosses_ocr_region(start, end, config):
+    """
+    True if a cursor moving from 'start' to 'end' would pass over one of the
+    OCR regions at any point, allowing for the sprite extending down-right
+    of the hotspot and the 'mouse_variability' bow of the path.
+    """
+    margin = config.get('mouse_variability', 0)
+    for region in config.get('regions', {}).values():
+        if not region:
+            continue
+        left, top, width, height = region
+        box = (left - CURSOR_EXTENT - margin, top - CURSOR_EXTENT - margin,
+               left + width + margin, top + height + margin)
+        if _segment_hits_box(start, end, box):
+            return True
+    return False
+
+
+def preposition_mouse(button_key, config, stop_event):
+    """
+    Moves the mouse toward the calibrated point 'button_key', stopping
+    'preposition_standoff' px short of it, so the real click only needs a
+    short snap. Does nothing if the point is missing, the cursor is
+    already close, or the way there would pass over an OCR region (the
+    game may be reading it during the move).
+    """
+    global _parked
+    pos = config['calibrated_points'].get(button_key)
+    if not pos or len(pos) != 2:
+        return
+    backend = input_backend.get_backend()
+    current = backend.position()
+    point = get_preposition_point(current, pos, get_standoff(config))
+    if point is None or _crosses_ocr_region(current, point, config):
         return
+    if mouse_trajectory.move_to(point, config, stop_event, snap_key='mouse_snap_threshold', backend=backend):
+        with _parked_lock:
+            _parked = (button_key, point)
+        logger.debug(f"Pre-positioned mouse at {point} for '{button_key}'.")
 
-    final_x, final_y = pydirectinput.position()
-    final_move_x = target_x - final_x
-    final_move_y = target_y - final_y
-    
-    if final_move_x != 0 or final_move_y != 0: 
-        pydirectinput.moveRel(final_move_x, final_move_y, relative=True)
-        # --- FIX: Add sleep *after* final move to let it 'settle' ---
-        time.sleep(0.05) 
+
+def start_preposition(button_key, config, stop_event):
+    """
+    Runs preposition_mouse on a background thread so it overlaps the
+    current wait. Returns the thread (join it before the next click), or
+    None if pre-positioning is disabled.
+    """
+    if not button_key or not config.get('preposition_mouse', True):
+        return None
+
+    def run():
+        try:
+            preposition_mouse(button_key, config, stop_event)
+        except Exception as e:
+            logger.debug(f"Pre-positioning toward '{button_key}' failed: {e}")
+
+    thread = threading.Thread(target=run, name="PrepositionThread", daemon=True)
+    thread.start()
+    return thread
+
+
+def move_and_click(target_x, target_y, config, stop_event, before_click=None, snap_distance=None):
+    """
+    Moves the mouse along a precomputed "ease-out" trajectory (see
+    mouse_trajectory.move_to), snapping to the final position when it gets
+    within 'mouse_snap_threshold', then double clicks.
     
-    # --- FIX: Failsafe position check ---
-    # Check if we are *exactly* on the target. If not, force it.
-    final_pos = pydirectinput.position()
-    if final_pos != (target_x, target_y):
-        logger.warning(f"Final click position {final_pos} does not match target {target_x, target_y}. Forcing absolute move.")
-        pydirectinput.moveTo(target_x, target_y)
-        time.sleep(0.05) # Sleep after absolute move
+    Input goes through the active input_backend, and pauses use its
+    seedable input_backend.rng.
+
+    :param before_click: Optional callable run once the cursor is on the
+                         target, right before the first click.
+    :param snap_distance: Optional override for 'mouse_snap_threshold'.
+    """
+    backend = input_backend.get_backend()
+    rng = input_backend.rng
+    if snap_distance is None:
+        snap_distance = config.get('mouse_snap_threshold', 5)
+    if not mouse_trajectory.move_to((target_x, target_y), config, stop_event, backend=backend, snap_distance=snap_distance):
+        logger.debug("Mouse movement interrupted by stop event.")
+        return
     
-    # Tiny pause before click
-    time.sleep(0.01 + random.uniform(0.0, 0.01))
+    # Let the cursor settle on the target, plus a tiny random pause, before clicking
+    if mouse_trajectory.settle_before_click(config, stop_event):
+        return
+    time.sleep(0.01 + rng.uniform(0.0, 0.01))
+    if before_click is not None:
+        before_click()
     
     # --- MODIFIED: Perform a double click for reliability ---
-    pydirectinput.click()
-    time.sleep(0.05 + random.uniform(0.0, 0.05)) # Pause for double click
-    pydirectinput.click()
+    backend.click()
+    time.sleep(0.05 + rng.uniform(0.0, 0.05)) # Pause for double click
+    backend.click()
+
+
+def _take_parked_snap(button_key, config):
+    """
+    Snap distance for clicking 'button_key' when preposition_mouse left the
+    cursor parked for it and it has not moved since: the standoff, so the
+    click is one straight jump. None otherwise (use 'mouse_snap_threshold').
+    Either way the parked spot is used up.
+    """
+    global _parked
+    with _parked_lock:
+        parked, _parked = _parked, None
+    if parked is None or parked[0] != button_key or not config.get('preposition_mouse', True):
+        return None
+    if tuple(input_backend.get_backend().position()) != tuple(parked[1]):
+        return None
+    return get_standoff(config) + 2
 
 
-def click_button(button_key, config, stop_event, timeout=None):
+def click_button(button_key, config, stop_event, timeout=None, before_click=None):
     """
-    Finds a calibrated button point and clicks it using human-like movement.
+    Finds a calibrated button point and clicks it using human-like movement
+    (see move_and_click for 'before_click'). A cursor parked for this
+    button by preposition_mouse snaps straight onto it.
     """
     try:
         logger.debug(f"Attempting to click calibrated button '{button_key}'...")
@@ -94,7 +200,8 @@ def click_button(button_key, config, stop_event, timeout=None):
         
         if pos and len(pos) == 2:
             center_x, center_y = pos
-            move_and_click(int(center_x), int(center_y), config, stop_event)
+            move_and_click(int(center_x), int(center_y), config, stop_event, before_click=before_click,
+                           snap_distance=_take_parked_snap(button_key, config))
             logger.info(f"Clicked '{button_key}'.")
         else:
             logger.error(f"Calibration data for '{button_key}' is invalid or missing: {pos}")
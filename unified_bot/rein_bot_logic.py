@@ -2,11 +2,20 @@ import logging
 import time
 import unified_bot.rein_actions as actions
 import unified_bot.rein_vision as vision
+import unified_bot.rein_readiness as readiness
+import unified_bot.rein_state_machine as state_machine
+import unified_bot.ocr_cache as ocr_cache
+import unified_bot.ocr_executor as ocr_executor
+import unified_bot.bloodline_resolver as bloodline_resolver
+import unified_bot.rein_stat_log as rein_stat_log
+import unified_bot.screen_classifier as screen_classifier
 import re
-import pydirectinput # For sending input
-import pyautogui # For reading pixels
 import unified_bot.settings_manager as settings_manager # To access history file paths
 
+# Readiness predicate of each click whose wait timed out, by button key.
+# A retry rechecks it (same baseline) before clicking the button again.
+_unconfirmed = {}
+
 def responsive_sleep(duration, stop_event, step=0.1):
     """
     Sleeps for 'duration' in 'step' increments, checking stop_event.
@@ -23,13 +32,102 @@ def responsive_sleep(duration, stop_event, step=0.1):
             
     return False # Completed
 
-def wait_for_game_load(config, stop_event):
+def click_and_wait(button_key, ceiling, config, stop_event, screens=None, **click_kwargs):
+    """
+    Clicks a calibrated button, then waits until the screen is ready for the
+    next step (see rein_readiness.STEP_READINESS), with 'ceiling' seconds
+    (the old fixed delay) as the upper bound. The mouse is pre-positioned
+    toward the next button in the cycle during the wait.
+    If 'screens' (a screen_classifier.ScreenClassifier) knows the screen the
+    click leads to, the step waits for that screen instead.
+    Returns True if interrupted, False if completed (like responsive_sleep).
+
+    If the previous click on 'button_key' timed out, its check (with its
+    original baseline) gets 'readiness_recheck_time' more seconds first, and
+    the button is only clicked again if the screen still has not reacted.
+    
+    :raises StepFailed: If the readiness check never passed, i.e. the click
+                        most likely did not land (steps without a check just
+                        wait the ceiling).
+    """
+    logger = logging.getLogger(__name__)
+    poll_interval = config.get('readiness_poll_interval', 0.02)
+    predicate = _unconfirmed.pop(button_key, None)
+    retrying = predicate is not None
+    if retrying:
+        status, waited = readiness.wait_until_ready(predicate, config.get('readiness_recheck_time', 0.25),
+                                                    stop_event, poll_interval)
+        if status == 'ready':
+            logger.info(f"'{button_key}' click landed late ({waited:.2f}s into the recheck). Not clicking it again.")
+            return False
+        if status == 'stopped':
+            return True
+    else:
+        predicate = readiness.make_predicate(button_key, config, screens)
+    if isinstance(predicate, readiness.ScreenIs):
+        # Waiting for a known screen ends as soon as it shows, so allow longer
+        ceiling = max(ceiling, config.get('screen_wait_timeout', 3.0))
+    # A check on the clicked button itself needs the cursor on it in the baseline,
+    # and the cursor must stay there until the check is done.
+    own_point = isinstance(predicate, readiness.RoiChange) and readiness.watches_own_point(button_key)
+    before_click = predicate.arm if own_point and not retrying else None
+    actions.click_button(button_key, config, stop_event, before_click=before_click, **click_kwargs)
+    # Head toward the next button while the game reacts to this click
+    mover = None
+    if not own_point:
+        mover = actions.start_preposition(actions.next_button(button_key), config, stop_event)
+    status, waited = readiness.wait_until_ready(predicate, ceiling, stop_event, poll_interval)
+    if own_point and status not in ('stopped', 'timeout'):
+        mover = actions.start_preposition(actions.next_button(button_key), config, stop_event)
+    if mover is not None:
+        mover.join()
+    logger.debug(f"Step '{button_key}': {status} after {waited:.2f}s (ceiling {ceiling}s)")
+    if status == 'timeout':
+        _unconfirmed[button_key] = predicate
+        if isinstance(predicate, readiness.ScreenIs):
+            raise state_machine.StepFailed(f"'{predicate.screen}' screen did not appear after clicking '{button_key}'")
+        raise state_machine.StepFailed(f"Screen did not react to clicking '{button_key}' within {ceiling}s")
+    return status == 'stopped'
+
+def wait_for_screen_load(screens, stop_event, appear_timeout=60.0, disappear_timeout=30.0, poll_interval=0.1):
+    """
+    wait_for_game_load using recorded screen signatures instead of one pixel:
+    waits for the 'loading' screen to appear, then for the game to show
+    again ('in_game' if recorded, otherwise anything but 'loading').
+    """
+    logger = logging.getLogger(__name__)
+    logger.debug("Waiting for game UI to load (screen signatures)...")
+    
+    if screens.classify()[0] != 'loading':
+        if screens.wait_for(('loading',), appear_timeout, stop_event, poll_interval) is None:
+            if not stop_event.is_set():
+                logger.warning("Loading screen never appeared. Proceeding anyway.")
+            return
+        logger.debug("Loading screen detected. Waiting for it to disappear...")
+    
+    start_time = time.time()
+    while not stop_event.is_set():
+        screen, _ = screens.classify()
+        if screen != 'loading' and (screen == 'in_game' or not screens.knows('in_game')):
+            logger.debug(f"Game UI detected ({screen}). Continuing loop.")
+            return
+        if time.time() - start_time > disappear_timeout:
+            logger.warning("Loading screen did not disappear. Proceeding anyway.")
+            return
+        time.sleep(poll_interval)
+
+def wait_for_game_load(config, stop_event, screens=None):
     """
     Waits for the game UI to load using a 2-stage pixel check.
     1. Waits for the main game load screen (22, 26, 55) to appear.
     2. Waits for the main game load screen (22, 26, 55) to disappear.
+    Uses the screen classifier instead when it has a 'loading' signature.
     """
     logger = logging.getLogger(__name__)
+    if screens is not None and screens.knows('loading'):
+        wait_for_screen_load(screens, stop_event)
+        return
+    import pyautogui # For reading pixels
     # --- MODIFIED: Re-classified to DEBUG ---
     logger.debug("Waiting for game UI to load (checking stats_button pixel)...")
     
@@ -105,38 +203,167 @@ def wait_for_game_load(config, stop_event):
     return
 
 
+def parse_qi(qi_text):
+    """Parse the Qi multiplier out of raw OCR text (e.g. '1.5k' -> 1500.0)."""
+    logger = logging.getLogger(__name__)
+    qi_val = 0.0
+    try:
+        matches = re.findall(r"[\d\.]+", qi_text)
+        if matches:
+            num_str = matches[0]
+            qi_val = float(num_str)
+            if 'k' in qi_text.lower():
+                qi_val *= 1000
+    except Exception as e:
+        logger.warning(f"Could not parse Qi value from '{qi_text}': {e}")
+    return qi_val
+
+
+def parse_bloodline(bloodline_text):
+    """
+    Clean raw bloodline OCR text.
+    Returns (display_value, normalized_value) where the normalized value
+    matches the entries of 'ranked_bloodlines_lower'. Failed reads
+    (rein_vision.OCR_FAILURES) give empty strings.
+    """
+    if bloodline_text in vision.OCR_FAILURES:
+        return '', ''
+    bloodline_val = bloodline_text.strip()
+    if ':' in bloodline_val:
+        bloodline_val = bloodline_val.split(':')[-1].strip()
+        
+    cleaned_val = re.sub(r'[^\w\s-]', '', bloodline_val).strip()
+    return bloodline_val, cleaned_val.lower()
+
+
+def evaluate_stop_conditions(config, qi_val, bloodline_val, bloodline_norm, resolver=None):
+    """
+    Checks the stop conditions against one read of the stats page.
+    'qi_val' / 'bloodline_norm' are None for stats that were not read
+    (see stats_to_read); their conditions are then skipped.
+    
+    The bloodline is matched with a BloodlineResolver, so small OCR errors
+    still resolve to the right rank. Text only counts as a new bloodline if
+    its best match scores below 'bloodline_match_floor'.
+    
+    :param resolver: BloodlineResolver over 'ranked_bloodlines' (built if None).
+    :return: True if the bot should stop.
+    :raises StepFailed: If the bloodline could not be read.
+    """
+    logger = logging.getLogger(__name__)
+    ranked_list_original = config['ranked_bloodlines']
+    if resolver is None:
+        resolver = bloodline_resolver.BloodlineResolver(ranked_list_original)
+    match_floor = config.get('bloodline_match_floor', 0.8)
+    
+    stop_cond = config['stop_conditions']
+    stop_on_bloodline = stop_cond['stop_on_bloodline']
+    stop_on_qi = stop_cond['stop_on_qi']
+    target_index = stop_cond['target_bloodline_index']
+    target_qi = stop_cond['target_qi_multi']
+    stop_on_new = stop_cond['stop_on_new']
+    show_success_popup = stop_cond.get('show_success_popup', True)
+
+    stop = False
+    found_index = -1
+    
+    # Bloodline first: it is checked by default and an empty read retries the step
+    if bloodline_norm is not None:
+        rank, score = resolver.resolve(bloodline_norm)
+        if rank != -1 and score >= match_floor:
+            found_index = rank
+            if score < 1.0:
+                logger.info(f"Resolved '{bloodline_val}' to {ranked_list_original[rank]} (similarity {score:.2f}).")
+        else:
+            if bloodline_norm and stop_on_new: 
+                logger.info(f"STOPPING: Found new or unlisted bloodline: '{bloodline_val}'")
+                if show_success_popup:
+                    logger.critical(f"SUCCESS_POPUP: Found New Bloodline: {bloodline_val}")
+                stop = True
+            elif bloodline_norm and not stop_on_new:
+                 logger.warning(f"Found unlisted bloodline: '{bloodline_val}'. 'Stop on New' is OFF. Continuing...")
+            else:
+                logger.warning("Could not read bloodline, will retry.")
+                raise state_machine.StepFailed("Bloodline OCR returned empty or invalid string.")
+
+    if not stop and found_index != -1 and stop_on_bloodline:
+        if found_index <= target_index:
+            target_name = ranked_list_original[target_index]
+            found_name = ranked_list_original[found_index]
+            logger.info(f"STOPPING: Found {found_name} (Rank {found_index}), which is >= target {target_name} (Rank {target_index}).")
+            if show_success_popup:
+                logger.critical(f"SUCCESS_POPUP: Found Bloodline: {found_name} (Rank {found_index})")
+            stop = True
+        else:
+            logger.debug(f"Found {ranked_list_original[found_index]} (Rank {found_index}). Target rank is {target_index}. Continuing...")
+    
+    if not stop and stop_on_qi and qi_val is not None:
+        if qi_val >= target_qi:
+            logger.info(f"STOPPING: Found Qi Multi {qi_val}, which is >= target {target_qi}.")
+            if show_success_popup:
+                logger.critical(f"SUCCESS_POPUP: Found Qi Multi: {qi_val}")
+            stop = True
+        else:
+            logger.debug(f"Found Qi Multi {qi_val}. Target is {target_qi}. Continuing...")
+
+    if not stop:
+        if not stop_on_bloodline and not stop_on_qi:
+            logger.debug("No stop conditions enabled. Proceeding to reincarnate.")
+        else:
+            logger.debug("Conditions not met. Proceeding to reincarnate.")
+    return stop
+
+
+def stats_to_read(config):
+    """
+    Names of the stats the enabled stop conditions need, in evaluation
+    order. Anything else is informational and only logged.
+    """
+    stop_cond = config['stop_conditions']
+    needed = []
+    if stop_cond['stop_on_bloodline'] or stop_cond['stop_on_new']:
+        needed.append('bloodline')
+    if stop_cond['stop_on_qi']:
+        needed.append('qi')
+    return needed
+
+
 def bot_loop(config, stop_event):
     """
     The main logic loop for the bot, designed to run in a separate thread.
     
+    Each reincarnation cycle runs as a state machine
+    (InGame -> StatsPage -> OptionsPage -> ConfirmDialog -> Animation ->
+    Loading -> InGame). A failed step is retried in place after a short
+    delay; only when its retries are exhausted does the bot fall back to
+    its recovery state, and after MAX_CONSECUTIVE_ERRORS such recoveries
+    in a row it halts.
+    
     :param config: Dictionary of settings from the GUI.
     :param stop_event: threading.Event() to signal when to stop.
     """
     logger = logging.getLogger(__name__)
     wait_times = config['wait_times']
     
-    try:
-        qi_region = config['regions']['qi']
-        bloodline_region = config['regions']['bloodline']
-        
-        ranked_list_original = config['ranked_bloodlines']
-        ranked_list_lower = config['ranked_bloodlines_lower']
-        
-        stop_cond = config['stop_conditions']
-        stop_on_bloodline = stop_cond['stop_on_bloodline']
-        stop_on_qi = stop_cond['stop_on_qi']
-        target_index = stop_cond['target_bloodline_index']
-        target_qi = stop_cond['target_qi_multi']
-        stop_on_new = stop_cond['stop_on_new']
-        show_success_popup = stop_cond.get('show_success_popup', True)
-        
-    except KeyError as e:
-        logger.critical(f"Missing key in config: {e}. Halting bot.")
+    missing = [key for key in ('ranked_bloodlines', 'ranked_bloodlines_lower') if key not in config]
+    missing += [f"regions.{key}" for key in ('qi', 'bloodline') if key not in config.get('regions', {})]
+    missing += [f"stop_conditions.{key}" for key in ('stop_on_bloodline', 'stop_on_qi', 'stop_on_new',
+                                                      'target_bloodline_index', 'target_qi_multi')
+                if key not in config.get('stop_conditions', {})]
+    if missing:
+        logger.critical(f"Missing key(s) in config: {', '.join(missing)}. Halting bot.")
         return
+    qi_region = config['regions']['qi']
+    bloodline_region = config['regions']['bloodline']
 
     # --- NEW: Error Circuit Breaker ---
     consecutive_errors = 0
     MAX_CONSECUTIVE_ERRORS = 5
+    step_retries = config.get('step_max_retries', 2)
+
+    # Reads several stat crops at once when more than one needs the OCR engine
+    ocr_workers = config.get('ocr_workers', 2)
+    ocr_pool = ocr_executor.OcrExecutor(ocr_workers) if ocr_workers > 1 else None
 
     try:
         # Use file paths from settings_manager (as strings)
@@ -145,157 +372,223 @@ def bot_loop(config, stop_event):
             
             logger.info("Bot loop started. Press F7 to stop.")
             
-            is_first_loop = True 
+            # Built once; matches misread bloodline names to the ranked list
+            resolver = bloodline_resolver.BloodlineResolver(config['ranked_bloodlines'])
             
-            while not stop_event.is_set():
-                # --- NEW: Flag for successful cycle ---
-                successful_cycle = False
-                try:
-                    if not is_first_loop:
-                        wait_for_game_load(config, stop_event)
-                        if stop_event.is_set(): break
-                    else:
-                        logger.info("First loop, assuming in-game. Skipping load wait.")
-                        is_first_loop = False 
-
-                    # Step 1: Go to Stats page
-                    logger.debug("Navigating to Stats page...")
-                    actions.click_button('stats_button', config, stop_event)
-                    
-                    if responsive_sleep(wait_times['page_load_delay'], stop_event): break
-                    if stop_event.is_set(): break 
+            # Recorded screen signatures (Calibration tab) let steps wait for the screen they lead to
+            screens = screen_classifier.load(config.get('screen_signatures'),
+                                             screen_classifier.rein_probe_points(config['calibrated_points']),
+                                             max_distance=config.get('screen_match_distance', 0.12))
+            if screens is not None:
+                logger.info(f"Verifying navigation with screen signatures: {sorted(screens.signatures)}")
+            
+            read_kwargs = {
+                'use_cache': config.get('ocr_cache_enabled', True),
+                'glyph_min_confidence': config.get('glyph_min_confidence', 0.8),
+                'use_profiles': config.get('ocr_profiles_enabled', True),
+                'min_confidence': config.get('ocr_min_confidence', 60),
+                'rereads': config.get('ocr_rereads', 2),
+                'executor': ocr_pool,
+            }
+            record_crops = config.get('record_ocr_crops', False)
+            
+            def confirm_stat(name, text, read):
+                # Reads that check out, and that a second engine read agrees
+                # with, become glyph templates. Runs on the stat log thread.
+                if name == 'qi' and parse_qi(text) > 0:
+                    vision.confirm_read('qi', text, read, record_crops, read_kwargs['use_profiles'])
+                elif name == 'bloodline' and parse_bloodline(text)[1] in config['ranked_bloodlines_lower']:
+                    vision.confirm_read('bloodline', text, read, record_crops, read_kwargs['use_profiles'])
 
-                    # Step 2: Read QiMulti and Bloodline
-                    logger.debug("Reading stats...")
-                    qi_text = vision.read_stat(qi_region)
-                    bloodline_text = vision.read_stat(bloodline_region)
-                    
-                    qi_val = 0.0
-                    try:
-                        matches = re.findall(r"[\d\.]+", qi_text)
-                        if matches:
-                            num_str = matches[0]
-                            qi_val = float(num_str)
-                            if 'k' in qi_text.lower():
-                                qi_val *= 1000
-                    except Exception as e:
-                        logger.warning(f"Could not parse Qi value from '{qi_text}': {e}")
-                        
-                    bloodline_val = bloodline_text.strip()
-                    if ':' in bloodline_val:
-                        bloodline_val = bloodline_val.split(':')[-1].strip()
-                        
-                    cleaned_val = re.sub(r'[^\w\s-]', '', bloodline_val).strip()
-                    bloodline_norm = cleaned_val.lower()
-                        
-                    logger.info(f"Read: Bloodline='{bloodline_val}', Qi={qi_val} (Raw: '{qi_text}')")
-
-                    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                    qi_log.write(f"{timestamp} - {qi_val} (Raw: {qi_text})\n")
-                    qi_log.flush()
-                    bloodline_log.write(f"{timestamp} - {bloodline_val}\n")
-                    bloodline_log.flush()
-
-                    stop = False
-                    found_index = -1
+            def write_qi(timestamp, qi_text):
+                qi_log.write(f"{timestamp} - {parse_qi(qi_text)} (Raw: {qi_text})\n")
+                qi_log.flush()
+
+            def write_bloodline(timestamp, bloodline_text):
+                bloodline_log.write(f"{timestamp} - {parse_bloodline(bloodline_text)[0]}\n")
+                bloodline_log.flush()
+
+            # History is written (and informational stats are read) off the critical path
+            stat_log = rein_stat_log.StatLogWorker({'qi': write_qi, 'bloodline': write_bloodline},
+                                                   read_kwargs, on_read=confirm_stat)
+            stat_log.start()
+            
+            needed = stats_to_read(config)
+            info_sample_every = max(1, config.get('info_stat_sample_every', 5))
+            logger.info(f"Stats checked every cycle: {needed or 'none'}. "
+                        f"Others are logged every {info_sample_every} cycle(s).")
+            
+            stats_regions = {'qi': qi_region, 'bloodline': bloodline_region}
+            post_regions = {'qi': config['regions'].get('post_qi'), 'bloodline': config['regions'].get('post_bloodline')}
+            read_after_reincarnate = config.get('read_after_reincarnate', False)
+            if read_after_reincarnate and not all(post_regions[name] for name in needed):
+                logger.warning("Post-reincarnation regions are not calibrated. Reading stats from the Stats page.")
+                read_after_reincarnate = False
+            
+            # Stats read for the current cycle (cleared when a new cycle starts)
+            cycle = {'stats': None, 'count': 0}
+
+            def check_stats(regions):
+                """
+                Reads the needed stats from 'regions', logs them and evaluates
+                the stop conditions. Returns True if the bot should stop.
+                """
+                crops = vision.grab_stats(regions)
+                sources = {}
+                texts = vision.read_crops({name: crops[name] for name in needed if name in crops},
+                                          regrab=lambda name: vision.grab_stats({name: regions[name]})[name],
+                                          sources=sources, **read_kwargs)
+                for name in needed:
+                    texts.setdefault(name, "ERROR_BAD_REGION")
+                
+                qi_text = texts.get('qi')
+                bloodline_text = texts.get('bloodline')
+                qi_val = parse_qi(qi_text) if qi_text is not None else None
+                bloodline_val, bloodline_norm = parse_bloodline(bloodline_text) if bloodline_text is not None else (None, None)
                     
-                    try:
-                        found_index = ranked_list_lower.index(bloodline_norm)
-                    except ValueError:
-                        if bloodline_norm and stop_on_new: 
-                            logger.info(f"STOPPING: Found new or unlisted bloodline: '{bloodline_val}'")
-                            if show_success_popup:
-                                logger.critical(f"SUCCESS_POPUP: Found New Bloodline: {bloodline_val}")
-                            stop = True
-                        elif bloodline_norm and not stop_on_new:
-                             logger.warning(f"Found unlisted bloodline: '{bloodline_val}'. 'Stop on New' is OFF. Continuing...")
-                        else:
-                            logger.warning("Could not read bloodline, will retry.")
-                            raise Exception("Bloodline OCR returned empty or invalid string.")
-
-                    if not stop and found_index != -1:
-                        if stop_on_bloodline:
-                            if found_index <= target_index:
-                                target_name = ranked_list_original[target_index]
-                                found_name = ranked_list_original[found_index]
-                                logger.info(f"STOPPING: Found {found_name} (Rank {found_index}), which is >= target {target_name} (Rank {target_index}).")
-                                if show_success_popup:
-                                    logger.critical(f"SUCCESS_POPUP: Found Bloodline: {found_name} (Rank {found_index})")
-                                stop = True
-                            else:
-                                logger.debug(f"Found {ranked_list_original[found_index]} (Rank {found_index}). Target rank is {target_index}. Continuing...")
-                        
-                        if not stop and stop_on_qi:
-                            if qi_val >= target_qi:
-                                logger.info(f"STOPPING: Found Qi Multi {qi_val}, which is >= target {target_qi}.")
-                                if show_success_popup:
-                                    logger.critical(f"SUCCESS_POPUP: Found Qi Multi: {qi_val}")
-                                stop = True
-                            else:
-                                logger.debug(f"Found Qi Multi {qi_val}. Target is {target_qi}. Continuing...")
-
-                    if stop:
-                        break
+                logger.info(f"Read: Bloodline='{bloodline_val}', Qi={qi_val} (Raw: '{qi_text}')")
+
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                for name, text in texts.items():
+                    stat_log.submit_text(name, text, timestamp, sources.get(name))
+                
+                # Informational stats: OCR a sample of them in the background
+                if cycle['count'] % info_sample_every == 0:
+                    for name, crop in crops.items():
+                        if name not in needed:
+                            stat_log.submit_crop(name, crop, timestamp)
+                cycle['count'] += 1
 
-                    if not stop_on_bloodline and not stop_on_qi:
-                        logger.debug("No stop conditions enabled. Proceeding to reincarnate.")
-                    else:
-                        logger.debug("Conditions not met. Proceeding to reincarnate.")
+                stop = evaluate_stop_conditions(config, qi_val, bloodline_val, bloodline_norm, resolver)
+                cycle['stats'] = (qi_val, bloodline_val)
+                return stop
 
-                    # Step 3: Go to Options Page
+            def in_game():
+                if cycle['stats'] is not None:
+                    # Stats were already read right after reincarnating; skip the Stats page
                     logger.debug("Navigating to Options page...")
-                    actions.click_button('options_button', config, stop_event)
-                    if responsive_sleep(wait_times['page_load_delay'], stop_event): break
-
-                    # Step 4: Find and Click Reincarnate Button
-                    logger.debug("Clicking Reincarnate...")
-                    actions.click_button('reincarnate_button', config, stop_event)
-                    if responsive_sleep(wait_times['page_load_delay'], stop_event): break
-
-                    # Step 5: Click Yes
-                    logger.debug("Clicking Yes (Confirm)...")
-                    actions.click_button('yes_confirm_button', config, stop_event)
-                    if responsive_sleep(wait_times['after_click_delay'], stop_event): break
-                    
-                    # Step 6: Click Skip Animation (Optional)
+                    if click_and_wait('options_button', wait_times['page_load_delay'], config, stop_event, screens):
+                        return state_machine.STOP
+                    return state_machine.OPTIONS_PAGE
+                
+                # Step 1: Go to Stats page
+                logger.debug("Navigating to Stats page...")
+                if click_and_wait('stats_button', wait_times['page_load_delay'], config, stop_event, screens):
+                    return state_machine.STOP
+                return state_machine.STATS_PAGE
+
+            def stats_page():
+                # Step 2: Read the stats the stop conditions need (only once per cycle)
+                if cycle['stats'] is None:
+                    logger.debug("Reading stats...")
+                    if check_stats(stats_regions):
+                        return state_machine.STOP
+
+                # Step 3: Go to Options Page
+                logger.debug("Navigating to Options page...")
+                if click_and_wait('options_button', wait_times['page_load_delay'], config, stop_event, screens):
+                    return state_machine.STOP
+                return state_machine.OPTIONS_PAGE
+
+            def options_page():
+                # Step 4: Find and Click Reincarnate Button
+                logger.debug("Clicking Reincarnate...")
+                if click_and_wait('reincarnate_button', wait_times['page_load_delay'], config, stop_event, screens):
+                    return state_machine.STOP
+                return state_machine.CONFIRM_DIALOG
+
+            def confirm_dialog():
+                # Step 5: Click Yes
+                logger.debug("Clicking Yes (Confirm)...")
+                if click_and_wait('yes_confirm_button', wait_times['after_click_delay'], config, stop_event, screens):
+                    return state_machine.STOP
+                return state_machine.ANIMATION
+
+            def animation():
+                # Stats read so far belong to the bloodline being reincarnated away.
+                # Cleared up front so a recovery from here never reuses them.
+                cycle['stats'] = None
+                
+                # Step 6: Click Skip Animation (Optional)
+                if not cycle.get('skipped'):
                     try:
                         logger.debug("Attempting to skip animation...")
-                        actions.click_button('skip_animation_button', config, stop_event, timeout=2.0)
-                        if responsive_sleep(wait_times['after_click_delay'], stop_event): break
+                        if click_and_wait('skip_animation_button', wait_times['after_click_delay'], config, stop_event, screens, timeout=2.0):
+                            return state_machine.STOP
                     except Exception:
                         logger.warning("Could not find 'Skip Animation' button. Continuing...")
+                    cycle['skipped'] = True
 
-                    # Step 7: Click Final Reincarnate
-                    logger.debug("Clicking final Reincarnate...")
-                    actions.click_button('reincarnate_final_button', config, stop_event)
-                    if responsive_sleep(wait_times['after_click_delay'], stop_event): break
-                    
-                    if not stop_event.is_set():
-                        logger.info("Reincarnation finished. Starting next cycle.")
-                    
-                    # --- NEW: Mark cycle as successful ---
-                    successful_cycle = True
+                # Step 7: Click Final Reincarnate
+                logger.debug("Clicking final Reincarnate...")
+                if click_and_wait('reincarnate_final_button', wait_times['after_click_delay'], config, stop_event, screens):
+                    return state_machine.STOP
+                cycle['skipped'] = False
+                logger.info("Reincarnation finished. Starting next cycle.")
+                
+                # Optional: read the new stats on the post-reincarnation screen.
+                # If that fails, the next cycle falls back to the Stats page.
+                if read_after_reincarnate:
+                    try:
+                        if check_stats(post_regions):
+                            return state_machine.STOP
+                    except Exception as e:
+                        cycle['stats'] = None
+                        logger.info(f"Post-reincarnation read failed ({e}). Using the Stats page this cycle.")
+                return state_machine.LOADING
 
-                except Exception as e:
-                    if stop_event.is_set():
-                        logger.info("Error ignored during shutdown.")
+            def loading():
+                wait_for_game_load(config, stop_event, screens)
+                return state_machine.IN_GAME
+
+            states = {
+                state_machine.IN_GAME: {'handler': in_game, 'max_retries': step_retries, 'recovery': state_machine.LOADING},
+                state_machine.STATS_PAGE: {'handler': stats_page, 'max_retries': step_retries, 'recovery': state_machine.IN_GAME},
+                state_machine.OPTIONS_PAGE: {'handler': options_page, 'max_retries': step_retries, 'recovery': state_machine.IN_GAME},
+                state_machine.CONFIRM_DIALOG: {'handler': confirm_dialog, 'max_retries': step_retries, 'recovery': state_machine.IN_GAME},
+                state_machine.ANIMATION: {'handler': animation, 'max_retries': step_retries, 'recovery': state_machine.LOADING},
+                state_machine.LOADING: {'handler': loading, 'max_retries': 0, 'recovery': state_machine.IN_GAME},
+            }
+            
+            logger.info("First loop, assuming in-game. Skipping load wait.")
+            _unconfirmed.clear()
+            machine = state_machine.StateMachine(states, state_machine.IN_GAME, stop_event,
+                                                 retry_delay=config.get('step_retry_delay', 0.25))
+            
+            try:
+                while not stop_event.is_set():
+                    result = machine.step()
+                    if result == state_machine.STOP:
                         break
-                    
-                    # --- NEW: Circuit Breaker Logic ---
-                    if successful_cycle:
-                        consecutive_errors = 0 # Reset on first error after success
-                    
-                    consecutive_errors += 1
-                    logger.error(f"An error occurred in the bot loop: {e}")
-                    
-                    if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
-                        logger.critical(f"STOPPING: Bot failed {consecutive_errors} times in a row. Halting to prevent issues.")
-                        break # Exit the main while loop
-                    else:
-                        logger.info(f"Attempting to recover by waiting 10s (Error {consecutive_errors}/{MAX_CONSECUTIVE_ERRORS})...")
-                        if responsive_sleep(10.0, stop_event): break
+                    if result != 'retry':
+                        # Only a retry of the same step may recheck an unconfirmed click
+                        _unconfirmed.clear()
+                    if result == 'ok' and machine.state == state_machine.IN_GAME:
+                        consecutive_errors = 0
+                    elif result == 'recover':
+                        # Where in the cycle we are is unknown now: read the stats again
+                        # and try Skip Animation again next time
+                        cycle['skipped'] = False
+                        cycle['stats'] = None
+                        # --- Circuit Breaker: only exhausted retries count ---
+                        consecutive_errors += 1
+                        if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                            logger.critical(f"STOPPING: Bot failed {consecutive_errors} times in a row. Halting to prevent issues.")
+                            break
+            finally:
+                stat_log.shutdown()
 
     except Exception as e:
         logger.critical(f"A critical error stopped the bot thread: {e}", exc_info=True)
     finally:
+        ocr_stats = vision.get_ocr_stats()
+        if ocr_stats['engine_reads']:
+            logger.info(f"OCR: {ocr_stats['low_confidence']} of {ocr_stats['engine_reads']} engine reads were low-confidence, "
+                        f"{ocr_stats['recovered']} fixed by {ocr_stats['rereads']} re-reads.")
+        if ocr_pool is not None:
+            ocr_pool.shutdown()
+        if config.get('ocr_cache_enabled', True):
+            cache = ocr_cache.get_cache()
+            cache.log_summary()
+            cache.save()
         logger.info("Bot loop stopped.")
@@ -0,0 +1,142 @@
+import time
+import logging
+import unified_bot.region_watch as region_watch
+
+logger = logging.getLogger(__name__)
+
+# What each reincarnation step waits for after its click: the ROI around a
+# calibrated point, or one of the OCR regions, changing and settling. The
+# final Reincarnate click watches its own button go away, since the loading
+# screen can take longer than the step ceiling to replace the Stats button.
+STEP_READINESS = {
+    'stats_button': ('region', 'bloodline'),
+    'options_button': ('point', 'reincarnate_button'),
+    'reincarnate_button': ('point', 'yes_confirm_button'),
+    'yes_confirm_button': ('point', 'skip_animation_button'),
+    'skip_animation_button': ('point', 'reincarnate_final_button'),
+    'reincarnate_final_button': ('point', 'reincarnate_final_button'),
+}
+
+
+# The screen each step's click should lead to. When a signature for it was
+# recorded (see screen_classifier), the step waits for that screen instead.
+STEP_SCREEN = {
+    'stats_button': 'stats_page',
+    'options_button': 'options_page',
+    'reincarnate_button': 'confirm_dialog',
+}
+
+
+class ScreenIs:
+    """Readiness predicate: True once the screen classifier sees 'screen'."""
+    def __init__(self, screens, screen):
+        self.screens = screens
+        self.screen = screen
+
+    def __call__(self):
+        return self.screens.classify()[0] == self.screen
+
+
+class RoiChange:
+    """
+    Readiness predicate: True once a small screen region differs from the
+    snapshot taken at construction (before the click) and has then held
+    still for 'settle_time' seconds.
+    """
+    def __init__(self, region, settle_time=0.06, change_threshold=10.0, stable_threshold=3.0):
+        self.region = tuple(int(v) for v in region)
+        self.settle_time = settle_time
+        self.change_threshold = change_threshold
+        self.stable_threshold = stable_threshold
+        self.baseline = self._sample()
+        self._settling = None
+        self._settle_start = None
+
+    @classmethod
+    def around_point(cls, point, size=48, **kwargs):
+        """Build the predicate for a 'size' x 'size' box centred on 'point'."""
+        x, y = int(point[0]), int(point[1])
+        return cls((max(0, x - size // 2), max(0, y - size // 2), size, size), **kwargs)
+
+    def arm(self):
+        """Re-take the baseline, e.g. right before the click once the cursor is in place."""
+        self.baseline = self._sample()
+        self._settling = None
+        self._settle_start = None
+
+    def _sample(self):
+        import pyautogui
+        return region_watch.region_signature(pyautogui.screenshot(region=self.region), scale=0.5)
+
+    def __call__(self):
+        current = self._sample()
+        if region_watch.signature_diff(current, self.baseline) < self.change_threshold:
+            self._settling = None
+            return False
+        now = time.time()
+        if self._settling is None or region_watch.signature_diff(current, self._settling) >= self.stable_threshold:
+            self._settling = current
+            self._settle_start = now
+            return False
+        return now - self._settle_start >= self.settle_time
+
+
+def watches_own_point(step_key):
+    """True if the step's ROI is around the button it clicks, where the cursor rests."""
+    return STEP_READINESS.get(step_key) == ('point', step_key)
+
+
+def make_predicate(step_key, config, screens=None):
+    """
+    Build (and arm) the readiness predicate for the step that clicks
+    'step_key'. Must be called before the click so the baseline shows the
+    screen as it was. Returns None if the step has nothing to watch.
+
+    :param screens: Optional screen_classifier.ScreenClassifier; used when
+                    it knows the screen the step leads to.
+    """
+    screen = STEP_SCREEN.get(step_key)
+    if screens is not None and screens.knows(screen):
+        return ScreenIs(screens, screen)
+    spec = STEP_READINESS.get(step_key)
+    if spec is None:
+        return None
+    kind, target = spec
+    kwargs = {'settle_time': config.get('readiness_settle_time', 0.06)}
+    try:
+        if kind == 'region':
+            region = config['regions'].get(target)
+            return RoiChange(region, **kwargs) if region else None
+        point = config['calibrated_points'].get(target)
+        if not point:
+            return None
+        return RoiChange.around_point(point, config.get('readiness_roi_size', 48), **kwargs)
+    except Exception as e:
+        logger.debug(f"Could not arm readiness check for '{step_key}': {e}")
+        return None
+
+
+def wait_until_ready(predicate, ceiling, stop_event, poll_interval=0.02):
+    """
+    Polls 'predicate' until it returns True, with 'ceiling' seconds (the old
+    fixed delay) as the upper bound. A None predicate just waits the ceiling.
+
+    :return: (status, seconds_waited), status is 'ready', 'timeout' (the
+             predicate never held), 'elapsed' (there was no predicate, or it
+             broke and the ceiling was simply waited) or 'stopped'.
+    """
+    start = time.time()
+    deadline = start + ceiling
+    while not stop_event.is_set():
+        if predicate is not None:
+            try:
+                if predicate():
+                    return 'ready', time.time() - start
+            except Exception as e:
+                logger.debug(f"Readiness check failed, falling back to the fixed delay: {e}")
+                predicate = None
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return ('timeout' if predicate is not None else 'elapsed'), time.time() - start
+        time.sleep(min(poll_interval, remaining))
+    return 'stopped', time.time() - start
@@ -0,0 +1,62 @@
+import time
+import queue
+import logging
+import threading
+import unified_bot.rein_vision as vision
+
+logger = logging.getLogger(__name__)
+
+
+class StatLogWorker(threading.Thread):
+    """
+    Writes stat history off the reincarnation loop's critical path, and
+    OCRs informational stats (ones no stop condition needs) from crops
+    captured by the loop.
+
+    :param writers: Dict of stat name -> callable(timestamp, text) that logs it.
+    :param read_kwargs: Options passed to rein_vision.read_crops.
+    :param on_read: Optional callable(name, text, read) run for every read
+                    with a rein_vision.read_crops 'sources' entry: crops
+                    this worker OCRs, and texts submitted with one.
+    """
+    def __init__(self, writers, read_kwargs=None, on_read=None):
+        super().__init__(name="StatLogThread", daemon=True)
+        self.writers = writers
+        self.read_kwargs = read_kwargs or {}
+        self.on_read = on_read
+        self.items = queue.Queue()
+        self._shutdown = threading.Event()
+
+    def submit_text(self, name, text, timestamp=None, read=None):
+        """Log a stat that was already read ('read' is its read_crops 'sources' entry, if any)."""
+        self.items.put((timestamp or time.strftime("%Y-%m-%d %H:%M:%S"), name, text, None, read))
+
+    def submit_crop(self, name, crop, timestamp=None):
+        """OCR 'crop' in the background, then log it."""
+        self.items.put((timestamp or time.strftime("%Y-%m-%d %H:%M:%S"), name, None, crop, None))
+
+    def shutdown(self, timeout=5.0):
+        """Finish the queued items (up to 'timeout' seconds), then stop."""
+        self._shutdown.set()
+        self.join(timeout=timeout)
+
+    def run(self):
+        while True:
+            try:
+                timestamp, name, text, crop, read = self.items.get(timeout=0.1)
+            except queue.Empty:
+                if self._shutdown.is_set():
+                    return
+                continue
+            try:
+                if crop is not None:
+                    sources = {}
+                    text = vision.read_crops({name: crop}, sources=sources, **self.read_kwargs).get(name, "ERROR")
+                    read = sources.get(name)
+                writer = self.writers.get(name)
+                if writer is not None:
+                    writer(timestamp, text)
+                if self.on_read is not None and read is not None:
+                    self.on_read(name, text, read)
+            except Exception as e:
+                logger.error(f"Could not log stat '{name}': {e}")
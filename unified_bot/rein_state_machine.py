@@ -0,0 +1,106 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# --- Reincarnation cycle states ---
+IN_GAME = 'InGame'
+STATS_PAGE = 'StatsPage'
+OPTIONS_PAGE = 'OptionsPage'
+CONFIRM_DIALOG = 'ConfirmDialog'
+ANIMATION = 'Animation'
+LOADING = 'Loading'
+
+# Returned by handlers to end the machine
+STOP = 'Stop'
+
+
+class StepFailed(Exception):
+    """Raised by a state handler when its step failed and may be retried."""
+    pass
+
+
+class StateTimings:
+    """
+    Records how long each state took and logs per-state averages every
+    'log_every' completed cycles.
+    """
+    def __init__(self, log_every=10):
+        self.log_every = log_every
+        self.totals = {}
+        self.counts = {}
+        self.cycles = 0
+        self.cycle_start = time.time()
+
+    def record(self, state, seconds):
+        self.totals[state] = self.totals.get(state, 0.0) + seconds
+        self.counts[state] = self.counts.get(state, 0) + 1
+
+    def cycle_done(self):
+        """Mark the end of a full cycle; returns its duration in seconds."""
+        now = time.time()
+        duration = now - self.cycle_start
+        self.cycle_start = now
+        self.cycles += 1
+        if self.cycles % self.log_every == 0:
+            averages = ", ".join(f"{state}={self.totals[state] / self.counts[state]:.2f}s"
+                                 for state in self.totals)
+            logger.info(f"Average state times over {self.cycles} cycles: {averages}")
+        return duration
+
+
+class StateMachine:
+    """
+    Runs a cycle of states. Each state is a dict with:
+
+    - 'handler': callable() performing the state's action; returns the next
+      state name (or STOP) and raises StepFailed (or any Exception) on failure.
+    - 'max_retries': how often a failed handler is retried in place.
+    - 'recovery': state to jump to once retries are exhausted.
+
+    Only the failed state is retried, after 'retry_delay' seconds.
+    """
+    def __init__(self, states, start_state, stop_event, retry_delay=0.25, cycle_state=None):
+        self.states = states
+        self.state = start_state
+        self.stop_event = stop_event
+        self.retry_delay = retry_delay
+        self.cycle_state = cycle_state or start_state
+        self.timings = StateTimings()
+        self.attempts = 0
+
+    def step(self):
+        """
+        Run the current state's handler once.
+
+        :return: 'ok' on a transition, 'retry' after a failed attempt that
+                 will be retried, 'recover' when retries were exhausted and the
+                 machine moved to the recovery state, or STOP.
+        """
+        spec = self.states[self.state]
+        started = time.time()
+        try:
+            next_state = spec['handler']()
+        except Exception as e:
+            if self.stop_event.is_set():
+                return STOP
+            self.attempts += 1
+            if self.attempts <= spec.get('max_retries', 2):
+                logger.warning(f"{self.state} step failed ({e}). Retrying ({self.attempts}/{spec.get('max_retries', 2)})...")
+                time.sleep(self.retry_delay)
+                return 'retry'
+            logger.error(f"{self.state} step failed {self.attempts} times: {e}. Recovering via {spec['recovery']}.")
+            self.attempts = 0
+            self.state = spec['recovery']
+            return 'recover'
+
+        self.timings.record(self.state, time.time() - started)
+        self.attempts = 0
+        if next_state == STOP or self.stop_event.is_set():
+            return STOP
+        logger.debug(f"State {self.state} -> {next_state} ({time.time() - started:.2f}s)")
+        if next_state == self.cycle_state:
+            duration = self.timings.cycle_done()
+            logger.debug(f"Cycle completed in {duration:.2f}s")
+        self.state = next_state
+        return 'ok'
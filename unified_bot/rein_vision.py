@@ -1,35 +1,18 @@
-import pyautogui
-import pytesseract
 import logging
 import os
 import sys
 import time
+import threading
 from PIL import Image, ImageGrab # <-- ImageGrab is new
 import cv2                     # <-- NEW
 import numpy as np             # <-- NEW
+import unified_bot.ocr_engine as ocr_engine
+import unified_bot.ocr_cache as ocr_cache
+import unified_bot.glyph_recognizer as glyph_recognizer
+import unified_bot.ocr_profiles as ocr_profiles
 
 logger = logging.getLogger(__name__)
 
-# --- Tesseract Path (for PyInstaller) ---
-# This attempts to set the Tesseract command path.
-# This is a fallback. The Inno Setup installer should add it to the system PATH.
-if getattr(sys, 'frozen', False):
-    # If running in a PyInstaller bundle
-    bundle_dir = sys._MEIPASS
-    # Look for tesseract in a bundled path (if you chose to bundle it, which we didn't)
-    # or assume it's in the default Inno Setup install path.
-    tesseract_path = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-    if os.path.exists(tesseract_path):
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-    else:
-        logger.warning("Tesseract not found at default install path. Assuming it's in system PATH.")
-else:
-    # If running as a normal script, check local dev path
-    try:
-        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-    except Exception:
-        logger.warning("Could not set Tesseract path. Assuming it's in system PATH.")
-
 def get_image_path(image_name, config):
     """
     Gets the full, absolute path to an image file.
@@ -63,6 +46,7 @@ def find_button(image_name, config, timeout=None):
     :return: A pyautogui.Point(x, y) of the button's center.
     :raises: Exception if the button is not found within the timeout.
     """
+    import pyautogui
     if timeout is None:
         timeout = config['wait_times']['button_timeout']
         
@@ -130,38 +114,246 @@ def find_button(image_name, config, timeout=None):
             
         time.sleep(0.2) # Wait a moment before retrying
 
-def read_stat(region_rect):
+def _clean_text(raw_text):
+    """Collapse OCR output to a single stripped line."""
+    return raw_text.strip().replace('\n', ' ').strip() if raw_text else ""
+
+def _union_region(regions):
+    """Smallest [x, y, width, height] containing every region."""
+    left = min(r[0] for r in regions)
+    top = min(r[1] for r in regions)
+    right = max(r[0] + r[2] for r in regions)
+    bottom = max(r[1] + r[3] for r in regions)
+    return [left, top, right - left, bottom - top]
+
+# Values read_stat / read_crops return instead of text when nothing was read
+OCR_FAILURES = ("UNKNOWN", "ERROR", "ERROR_BAD_REGION")
+
+def grab_stats(regions):
     """
-    Reads text from a specific screen region using Pytesseract.
+    Captures several screen regions with one screenshot.
     
-    :param region_rect: A tuple [x, y, width, height]
-    :return: The raw, cleaned text found in the region.
+    :param regions: A dict of name -> [x, y, width, height]
+    :return: A dict of name -> PIL crop. Invalid regions are logged and left out.
     """
-    if not region_rect or len(region_rect) != 4:
-        logger.error(f"Invalid OCR region provided: {region_rect}")
-        return "ERROR_BAD_REGION"
+    valid = {}
+    for name, region_rect in regions.items():
+        if not region_rect or len(region_rect) != 4:
+            logger.error(f"Invalid OCR region provided: {region_rect}")
+        else:
+            valid[name] = [int(v) for v in region_rect]
+    if not valid:
+        return {}
         
-    try:
-        # 1. Take screenshot of the specified region
-        img = pyautogui.screenshot(region=region_rect)
+    import pyautogui
+    union = _union_region(list(valid.values()))
+    screen = pyautogui.screenshot(region=union)
+    crops = {}
+    for name, (x, y, w, h) in valid.items():
+        left, top = x - union[0], y - union[1]
+        crops[name] = screen.crop((left, top, left + w, top + h))
+    return crops
+
+# Counters for tracking how often OCR was unsure (see get_ocr_stats). The
+# bot thread and the stat log thread both read, so updates take the lock.
+_ocr_stats = {'engine_reads': 0, 'low_confidence': 0, 'rereads': 0, 'recovered': 0}
+_ocr_stats_lock = threading.Lock()
+
+def _count(key):
+    with _ocr_stats_lock:
+        _ocr_stats[key] += 1
+
+def get_ocr_stats():
+    """
+    Returns a copy of the OCR counters: 'engine_reads', 'low_confidence'
+    (engine reads below the confidence floor), 'rereads' (extra reads spent
+    on them) and 'recovered' (low-confidence reads fixed by a re-read).
+    """
+    with _ocr_stats_lock:
+        return dict(_ocr_stats)
+
+def _reread(name, crop, best_text, best_conf, regrab, use_profiles, min_confidence, attempts):
+    """
+    Re-reads one low-confidence region. Each attempt re-grabs it (if
+    'regrab' is given) and alternates between the region's profile and its
+    alternate profile. Returns the best (text, confidence, crop, alternate)
+    seen, 'alternate' being whether the alternate profile read it.
+    """
+    best_crop, best_alternate = crop, False
+    for attempt in range(attempts):
+        _count('rereads')
+        if regrab is not None:
+            try:
+                crop = regrab(name)
+            except Exception as e:
+                logger.debug(f"Could not re-grab '{name}': {e}")
+        # Re-reading the same pixels with the same profile would give the same answer
+        alternate = regrab is None or attempt % 2 == 1
+        profile = ocr_profiles.get_profile(name, use_profiles, alternate=alternate)
+        raw_text, confs = ocr_engine.read_images([ocr_profiles.preprocess(crop, profile)],
+                                                 [ocr_profiles.tesseract_options(profile)],
+                                                 with_confidence=True)[0]
+        text = _clean_text(raw_text)
+        conf = min(confs) if confs else 0.0
+        if text and (not best_text or conf > best_conf):
+            best_text, best_conf, best_crop, best_alternate = text, conf, crop, alternate
+        if best_text and best_conf >= min_confidence:
+            _count('recovered')
+            break
+    return best_text, best_conf, best_crop, best_alternate
+
+def read_crops(crops, use_cache=True, glyph_min_confidence=None, use_profiles=True,
+               min_confidence=None, rereads=2, regrab=None, executor=None, sources=None):
+    """
+    Reads text from already captured crops with at most one request to the
+    shared OCR engine (see ocr_engine).
+    
+    Crops whose binarized text was read before are answered from the
+    OCR cache (see ocr_cache) and skip the engine entirely. If
+    'glyph_min_confidence' is set, the glyph templates (see
+    glyph_recognizer) are tried next and the engine is only used when a
+    character falls below that confidence.
+    
+    :param crops: A dict of name -> PIL crop (see grab_stats)
+    :param use_cache: Look up and store results in the OCR cache.
+    :param glyph_min_confidence: Minimum per-character confidence (0-1) for
+                                 a glyph read, or None to skip the recognizer.
+    :param use_profiles: Preprocess crops with the OCR profile named after
+                         their region (e.g. 'qi', 'bloodline').
+    :param min_confidence: Lowest acceptable word confidence (0-100) for an
+                           engine read. Empty or less confident reads are
+                           re-read up to 'rereads' times; None disables this.
+    :param regrab: Optional callable(name) -> fresh crop used by re-reads.
+    :param executor: Optional ocr_executor.OcrExecutor to read the crops
+                     concurrently instead of in one request.
+    :param sources: Optional dict, filled with name -> (crop, source,
+                    alternate) for every read: where the text came from
+                    ('cache', 'glyph' or 'engine') and whether the alternate
+                    profile read it. Pass an entry to confirm_read.
+    :return: A dict of name -> raw, cleaned text ("UNKNOWN" if empty).
+    """
+    results = {}
+    
+    # 1. Answer what we can from the cache
+    keys = {}
+    if use_cache:
+        cache = ocr_cache.get_cache()
+        for name, crop in crops.items():
+            keys[name] = ocr_cache.crop_key(crop)
+            cached = cache.get(keys[name])
+            if cached is not None:
+                results[name] = cached
+                if sources is not None:
+                    sources[name] = (crop, 'cache', False)
+    misses = [name for name in crops if name not in results]
+    
+    # 2. Try the glyph templates, accepting only confident reads. These are
+    #    not cached: a template learned from a bad read must not outlive it.
+    if glyph_min_confidence is not None and misses:
+        recognizer = glyph_recognizer.get_recognizer()
+        for name in misses:
+            text, confidences = recognizer.recognize(crops[name])
+            if text and min(confidences) >= glyph_min_confidence:
+                logger.debug(f"Glyph read '{text}' for '{name}' (min confidence {min(confidences):.2f})")
+                results[name] = text
+                if sources is not None:
+                    sources[name] = (crops[name], 'glyph', False)
+        misses = [name for name in misses if name not in results]
+    
+    # 3. Read the remaining crops in a single OCR request (or concurrently),
+    #    each cleaned up and configured by its region's profile (see ocr_profiles)
+    texts = []
+    if misses:
+        profiles = [ocr_profiles.get_profile(name, use_profiles) for name in misses]
+        texts = ocr_engine.read_images(
+            [ocr_profiles.preprocess(crops[name], profile) for name, profile in zip(misses, profiles)],
+            [ocr_profiles.tesseract_options(profile) for profile in profiles],
+            with_confidence=True, executor=executor)
+    
+    for name, (raw_text, confs) in zip(misses, texts):
+        _count('engine_reads')
+        cleaned_text = _clean_text(raw_text)
+        crop = crops[name]
+        alternate = False
         
-        # 2. Use Pytesseract to read the text
-        #    --psm 6: Assume a single uniform block of text.
-        #    --oem 3: Default, based on what's available.
-        custom_config = r'--oem 3 --psm 6'
-        raw_text = pytesseract.image_to_string(img, config=custom_config)
+        # 4. Re-read just this region if tesseract was unsure
+        if min_confidence is not None:
+            conf = min(confs) if confs else 0.0
+            if not cleaned_text or conf < min_confidence:
+                _count('low_confidence')
+                logger.debug(f"Low OCR confidence for '{name}': '{cleaned_text}' ({conf:.0f}). Re-reading...")
+                cleaned_text, conf, crop, alternate = _reread(name, crop, cleaned_text, conf, regrab,
+                                                              use_profiles, min_confidence, rereads)
+            if conf < min_confidence:
+                logger.warning(f"OCR of '{name}' stayed below confidence {min_confidence}: '{cleaned_text}' ({conf:.0f})")
         
-        if raw_text:
-            cleaned_text = raw_text.strip().replace('\n', ' ').strip()
-            return cleaned_text
+        if sources is not None:
+            sources[name] = (crop, 'engine', alternate)
+        if cleaned_text:
+            results[name] = cleaned_text
+            # Only confident reads are worth remembering
+            if use_cache and (min_confidence is None or conf >= min_confidence):
+                cache.put(keys[name] if crop is crops[name] else ocr_cache.crop_key(crop), cleaned_text)
         else:
-            logger.warning(f"Tesseract read no text in region {region_rect}")
-            return "UNKNOWN"
-            
-    except pytesseract.TesseractNotFoundError:
-        logger.critical("TESSERACT NOT FOUND. Make sure it is installed and in your system's PATH.")
-        raise
+            logger.warning(f"Tesseract read no text in region '{name}'")
+            results[name] = "UNKNOWN"
+    return results
+
+def read_stats(regions, **read_kwargs):
+    """
+    Reads text from several screen regions with one screenshot and one
+    OCR request (see grab_stats and read_crops for the options).
+    
+    :param regions: A dict of name -> [x, y, width, height]
+    :return: A dict of name -> raw, cleaned text, using the same
+             "UNKNOWN" / "ERROR" / "ERROR_BAD_REGION" values as read_stat.
+    """
+    results = {name: "ERROR_BAD_REGION" for name, region_rect in regions.items()
+               if not region_rect or len(region_rect) != 4}
+    try:
+        crops = grab_stats(regions)
+        results.update(read_crops(crops, **read_kwargs))
     except Exception as e:
-        logger.error(f"Error during OCR read in region {region_rect}: {e}")
-        return "ERROR"
+        if ocr_engine.tesseract_missing(e):
+            logger.critical("TESSERACT NOT FOUND. Make sure it is installed and in your system's PATH.")
+            raise
+        logger.error(f"Error during OCR read in regions {list(regions.values())}: {e}")
+        for name in regions:
+            results.setdefault(name, "ERROR")
+    return results
+
+def confirm_read(name, text, read, record=False, use_profiles=True):
+    """
+    Teaches the glyphs of an engine read of region 'name' to the glyph
+    recognizer, but only if a second engine read of the same crop with the
+    other profile agrees on 'text'. Reads that came from the recognizer or
+    the cache are not re-learned.
+    
+    :param read: The (crop, source, alternate) entry read_crops put in 'sources'.
+    :param record: Also save the crop and text for ocr_profiles.benchmark().
+    :return: True if the glyphs were learned.
+    """
+    crop, source, alternate = read or (None, None, False)
+    if source != 'engine':
+        return False
+    profile = ocr_profiles.get_profile(name, use_profiles, alternate=not alternate)
+    second = _clean_text(ocr_engine.read_images([ocr_profiles.preprocess(crop, profile)],
+                                                [ocr_profiles.tesseract_options(profile)])[0])
+    if second != text:
+        logger.debug(f"Not learning glyphs of '{text}' for '{name}': a second read gave '{second}'")
+        return False
+    if record:
+        ocr_profiles.record_crop(crop, name, text)
+    recognizer = glyph_recognizer.get_recognizer()
+    if recognizer.learn(crop, text):
+        recognizer.save()
+    return True
 
+def read_stat(region_rect):
+    """
+    Reads text from a specific screen region using the shared OCR engine.
+    
+    :param region_rect: A tuple [x, y, width, height]
+    :return: The raw, cleaned text found in the region.
+    """
+    return read_stats({'stat': region_rect})['stat']
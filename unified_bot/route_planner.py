@@ -0,0 +1,108 @@
+import time
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def plan_click_route(start_pos, points, end_pos=None, time_budget=0.005):
+    """
+    Plans the order in which to click a set of points.
+
+    The pairwise distance matrix is built once with NumPy, the route is
+    seeded with nearest-neighbour from 'start_pos' and then refined with
+    2-opt until no improving move is left or 'time_budget' seconds run out.
+    If 'end_pos' is given, the route is optimised to finish close to it
+    (e.g. the arrow that will be clicked next).
+
+    :param start_pos: (x, y) of the real cursor position.
+    :param points: Sequence of (x, y) positions to visit.
+    :param end_pos: Optional (x, y) the route should end near.
+    :param time_budget: Max seconds to spend on 2-opt refinement.
+    :return: List of indices into 'points' in click order.
+    """
+    n = len(points)
+    if n <= 1:
+        return list(range(n))
+
+    pts = np.asarray(points, dtype=np.float64).reshape(n, 2)
+    start = np.asarray(start_pos, dtype=np.float64)
+
+    diff = pts[:, None, :] - pts[None, :, :]
+    dist = np.sqrt((diff ** 2).sum(axis=2))
+    start_dist = np.sqrt(((pts - start) ** 2).sum(axis=1))
+    end_dist = None
+    if end_pos is not None:
+        end_dist = np.sqrt(((pts - np.asarray(end_pos, dtype=np.float64)) ** 2).sum(axis=1))
+
+    # --- Nearest-neighbour seed ---
+    visited = np.zeros(n, dtype=bool)
+    order = np.empty(n, dtype=np.int64)
+    current = int(np.argmin(start_dist))
+    for i in range(n):
+        order[i] = current
+        visited[current] = True
+        if i == n - 1:
+            break
+        row = np.where(visited, np.inf, dist[current])
+        current = int(np.argmin(row))
+
+    if n < 3 and end_dist is None:
+        return order.tolist()
+
+    # --- 2-opt refinement of an open path ---
+    # Reversing order[i..j] only changes the edge into order[i] and the edge
+    # out of order[j]. The edge into the first point comes from the cursor
+    # and the edge out of the last point goes to 'end_pos' (or nowhere).
+    deadline = time.perf_counter() + time_budget
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(n - 1):
+            prev_dist = start_dist if i == 0 else dist[order[i - 1]]
+            a = order[i]
+            j = np.arange(i + 1, n)
+            b = order[j]
+            before = prev_dist[a] + _tail_dist(order, j, n, dist, end_dist)
+            after = prev_dist[b] + _tail_dist_swapped(order, a, j, n, dist, end_dist)
+            gain = before - after
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-9:
+                k = i + 1 + best
+                order[i:k + 1] = order[i:k + 1][::-1]
+                improved = True
+            if time.perf_counter() >= deadline:
+                break
+
+    return order.tolist()
+
+
+def _tail_dist(order, j, n, dist, end_dist):
+    """Length of the edges leaving order[j] in the current route."""
+    out = np.zeros(len(j))
+    inner = j < n - 1
+    out[inner] = dist[order[j[inner]], order[j[inner] + 1]]
+    if end_dist is not None:
+        out[~inner] = end_dist[order[j[~inner]]]
+    return out
+
+
+def _tail_dist_swapped(order, a, j, n, dist, end_dist):
+    """Length of the edges leaving the segment once order[i..j] is reversed (it then ends at 'a')."""
+    out = np.zeros(len(j))
+    inner = j < n - 1
+    out[inner] = dist[a, order[j[inner] + 1]]
+    if end_dist is not None:
+        out[~inner] = end_dist[a]
+    return out
+
+
+def route_travel(start_pos, points, order, end_pos=None):
+    """Total mouse travel (px) for visiting 'points' in 'order'."""
+    if not order:
+        return 0.0
+    pts = np.asarray(points, dtype=np.float64)[order]
+    path = np.vstack([np.asarray(start_pos, dtype=np.float64), pts])
+    if end_pos is not None:
+        path = np.vstack([path, np.asarray(end_pos, dtype=np.float64)])
+    return float(np.sqrt((np.diff(path, axis=0) ** 2).sum(axis=1)).sum())
@@ -0,0 +1,238 @@
+import sys
+import time
+import logging
+import threading
+import numpy as np
+import cv2
+
+# Optional: mss copies just the requested rectangle off the screen. Pillow's
+# grab (behind pyautogui.screenshot) on Windows captures the whole screen
+# and crops it, whatever the region.
+try:
+    import mss
+except ImportError:
+    mss = None
+
+logger = logging.getLogger(__name__)
+
+_mss_local = threading.local()
+
+# Screens of the reincarnation cycle a signature can be recorded for
+REIN_SCREENS = ('in_game', 'stats_page', 'options_page', 'confirm_dialog', 'loading')
+
+# Half-size of the patch averaged around each probe point for its color,
+# and of the patch grabbed around it
+PROBE_RADIUS = 2
+PATCH_RADIUS = 8
+
+
+def patch_region(point, radius=PATCH_RADIUS):
+    """The (x, y, w, h) patch grabbed around the absolute screen point 'point'."""
+    x, y = int(point[0]), int(point[1])
+    left, top = max(0, x - radius), max(0, y - radius)
+    return (left, top, x + radius + 1 - left, y + radius + 1 - top)
+
+
+def _capture(region):
+    """One capture of 'region' (x, y, w, h) as an RGB array, with mss if it is installed."""
+    left, top, width, height = region
+    if mss is not None:
+        sct = getattr(_mss_local, 'sct', None)
+        if sct is None:
+            # mss instances must not be shared between threads
+            sct = _mss_local.sct = mss.mss()
+        shot = sct.grab({'left': left, 'top': top, 'width': width, 'height': height})
+        return np.asarray(shot)[:, :, 2::-1]
+    import pyautogui
+    return np.asarray(pyautogui.screenshot(region=region).convert('RGB'))
+
+
+class ScreenClassifier:
+    """
+    Tells which known screen is showing from small patches around a few
+    probe points, cut from one capture.
+
+    A screen's signature is the mean color at the center of each probe's
+    patch plus an average hash of every patch; the current frame is
+    matched to the nearest recorded signature.
+
+    :param points: Absolute (x, y) probe points; the patches around them
+                   are cut from one capture per classification.
+    :param signatures: Dict of screen name -> signature (see to_dict).
+    :param max_distance: Largest distance (0-1) still accepted as a match.
+    :param hash_size: Side of the average hash taken of each patch.
+    """
+    def __init__(self, points, signatures=None, max_distance=0.12, hash_size=4):
+        self.points = [(int(x), int(y)) for x, y in points]
+        self.patches = [patch_region(point) for point in self.points]
+        self.bounds = None
+        if self.patches:
+            left = min(p[0] for p in self.patches)
+            top = min(p[1] for p in self.patches)
+            right = max(p[0] + p[2] for p in self.patches)
+            bottom = max(p[1] + p[3] for p in self.patches)
+            self.bounds = (left, top, right - left, bottom - top)
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self.signatures = {}
+        for name, sig in (signatures or {}).items():
+            self.signatures[name] = {
+                'colors': np.array(sig['colors'], dtype=np.float32).reshape(-1, 3),
+                'hash': np.array(sig['hash'], dtype=bool),
+            }
+
+    def grab(self):
+        """One capture of the box around all probes, cut into the probe patches."""
+        if self.bounds is None:
+            return []
+        frame = _capture(self.bounds)
+        left, top = self.bounds[0], self.bounds[1]
+        return [frame[y - top:y - top + h, x - left:x - left + w] for x, y, w, h in self.patches]
+
+    def signature(self, patches):
+        """Probe colors and average hash of the grabbed patches (see grab)."""
+        colors = np.zeros((len(self.points), 3), dtype=np.float32)
+        bits = []
+        for i, (image, (px, py), (left, top, _, _)) in enumerate(zip(patches, self.points, self.patches)):
+            if hasattr(image, 'mode') and image.mode != 'RGB':
+                image = image.convert('RGB')
+            rgb = np.asarray(image)
+            # The probe is the patch center unless the patch was clipped at the screen edge
+            x, y = px - left, py - top
+            center = rgb[max(0, y - PROBE_RADIUS):y + PROBE_RADIUS + 1,
+                         max(0, x - PROBE_RADIUS):x + PROBE_RADIUS + 1]
+            if center.size:
+                colors[i] = center.reshape(-1, 3).mean(axis=0)
+            gray = cv2.cvtColor(np.ascontiguousarray(rgb), cv2.COLOR_RGB2GRAY)
+            small = cv2.resize(gray, (self.hash_size, self.hash_size), interpolation=cv2.INTER_AREA)
+            bits.append((small > small.mean()).flatten())
+        return {'colors': colors, 'hash': np.concatenate(bits) if bits else np.zeros(0, dtype=bool)}
+
+    def distance(self, sig_a, sig_b):
+        """0 (identical) to 1: probe color difference and hash distance, equally weighted."""
+        if sig_a['colors'].shape != sig_b['colors'].shape or sig_a['hash'].shape != sig_b['hash'].shape:
+            return 1.0
+        if not sig_a['hash'].size:
+            return 0.0
+        hash_dist = float(np.count_nonzero(sig_a['hash'] != sig_b['hash'])) / sig_a['hash'].size
+        if not len(sig_a['colors']):
+            return hash_dist
+        color_dist = float(np.abs(sig_a['colors'] - sig_b['colors']).mean()) / 255.0
+        return 0.5 * color_dist + 0.5 * hash_dist
+
+    def record(self, name, patches=None):
+        """Store the signature of the screen currently showing (or of 'patches') as 'name'."""
+        self.signatures[name] = self.signature(patches if patches is not None else self.grab())
+        logger.info(f"Recorded screen signature '{name}'")
+
+    def classify(self, patches=None):
+        """
+        :return: (screen name, distance), name is None if no recorded
+                 screen is within max_distance.
+        """
+        if not self.signatures:
+            return None, 1.0
+        current = self.signature(patches if patches is not None else self.grab())
+        best_name, best_dist = None, 1.0
+        for name, sig in self.signatures.items():
+            dist = self.distance(current, sig)
+            if dist < best_dist:
+                best_name, best_dist = name, dist
+        if best_dist > self.max_distance:
+            return None, best_dist
+        return best_name, best_dist
+
+    def knows(self, name):
+        return name in self.signatures
+
+    def wait_for(self, names, timeout, stop_event, poll_interval=0.05):
+        """
+        Polls until one of 'names' is showing or 'timeout' seconds pass.
+
+        :return: The screen seen, or None on timeout or stop.
+        """
+        deadline = time.time() + timeout
+        while not stop_event.is_set():
+            screen, _ = self.classify()
+            if screen in names:
+                return screen
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            time.sleep(min(poll_interval, remaining))
+        return None
+
+    def to_dict(self):
+        return {
+            'points': [list(p) for p in self.points],
+            'signatures': {name: {'colors': sig['colors'].round(1).tolist(), 'hash': sig['hash'].astype(int).tolist()}
+                           for name, sig in self.signatures.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        return cls(data['points'], data.get('signatures', {}), **kwargs)
+
+
+def for_points(points, signatures=None, **kwargs):
+    """A classifier probing 'points' (absolute screen coordinates)."""
+    return ScreenClassifier(points, signatures, **kwargs)
+
+
+def benchmark(points=None, runs=50):
+    """
+    Times classification on the live screen, grab included, against the
+    signature of the first frame.
+
+    :param points: Probe points (defaults to six spread over a 1080p screen).
+    :return: {'grab_ms': ms per grab, 'classify_ms': ms per grab + classify}
+    """
+    points = points or [(160, 140), (960, 140), (1760, 140), (160, 940), (960, 940), (1760, 940)]
+    classifier = ScreenClassifier(points)
+    classifier.record('benchmark')
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        classifier.grab()
+    grab_ms = (time.perf_counter() - start) * 1000.0 / runs
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        classifier.classify()
+    classify_ms = (time.perf_counter() - start) * 1000.0 / runs
+
+    logger.info(f"Screen classifier ({'mss' if mss is not None else 'pyautogui'}, {len(points)} probes): "
+                f"{grab_ms:.2f} ms per grab, {classify_ms:.2f} ms per classify including the grab")
+    return {'grab_ms': grab_ms, 'classify_ms': classify_ms}
+
+
+def rein_probe_points(calibrated_points):
+    """The reincarnation bot's probes: its calibrated click points, in a fixed order."""
+    return [calibrated_points[key] for key in sorted(calibrated_points)]
+
+
+def load(data, points=None, **kwargs):
+    """
+    Rebuild a saved classifier. Returns None if 'data' is empty, has no
+    recorded screens, cannot be read, or (when 'points' is given) was
+    recorded with different probe points.
+    """
+    if not data or not data.get('signatures'):
+        return None
+    if 'points' not in data:
+        logger.warning("Screen signatures were recorded from one large grab. Re-record them to use them.")
+        return None
+    try:
+        classifier = ScreenClassifier.from_dict(data, **kwargs)
+    except Exception as e:
+        logger.warning(f"Could not load screen signatures: {e}")
+        return None
+    if points is not None and [(int(x), int(y)) for x, y in points] != classifier.points:
+        logger.warning("Click positions changed since the screen signatures were recorded. Re-record them to use them.")
+        return None
+    return classifier
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    benchmark(runs=int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -17,6 +17,12 @@ try:
     QI_HISTORY_FILE = LOG_DIR / "qi_rates.log"
     BLOODLINE_HISTORY_FILE = LOG_DIR / "bloodlines.log"
     FORAGE_HISTORY_FILE = LOG_DIR / "forage_history.log"
+    
+    # Cache Files
+    OCR_CACHE_FILE = LOG_DIR / "ocr_cache.json"
+    GLYPH_TEMPLATES_FILE = LOG_DIR / "glyph_templates.npz"
+    OCR_CROPS_DIR = LOG_DIR / "ocr_crops"
+    SPAWN_MAP_FILE = LOG_DIR / "forage_spawn_map.json"
 except Exception:
     # Fallback to current directory if finding Documents fails
     FORAGE_SETTINGS_FILE = Path("forage_settings.json")
@@ -25,6 +31,10 @@ except Exception:
     QI_HISTORY_FILE = Path("qi_rates.log")
     BLOODLINE_HISTORY_FILE = Path("bloodlines.log")
     FORAGE_HISTORY_FILE = Path("forage_history.log")
+    OCR_CACHE_FILE = Path("ocr_cache.json")
+    GLYPH_TEMPLATES_FILE = Path("glyph_templates.npz")
+    OCR_CROPS_DIR = Path("ocr_crops")
+    SPAWN_MAP_FILE = Path("forage_spawn_map.json")
 
 
 def load_settings(settings_file, default_settings):
@@ -77,17 +87,43 @@ def get_forage_default_settings():
         "scale_max": 1.2,
         "scale_steps": 20,
         "post_click_delay": 1.8,
+        "post_click_poll_interval": 0.03,
+        "pipeline_clicks": True,
+        "click_settle_time": 0.05,
         "scan_interval": 0.01,
         "area_load_delay": 1.0,
+        "area_change_timeout": 2.0,
+        "area_max_failed_moves": 3,
+        "area_poll_interval": 0.05,
+        "area_fingerprints_enabled": True,
+        "area_match_threshold": 12.0,
         "click_cooldown_seconds": 5.0,
         "total_areas": 6,
         "startup_delay": 3,
         "mouse_speed_factor": 0.3,
         "mouse_snap_distance": 15,
+        "mouse_move_duration": 0.05,
+        "click_settle_delay": 0.05,
+        "route_time_budget": 0.005,
         "strike_limit": 5,
         "blacklist_radius": 5,
+        "strike_grid_size": 5,
+        "strike_decay_hours": 24.0,
+        "strike_max_cells": 200,
         "strike_counts": {},
-        "blacklist": {}
+        "blacklist": {},
+        "area_fingerprints": {},
+        "patrol_state": {},
+        "patrol_resume_max_age": 21600.0,
+        "patrol_mode": "sweep",
+        "spawn_map_enabled": True,
+        "spawn_roi_size": 80,
+        "spawn_max_points": 8,
+        "spawn_full_scan_every": 5,
+        "roi_padding": 40,
+        "roi_min_hits": 10,
+        "roi_min_cell_hits": 2,
+        "roi_full_sweep_every": 10
     }
 
 
@@ -96,18 +132,43 @@ def get_rein_default_settings():
     return {
         "qi_region": None,
         "bloodline_region": None,
+        "post_qi_region": None,
+        "post_bloodline_region": None,
         "calibrated_points": {},
         "ui_mode": "dark",
         "mouse_speed_factor": 0.15,
         "mouse_snap_threshold": 25,
         "mouse_variability": 3,
+        "mouse_move_duration": 0.08,
+        "click_settle_delay": 0.05,
         "after_click_delay": 1.5,
+        "readiness_poll_interval": 0.02,
+        "readiness_settle_time": 0.06,
+        "readiness_roi_size": 48,
+        "readiness_recheck_time": 0.25,
+        "step_max_retries": 2,
+        "step_retry_delay": 0.25,
+        "preposition_mouse": True,
+        "preposition_standoff": 64,
+        "ocr_cache_enabled": True,
+        "glyph_min_confidence": 0.8,
+        "bloodline_match_floor": 0.8,
+        "ocr_profiles_enabled": True,
+        "record_ocr_crops": False,
+        "info_stat_sample_every": 5,
+        "ocr_min_confidence": 60,
+        "ocr_rereads": 2,
+        "ocr_workers": 2,
+        "screen_signatures": {},
+        "screen_match_distance": 0.12,
+        "screen_wait_timeout": 3.0,
         "stop_on_bloodline": True,
         "stop_on_qi": False,
         "target_bloodline_index": 0,
         "target_qi_multi": 200.0,
         "stop_on_new": True,
         "show_success_popup": True,
+        "read_after_reincarnate": False,
         "font_name": "TkDefaultFont",
         "font_size": 10,
         "clear_on_start": False,
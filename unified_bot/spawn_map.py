@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SpawnMap:
+    """
+    Per-area map of where forage buttons have appeared, built from clicks
+    that were confirmed (the button was gone on the rescan).
+
+    Each area keeps a list of clusters [x, y, hits, last_hit] with
+    positions relative to the search region. A new hit within
+    'merge_radius' of a cluster moves its center toward the hit; the
+    least-hit clusters are dropped beyond 'max_points' per area.
+
+    Every hit is also counted in a per-area heatmap of 'heat_cell' pixel
+    cells, which is never trimmed; search_roi() derives from it the part
+    of the search region worth scanning.
+
+    :param path: JSON file the map is saved to (None to keep it in memory).
+    :param region: The search region positions are relative to. A saved
+                   map (points and heatmap) recorded for a different
+                   region is not loaded.
+    """
+    def __init__(self, path=None, region=None, merge_radius=15, max_points=30, heat_cell=24):
+        self.path = str(path) if path else None
+        self.region = [int(v) for v in region] if region else None
+        self.merge_radius = merge_radius
+        self.max_points = max_points
+        self.heat_cell = heat_cell
+        self.areas = {}
+        self.heat = {}
+        self._unsaved = 0
+
+    def record(self, area_key, pos_rel, now=None):
+        """Add a confirmed button at 'pos_rel' (relative to the search region) in 'area_key'."""
+        now = time.time() if now is None else now
+        x, y = float(pos_rel[0]), float(pos_rel[1])
+        clusters = self.areas.setdefault(str(area_key), [])
+
+        best, best_dist = None, self.merge_radius ** 2
+        for cluster in clusters:
+            dist = (cluster[0] - x) ** 2 + (cluster[1] - y) ** 2
+            if dist <= best_dist:
+                best, best_dist = cluster, dist
+        if best is None:
+            clusters.append([x, y, 1, now])
+        else:
+            hits = best[2] + 1
+            best[0] += (x - best[0]) / hits
+            best[1] += (y - best[1]) / hits
+            best[2] = hits
+            best[3] = now
+
+        if len(clusters) > self.max_points:
+            clusters.sort(key=lambda c: (c[2], c[3]), reverse=True)
+            del clusters[self.max_points:]
+
+        heat = self.heat.setdefault(str(area_key), {})
+        cell = f"{int(x) // self.heat_cell},{int(y) // self.heat_cell}"
+        heat[cell] = heat.get(cell, 0) + 1
+        self._unsaved += 1
+
+    def points(self, area_key, limit=None):
+        """Cluster centers for 'area_key', most hits first: [(x, y, hits), ...]."""
+        clusters = sorted(self.areas.get(str(area_key), []), key=lambda c: (c[2], c[3]), reverse=True)
+        return [(int(round(c[0])), int(round(c[1])), c[2]) for c in clusters[:limit]]
+
+    def boxes(self, area_key, game_region, size=80, limit=8):
+        """
+        Absolute (left, top, width, height) boxes of 'size' around the
+        top spawn points of 'area_key', clipped to 'game_region'.
+        """
+        gx, gy, gw, gh = [int(v) for v in game_region]
+        half = size // 2
+        boxes = []
+        for x, y, _ in self.points(area_key, limit):
+            left = max(0, min(gw - 1, x - half))
+            top = max(0, min(gh - 1, y - half))
+            right = max(left + 1, min(gw, x + half))
+            bottom = max(top + 1, min(gh, y + half))
+            boxes.append((gx + left, gy + top, right - left, bottom - top))
+        return boxes
+
+    def search_roi(self, area_key, game_region, padding=40, min_hits=10, max_fraction=0.9, min_cell_hits=2):
+        """
+        Absolute (left, top, width, height) box bounding every heatmap cell
+        of 'area_key' with at least 'min_cell_hits' hits, padded by
+        'padding' and clipped to 'game_region'. A single stray hit (e.g. a
+        misdetection that happened to disappear) does not widen the box
+        for good.
+
+        :return: The box, or None while the area has fewer than 'min_hits'
+                 hits or no cell with 'min_cell_hits', or the box would
+                 cover more than 'max_fraction' of the search region anyway.
+        """
+        heat = self.heat.get(str(area_key), {})
+        if sum(heat.values()) < min_hits:
+            return None
+        cells = [tuple(int(v) for v in key.split(',')) for key, hits in heat.items() if hits >= min_cell_hits]
+        if not cells:
+            return None
+        gx, gy, gw, gh = [int(v) for v in game_region]
+        left = max(0, min(cx for cx, _ in cells) * self.heat_cell - padding)
+        top = max(0, min(cy for _, cy in cells) * self.heat_cell - padding)
+        right = min(gw, (max(cx for cx, _ in cells) + 1) * self.heat_cell + padding)
+        bottom = min(gh, (max(cy for _, cy in cells) + 1) * self.heat_cell + padding)
+        if right <= left or bottom <= top or (right - left) * (bottom - top) > max_fraction * gw * gh:
+            return None
+        return (gx + left, gy + top, right - left, bottom - top)
+
+    def to_dict(self):
+        return {area: [[round(c[0], 1), round(c[1], 1), c[2], round(c[3])] for c in clusters]
+                for area, clusters in self.areas.items()}
+
+    def load(self):
+        """Load the saved map from 'path' (missing or unreadable files start empty)."""
+        if not self.path or not os.path.exists(self.path):
+            return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Positions (and heatmap cells) recorded for another region point at the wrong spots
+            if self.region and data.get('region') != self.region:
+                logger.info("Search region changed. Relearning spawn points and scan regions.")
+                return self
+            self.areas = {str(area): [list(c) for c in clusters] for area, clusters in data.get('areas', {}).items()}
+            if data.get('heat_cell', self.heat_cell) == self.heat_cell:
+                self.heat = {str(area): dict(cells) for area, cells in data.get('heat', {}).items()}
+            logger.debug(f"Loaded spawn map with {sum(len(c) for c in self.areas.values())} points")
+        except Exception as e:
+            logger.warning(f"Could not load spawn map: {e}")
+        return self
+
+    def save(self, force=False, every=10):
+        """Write the map to 'path' once 'every' new hits have been recorded (or always with 'force')."""
+        if not self.path or (not force and self._unsaved < every) or not self._unsaved:
+            return
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'region': self.region, 'areas': self.to_dict(),
+                           'heat_cell': self.heat_cell, 'heat': self.heat}, f)
+            self._unsaved = 0
+        except Exception as e:
+            logger.warning(f"Could not save spawn map: {e}")
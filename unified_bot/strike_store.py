@@ -0,0 +1,155 @@
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class StrikeStore:
+    """
+    Bounded, decaying store of false-positive strike counts for the forage bot.
+
+    Coordinates are quantized to a 'grid_size' grid so jittered detections of
+    the same spot share one cell. Each area keeps an OrderedDict of
+    (qx, qy) -> [count, last_strike_time] in least-recently-struck order,
+    counts decay exponentially with 'half_life_hours', and cells beyond
+    'max_cells' per area are evicted oldest first.
+    """
+    def __init__(self, grid_size=5, half_life_hours=24.0, max_cells=200):
+        self.grid_size = max(1, int(grid_size))
+        self.half_life = max(0.0, float(half_life_hours)) * 3600.0
+        self.max_cells = max(1, int(max_cells))
+        self.areas = {}
+
+    def _cell(self, pos):
+        """Quantize a relative (x, y) position to its grid cell."""
+        return (int(pos[0]) // self.grid_size, int(pos[1]) // self.grid_size)
+
+    def _decayed(self, count, last_time, now):
+        """Return 'count' decayed from 'last_time' to 'now'."""
+        if self.half_life <= 0:
+            return count
+        elapsed = max(0.0, now - last_time)
+        return count * 0.5 ** (elapsed / self.half_life)
+
+    def _find_cell(self, cells, pos):
+        """
+        Find the existing cell for 'pos', checking the 8 neighbours as well
+        so a spot jittering across a cell boundary is not split in two.
+        """
+        qx, qy = self._cell(pos)
+        if (qx, qy) in cells:
+            return (qx, qy)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if (qx + dx, qy + dy) in cells:
+                    return (qx + dx, qy + dy)
+        return (qx, qy)
+
+    def add_strike(self, area_key, pos, now=None):
+        """
+        Record a strike at 'pos' in 'area_key'.
+
+        :return: The decayed strike count for that spot, rounded to an int.
+        """
+        now = time.time() if now is None else now
+        cells = self.areas.setdefault(str(area_key), OrderedDict())
+        cell = self._find_cell(cells, pos)
+
+        entry = cells.pop(cell, None)
+        count = self._decayed(entry[0], entry[1], now) if entry else 0.0
+        cells[cell] = [count + 1.0, now]
+
+        while len(cells) > self.max_cells:
+            evicted, _ = cells.popitem(last=False)
+            logger.debug(f"Evicted strike cell {evicted} from Area {area_key}")
+
+        return int(round(count + 1.0))
+
+    def get_strikes(self, area_key, pos, now=None):
+        """Return the decayed strike count at 'pos' (0.0 if unknown)."""
+        now = time.time() if now is None else now
+        cells = self.areas.get(str(area_key))
+        if not cells:
+            return 0.0
+        entry = cells.get(self._find_cell(cells, pos))
+        return self._decayed(entry[0], entry[1], now) if entry else 0.0
+
+    def remove(self, area_key, pos):
+        """Drop the cell at 'pos' (e.g. once the spot has been blacklisted)."""
+        cells = self.areas.get(str(area_key))
+        if cells:
+            cells.pop(self._find_cell(cells, pos), None)
+
+    def prune(self, now=None, min_count=0.5):
+        """Remove cells whose decayed count has fallen below 'min_count'."""
+        now = time.time() if now is None else now
+        removed = 0
+        for area_key in list(self.areas):
+            cells = self.areas[area_key]
+            for cell in [c for c, (count, last) in cells.items()
+                         if self._decayed(count, last, now) < min_count]:
+                del cells[cell]
+                removed += 1
+            if not cells:
+                del self.areas[area_key]
+        return removed
+
+    def __len__(self):
+        return sum(len(cells) for cells in self.areas.values())
+
+    def to_dict(self):
+        """Serialize to a compact JSON-friendly dict."""
+        return {
+            "grid": self.grid_size,
+            "areas": {
+                area_key: [[qx, qy, round(count, 3), int(last)]
+                           for (qx, qy), (count, last) in cells.items()]
+                for area_key, cells in self.areas.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data, grid_size=5, half_life_hours=24.0, max_cells=200, now=None):
+        """
+        Build a store from saved data.
+
+        Accepts both the compact format written by to_dict() and the legacy
+        {area: {"x,y": count}} format, which is re-quantized on load.
+        """
+        now = time.time() if now is None else now
+        store = cls(grid_size, half_life_hours, max_cells)
+        if not isinstance(data, dict):
+            return store
+
+        try:
+            if "areas" in data:
+                saved_grid = int(data.get("grid", store.grid_size))
+                for area_key, entries in data["areas"].items():
+                    for qx, qy, count, last in entries:
+                        # Re-project the saved cell centre onto the current grid
+                        pos = (qx * saved_grid + saved_grid // 2, qy * saved_grid + saved_grid // 2)
+                        store._merge(area_key, pos, count, last, now)
+            else:
+                for area_key, spots in data.items():
+                    for coord_key, count in spots.items():
+                        x, y = coord_key.split(",")
+                        store._merge(area_key, (int(x), int(y)), count, now, now)
+        except Exception as e:
+            logger.error(f"Could not load strike counts, starting fresh: {e}")
+            return cls(grid_size, half_life_hours, max_cells)
+
+        store.prune(now)
+        return store
+
+    def _merge(self, area_key, pos, count, last_time, now):
+        """Add a saved entry, merging it with any entry already in its cell."""
+        cells = self.areas.setdefault(str(area_key), OrderedDict())
+        cell = self._find_cell(cells, pos)
+        count = self._decayed(float(count), float(last_time), now)
+        entry = cells.pop(cell, None)
+        if entry:
+            count += self._decayed(entry[0], entry[1], now)
+        cells[cell] = [count, now]
+        while len(cells) > self.max_cells:
+            cells.popitem(last=False)